@@ -1,8 +1,30 @@
 # -*- coding: utf-8 -*-
 
+import numpy as np
+
+
+#: Generator shared by all the arms, posteriors and policies created without one, see :func:`defaultRNG`
+_defaultRNG = None
+
+
+def defaultRNG(rng=None):
+    """ The :class:`numpy.random.Generator` rng, or if it is None the default one, shared by all the objects created without a Generator: one Generator by object would weigh more than the object itself.
+    - The default Generator is seeded from numpy's global random state when it is first needed: call numpy.random.seed() before, or give a Generator, for reproducible draws.
+    """
+    global _defaultRNG
+    if rng is not None:
+        return rng
+    if _defaultRNG is None:
+        _defaultRNG = np.random.default_rng(int.from_bytes(np.random.bytes(16), 'little'))
+    return _defaultRNG
+
+
 class Arm(object):
 
-    def __init__(self, lower=0., amplitude=1.):
+    # No __dict__ for arms: a problem can have thousands of them
+    __slots__ = ('lower', 'amplitude', 'min', 'max', 'mean', 'rng')
+
+    def __init__(self, lower=0., amplitude=1., rng=None):
         # Lower value of rewards
         self.lower = lower  
         
@@ -15,5 +37,11 @@ class Arm(object):
         # Higher value of rewards
         self.max = lower + amplitude  
 
+        # Random generator of the samples
+        self.rng = defaultRNG(rng)
+
     def draw(self, t=None):
-        raise NotImplementedError("This method draw has to be implemented in the class inheriting from Arm.")
\ No newline at end of file
+        raise NotImplementedError("This method draw has to be implemented in the class inheriting from Arm.")
+
+    def draw_nparray(self, shape=(1,)):
+        raise NotImplementedError("This method draw_nparray has to be implemented in the class inheriting from Arm.")
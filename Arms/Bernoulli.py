@@ -1,35 +1,41 @@
 # -*- coding: utf-8 -*-
 
 import numpy as np
-from numpy.random import binomial
 
 # Local imports
 try:
-    from .Arm import Arm
+    from .Arm import Arm, defaultRNG
 except ImportError:
-    from Arm import Arm
+    from Arm import Arm, defaultRNG
 
 
 
 class Bernoulli(Arm):
     """ Bernoulli distributed arm."""
 
-    def __init__(self, probability):
-        """New arm."""
+    __slots__ = ('probability',)
+
+    def __init__(self, probability, rng=None):
+        """New arm, drawing its samples with the numpy Generator rng (the shared default one by default, see :func:`Arms.Arm.defaultRNG`)."""
         assert 0 <= probability <= 1, "Error, the parameter probability for Bernoulli class has to be in [0, 1]."  # DEBUG
         self.probability = probability  #: Parameter p for this Bernoulli arm
         self.mean = probability  #: Mean for this Bernoulli arm
+        self.rng = defaultRNG(rng)  #: Random generator of the samples
 
     # --- Random samples
 
     def draw(self, t=None):
         """ Draw one random sample."""
-        return binomial(1, self.probability)
-        # return np.asarray(binomial(1, self.probability), dtype=float)
+        return int(self.rng.random() < self.probability)
 
     def draw_nparray(self, shape=(1,)):
         """ Draw a numpy array of random samples, of a certain shape."""
-        return np.asarray(binomial(1, self.probability, shape), dtype=float)
+        return (self.rng.random(shape) < self.probability).astype(float)
+
+    @staticmethod
+    def draw_arms(arms, rng):
+        """ Draw one random sample of each of these Bernoulli arms (can be repeated), in one call to the numpy Generator rng."""
+        return (rng.random(len(arms)) < np.array([arm.probability for arm in arms])).astype(float)
 
     def set_mean_param(self, probability):
         self.probability = self.mean = probability
\ No newline at end of file
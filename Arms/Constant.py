@@ -14,7 +14,9 @@ class Constant(Arm):
     Arm with a constant reward.
     """
 
-    def __init__(self, constant_reward=0.5, lower=0., amplitude=1.):
+    __slots__ = ('constant_reward',)
+
+    def __init__(self, constant_reward=0.5, lower=0., amplitude=1., rng=None):
         constant_reward = float(constant_reward)
 
         # Constant value of rewards
@@ -30,9 +32,27 @@ class Constant(Arm):
         # Mean for the constant arm
         self.mean = constant_reward
 
+        # Random generator, not used
+        self.rng = rng
+
     
     def draw(self, t=None):
         """ 
         Draw one constant sample.
         """
-        return self.constant_reward
\ No newline at end of file
+        return self.constant_reward
+
+    def draw_nparray(self, shape=(1,)):
+        """ 
+        Draw a numpy array of constant samples, of a certain shape.
+        """
+        return np.full(shape, self.constant_reward)
+
+    @staticmethod
+    def draw_arms(arms, rng):
+        """ Draw one constant sample of each of these Constant arms (can be repeated)."""
+        return np.array([arm.constant_reward for arm in arms], dtype=float)
+
+    def set_mean_param(self, constant_reward):
+        """ Change the constant reward of the arm."""
+        self.constant_reward = self.mean = float(constant_reward)
@@ -1,9 +1,9 @@
 # -*- coding: utf-8 -*-
-from random import gauss
+import numpy as np
 try:
-    from .Arm import Arm
+    from .Arm import Arm, defaultRNG
 except ImportError:
-    from Arm import Arm
+    from Arm import Arm, defaultRNG
 
 # Default value for the variance of a [0, 1] Gaussian arm
 VARIANCE = 0.05
@@ -14,7 +14,9 @@ class Gaussian(Arm):
         - Default is to truncate into [0, 1] 
     """
 
-    def __init__(self, mu, sigma=VARIANCE, mini=0, maxi=1):
+    __slots__ = ('mu', 'sigma')
+
+    def __init__(self, mu, sigma=VARIANCE, mini=0, maxi=1, rng=None):
         # Mean of Gaussian arm
         self.mu = self.mean = mu  
 
@@ -27,8 +29,25 @@ class Gaussian(Arm):
         #: Higher value of rewards
         self.max = maxi  
 
+        # Random generator of the samples
+        self.rng = defaultRNG(rng)
+
     # --- Random samples
 
     def draw(self, t=None):
         """ Draw one random sample. The parameter t is ignored in this Arm."""
-        return min(max(gauss(self.mu, self.sigma), self.min), self.max)    
\ No newline at end of file
+        return min(max(self.rng.normal(self.mu, self.sigma), self.min), self.max)
+
+    def draw_nparray(self, shape=(1,)):
+        """ Draw a numpy array of random samples, of a certain shape."""
+        return np.clip(self.rng.normal(self.mu, self.sigma, shape), self.min, self.max)
+
+    @staticmethod
+    def draw_arms(arms, rng):
+        """ Draw one random sample of each of these Gaussian arms (can be repeated), in one call to the numpy Generator rng."""
+        params = np.array([(arm.mu, arm.sigma, arm.min, arm.max) for arm in arms]).reshape(-1, 4)
+        return np.clip(rng.normal(params[:, 0], params[:, 1]), params[:, 2], params[:, 3])
+
+    def set_mean_param(self, mean):
+        """ Change the mean of the arm, keeping its variance."""
+        self.mu = self.mean = mean
@@ -1,11 +1,11 @@
 # -*- coding: utf-8 -*-
-from random import random
+import numpy as np
 
 # Local imports
 try:
-    from .Arm import Arm
+    from .Arm import Arm, defaultRNG
 except ImportError:
-    from Arm import Arm
+    from Arm import Arm, defaultRNG
 
 
 class Uniform(Arm):
@@ -14,7 +14,9 @@ class Uniform(Arm):
     - or [lower, lower + amplitude], if (lower=lower, amplitude=amplitude) is given.
     """
 
-    def __init__(self, mini=0., maxi=1., mean=None, lower=0., amplitude=1.):
+    __slots__ = ()
+
+    def __init__(self, mini=0., maxi=1., mean=None, lower=0., amplitude=1., rng=None):
         mini = max(mini, lower)
         maxi = min(maxi, lower + amplitude)
 
@@ -28,7 +30,25 @@ class Uniform(Arm):
         # self.mean = (mini + maxi) / 2.0
         self.mean = self.lower + (self.amplitude / 2.0)  #: Mean for this UniformArm arm
 
+        # Random generator of the samples
+        self.rng = defaultRNG(rng)
+
 
     def draw(self, t=None):
         """ Draw one random sample. The parameter t is ignored in this Arm."""
-        return self.lower + (random() * self.amplitude)
\ No newline at end of file
+        return self.lower + (self.rng.random() * self.amplitude)
+
+    def draw_nparray(self, shape=(1,)):
+        """ Draw a numpy array of random samples, of a certain shape."""
+        return self.lower + (self.rng.random(shape) * self.amplitude)
+
+    @staticmethod
+    def draw_arms(arms, rng):
+        """ Draw one random sample of each of these Uniform arms (can be repeated), in one call to the numpy Generator rng."""
+        params = np.array([(arm.lower, arm.amplitude) for arm in arms]).reshape(-1, 2)
+        return params[:, 0] + (rng.random(len(arms)) * params[:, 1])
+
+    def set_mean_param(self, mean):
+        """ Change the mean of the arm, keeping its amplitude: the interval of the rewards is shifted."""
+        self.lower = mean - (self.amplitude / 2.0)
+        self.mean = mean
@@ -0,0 +1,2 @@
+# -*- coding: utf-8 -*-
+""" Benchmarks of the arms, policies and environments, each runnable as a script, eg. ``python -m Benchmarks.memory``."""
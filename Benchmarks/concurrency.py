@@ -0,0 +1,83 @@
+# -*- coding: utf-8 -*-
+""" Throughput of one policy shared by several threads, each playing choice() then getReward() in a loop.
+- Compare a :class:`Policies.ConcurrentPolicy` to the same policy protected by one global lock, for a growing number of threads, and check that no reward is lost.
+- Usage: ``python -m Benchmarks.concurrency [nbSteps]``.
+"""
+
+import sys
+import time
+import threading
+import numpy as np
+
+from Policies import UCB, Thompson, ConcurrentPolicy
+
+
+#: Default number of steps played by each thread
+NB_STEPS = 20000
+
+#: Numbers of threads
+NB_THREADS = [1, 2, 4, 8]
+
+#: Means of the Bernoulli arms
+MEANS = np.linspace(0.1, 0.9, 10)
+
+
+class _LockedPolicy(object):
+    """ Baseline: the policy protected by one lock, taken by choice() and getReward()."""
+
+    def __init__(self, policy):
+        self.policy = policy
+        self._lock = threading.Lock()
+
+    def choice(self):
+        with self._lock:
+            return self.policy.choice()
+
+    def getReward(self, arm, reward):
+        with self._lock:
+            self.policy.getReward(arm, reward)
+
+    def flush(self):
+        pass
+
+
+def _play(policy, nbSteps):
+    """ Play nbSteps steps with the shared policy."""
+    rewards = np.random.random_sample(nbSteps)
+    for step in range(nbSteps):
+        arm = policy.choice()
+        policy.getReward(arm, float(rewards[step] < MEANS[arm]))
+
+
+def throughput(policy, nbThreads, nbSteps=NB_STEPS):
+    """ Number of steps per second played by nbThreads threads sharing the policy, and the number of rewards seen by the wrapped policy."""
+    threads = [threading.Thread(target=_play, args=(policy, nbSteps)) for _ in range(nbThreads)]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    duration = time.perf_counter() - start
+    policy.flush()
+    return nbThreads * nbSteps / duration, policy.policy.t
+
+
+def main(nbSteps=NB_STEPS):
+    """ Print the throughput of each policy and wrapper, for each number of threads."""
+    print("\nSteps per second, {} steps by thread, {} arms:".format(nbSteps, len(MEANS)))
+    print("{:<28}".format("Policy") + "".join("{:>12}".format("{} threads".format(nbThreads)) for nbThreads in NB_THREADS))
+    for archtype in (UCB, Thompson):
+        for wrapper in (_LockedPolicy, ConcurrentPolicy):
+            results = []
+            for nbThreads in NB_THREADS:
+                policy = archtype(len(MEANS))
+                policy.startGame()
+                stepsPerSecond, t = throughput(wrapper(policy), nbThreads, nbSteps)
+                assert t == nbThreads * nbSteps, "Error: {} rewards were lost.".format(nbThreads * nbSteps - t)
+                results.append(stepsPerSecond)
+            name = "{} ({})".format(archtype.__name__, "lock" if wrapper is _LockedPolicy else "concurrent")
+            print("{:<28}".format(name) + "".join("{:>12.0f}".format(result) for result in results))
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else NB_STEPS)
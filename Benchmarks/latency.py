@@ -0,0 +1,170 @@
+# -*- coding: utf-8 -*-
+""" Latency of one step of each policy, and throughput of the loop of ``demo.py``, written as JSON to compare commits.
+- For each policy of :mod:`Policies` and each number of arms K, measure the mean time of choice() and of getReward() in ns, after one reward of each arm.
+- Measure the time of :meth:`Environment.MAB.draw`, with and without buffer, and the steps per second of the loop of ``demo.py`` (choice, draw, getReward) for each of its policies, in Python and with :func:`Environment.playGame` (compiled if numba is installed).
+- Usage: ``python -m Benchmarks.latency [--arms 2 10 100 10000] [--duration 0.2] [--output latency.json]``, the JSON is printed if there is no output file.
+"""
+
+import sys
+import io
+import json
+import time
+import platform
+import argparse
+import subprocess
+import contextlib
+import numpy as np
+
+import Policies
+from Policies import BasePolicy, IndexPolicy, ConcurrentPolicy, UCB, LinUCB
+from Arms import Bernoulli
+from Environment import MAB, playGame
+from Environment.Kernel import HAS_NUMBA
+
+
+#: Default numbers of arms
+NB_ARMS = [2, 10, 100, 10000]
+
+#: Default time spent measuring each policy, for each number of arms, in seconds
+DURATION = 0.2
+
+#: Maximum number of steps measured for each policy, for each number of arms
+MAX_STEPS = 100000
+
+#: Horizon of the loop of demo.py
+HORIZON = 10000
+
+#: Parameters needed by some policies
+PARAMS = {
+    "ETC_KnownGap": {"horizon": HORIZON},
+    "ETC_RandomStop": {"horizon": HORIZON},
+}
+
+
+def allPolicies():
+    """ Name and constructor (of nbArms) of each context-free policy exported by :mod:`Policies`, and of the lazy and concurrent variants of UCB."""
+    policies = []
+    for name in sorted(dir(Policies)):
+        archtype = getattr(Policies, name)
+        if isinstance(archtype, type) and issubclass(archtype, BasePolicy) and archtype not in (BasePolicy, IndexPolicy) and not issubclass(archtype, LinUCB):
+            policies.append((name, lambda nbArms, archtype=archtype, name=name: archtype(nbArms, **PARAMS.get(name, {}))))
+    policies.append(("UCB(lazy)", lambda nbArms: UCB(nbArms, lazy=True)))
+    policies.append(("ConcurrentPolicy(UCB)", lambda nbArms: ConcurrentPolicy(UCB(nbArms))))
+    return policies
+
+
+def _timerOverhead(n=10000):
+    """ Mean time of two calls to :func:`time.perf_counter_ns`, in ns."""
+    start = time.perf_counter_ns()
+    for _ in range(n):
+        time.perf_counter_ns()
+        time.perf_counter_ns()
+    return (time.perf_counter_ns() - start) / n
+
+
+def stepLatency(policy, means, duration=DURATION, maxSteps=MAX_STEPS, overhead=0.):
+    """ Mean time of choice() and of getReward() of the policy, in ns, and the number of steps measured, playing arms of these means."""
+    nbArms = len(means)
+    policy.startGame()
+    # One reward of each arm first, so the indexes are all finite
+    policy.getReward_batch(np.arange(nbArms), (np.random.random_sample(nbArms) < means).astype(float))
+    uniforms = np.random.random_sample(maxSteps).tolist()
+    means = means.tolist()
+    choiceTime = rewardTime = 0
+    steps = 0
+    end = time.perf_counter() + duration
+    while steps < maxSteps and time.perf_counter() < end:
+        start = time.perf_counter_ns()
+        arm = policy.choice()
+        middle = time.perf_counter_ns()
+        policy.getReward(arm, float(uniforms[steps] < means[arm]))
+        stop = time.perf_counter_ns()
+        choiceTime += middle - start
+        rewardTime += stop - middle
+        steps += 1
+    return max(0., choiceTime / steps - overhead / 2), max(0., rewardTime / steps - overhead / 2), steps
+
+
+def drawLatency(env, nbDraws=100000):
+    """ Mean time of one call to env.draw(), in ns, on random arms."""
+    arms = np.random.randint(0, env.nbArms, nbDraws).tolist()
+    start = time.perf_counter_ns()
+    for t, arm in enumerate(arms):
+        env.draw(arm, t)
+    return (time.perf_counter_ns() - start) / nbDraws
+
+
+def demoThroughput(horizon=HORIZON):
+    """ Steps per second of the loop of demo.py, for each of its policies."""
+    from demo import configuration
+    with contextlib.redirect_stdout(io.StringIO()):
+        env = MAB(configuration["environment"])
+    results = []
+    for policyConfiguration in configuration["policies"]:
+        policy = policyConfiguration["archtype"](env.nbArms, **policyConfiguration.get("params", {}))
+        policy.startGame()
+        start = time.perf_counter()
+        for t in range(horizon):
+            choice = policy.choice()
+            reward = env.draw(choice, t)
+            policy.getReward(choice, reward)
+        pythonTime = time.perf_counter() - start
+        policy.startGame()
+        start = time.perf_counter()
+        playGame(env, policy, horizon)
+        results.append({"policy": str(policy), "horizon": horizon, "steps_per_second": horizon / pythonTime, "playGame_steps_per_second": horizon / (time.perf_counter() - start)})
+    return results
+
+
+def _commit():
+    """ Current git commit, if any."""
+    try:
+        return subprocess.check_output(["git", "rev-parse", "HEAD"], stderr=subprocess.DEVNULL).decode().strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def main(nbArmsList=NB_ARMS, duration=DURATION, horizon=HORIZON):
+    """ Run all the benchmarks, and return their results as a JSON-serializable dict."""
+    np.random.seed(0)
+    overhead = _timerOverhead()
+    results = {
+        "commit": _commit(),
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "numba": HAS_NUMBA,
+        "timer_overhead_ns": overhead,
+        "policies": [],
+        "draw": [],
+    }
+    for nbArms in nbArmsList:
+        means = np.linspace(0.1, 0.9, nbArms)
+        for name, factory in allPolicies():
+            choiceTime, rewardTime, steps = stepLatency(factory(nbArms), means, duration=duration, overhead=overhead)
+            results["policies"].append({"policy": name, "nbArms": nbArms, "choice_ns": choiceTime, "getReward_ns": rewardTime, "steps": steps})
+            print("{:<24} K = {:<6} choice: {:>12.0f} ns  getReward: {:>10.0f} ns".format(name, nbArms, choiceTime, rewardTime), file=sys.stderr)
+        for bufferSize in (None, 1024):
+            with contextlib.redirect_stdout(io.StringIO()):
+                env = MAB([Bernoulli(mean) for mean in means], buffer_size=bufferSize)
+            drawTime = drawLatency(env)
+            results["draw"].append({"nbArms": nbArms, "buffer_size": bufferSize, "draw_ns": drawTime})
+            print("{:<24} K = {:<6} draw: {:>14.0f} ns".format("MAB(buffer_size={})".format(bufferSize), nbArms, drawTime), file=sys.stderr)
+    results["demo"] = demoThroughput(horizon)
+    for result in results["demo"]:
+        print("demo.py loop, {:<30} {:>12.0f} steps/s, with playGame: {:>12.0f} steps/s".format(result["policy"], result["steps_per_second"], result["playGame_steps_per_second"]), file=sys.stderr)
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Latency of one step of each policy, and throughput of the loop of demo.py.")
+    parser.add_argument("--arms", type=int, nargs="+", default=NB_ARMS, help="numbers of arms")
+    parser.add_argument("--duration", type=float, default=DURATION, help="time spent on each policy and number of arms, in seconds")
+    parser.add_argument("--horizon", type=int, default=HORIZON, help="horizon of the loop of demo.py")
+    parser.add_argument("--output", default=None, help="JSON file for the results, printed if not given")
+    args = parser.parse_args()
+    results = main(args.arms, args.duration, args.horizon)
+    if args.output is None:
+        print(json.dumps(results, indent=2))
+    else:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
@@ -0,0 +1,70 @@
+# -*- coding: utf-8 -*-
+""" Memory footprint of the arms, posteriors and policies.
+- Compare the arms and posteriors with ``__slots__`` to the same classes with a ``__dict__``, and measure the memory of one policy (object and arrays) for several numbers of arms.
+- Usage: ``python -m Benchmarks.memory [nbObjects]``.
+"""
+
+import sys
+import gc
+import tracemalloc
+
+from Arms import Bernoulli, Gaussian
+from Policies import UCB, UCBV, Thompson
+from Policies.Posterior import Beta
+
+
+#: Default number of objects created to measure the footprint of one
+NB_OBJECTS = 100000
+
+#: Numbers of arms of the policies
+NB_ARMS = [2, 10, 100, 10000]
+
+
+# Same classes, but with a __dict__, as before the __slots__
+class _DictBernoulli(Bernoulli):
+    pass
+
+
+class _DictGaussian(Gaussian):
+    pass
+
+
+class _DictBeta(Beta):
+    pass
+
+
+def footprint(factory, nbObjects=NB_OBJECTS):
+    """ Average memory allocated by one object created by factory(), in bytes, measured with :mod:`tracemalloc` on nbObjects objects."""
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    objects = [factory() for _ in range(nbObjects)]
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    # The list itself is not counted
+    size = after - before - sys.getsizeof(objects)
+    del objects
+    return size / float(nbObjects)
+
+
+def main(nbObjects=NB_OBJECTS):
+    """ Print the memory footprint of the arms, posteriors and policies."""
+    print("\nMemory of one object, averaged on {} objects (bytes):".format(nbObjects))
+    print("{:<12} {:>12} {:>12}".format("Class", "__slots__", "__dict__"))
+    for name, slotted, withDict in [
+        ("Bernoulli", lambda: Bernoulli(0.5), lambda: _DictBernoulli(0.5)),
+        ("Gaussian", lambda: Gaussian(0.5), lambda: _DictGaussian(0.5)),
+        ("Beta", Beta, _DictBeta),
+    ]:
+        print("{:<12} {:>12.0f} {:>12.0f}".format(name, footprint(slotted, nbObjects), footprint(withDict, nbObjects)))
+
+    print("\nMemory of one policy, with all its arrays (bytes):")
+    print("{:<12}".format("Policy") + "".join("{:>12}".format("K = {}".format(nbArms)) for nbArms in NB_ARMS))
+    nbPolicies = max(1, nbObjects // 1000)
+    for policy in (UCB, UCBV, Thompson):
+        sizes = [footprint(lambda: policy(nbArms), nbPolicies) for nbArms in NB_ARMS]
+        print("{:<12}".format(policy.__name__) + "".join("{:>12.0f}".format(size) for size in sizes))
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else NB_OBJECTS)
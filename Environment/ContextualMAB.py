@@ -0,0 +1,102 @@
+# -*- coding: utf-8 -*-
+r"""
+:class:`ContextualMAB` class, for linear contextual bandit problems: at each time a context is drawn, and the reward of an arm is linear in it, :math:`r = x^T \theta_k + \text{noise}`.
+- It is used as :class:`MAB`, with a context drawn before each choice::
+    context = env.draw_context(t)
+    choice = policy.choice(context)
+    reward = env.draw(choice, t)
+    policy.getReward(choice, reward)
+- draw() uses the last context drawn, unless one is given. Batches of n contexts are drawn, scored and played at once with draw_contexts(n), :meth:`ContextualMAB.means` (one matrix product) and draw_multiple(armIds, contexts), and their regret with :meth:`ContextualMAB.contextRegrets`.
+- The policies are in :mod:`Policies.LinUCB`.
+"""
+
+import numpy as np
+
+try:
+    from ..Arms.Arm import defaultRNG
+except ImportError:
+    from Arms.Arm import defaultRNG
+
+
+#: Default standard deviation of the Gaussian noise of the rewards
+SIGMA = 0.1
+
+
+class ContextualMAB(object):
+    """ Linear contextual bandit problem, with contexts uniform on the unit sphere of dimension d and a Gaussian noise of standard deviation sigma.
+    - With shared=False, the context is one vector (d,) for all the arms, and each arm has its own parameter: theta is of shape (nbArms, d).
+    - With shared=True, the context is one vector by arm (nbArms, d), and the arms share one parameter theta of shape (d,).
+    - theta is drawn uniformly on the unit sphere if it is not given.
+    """
+
+    def __init__(self, nbArms, dimension, theta=None, sigma=SIGMA, shared=False, rng=None):
+        """New contextual MAB."""
+        print("\n\nCreating a new contextual MAB problem ...")
+        assert nbArms > 0 and dimension > 0, "Error: the 'nbArms' and 'dimension' parameters of a ContextualMAB object cannot be <= 0."  # DEBUG
+        self.nbArms = nbArms  #: Number of arms
+        self.dimension = dimension  #: Dimension d of the contexts
+        self.shared = shared  #: True if the arms share one parameter
+        self.sigma = sigma  #: Standard deviation of the noise
+        self.rng = defaultRNG(rng)  #: Random generator of the contexts and rewards
+        print(" - with 'nbArms' =", self.nbArms)
+        print(" - with 'dimension' =", self.dimension)
+
+        # Parameter of each arm, or shared
+        shape = (dimension,) if shared else (nbArms, dimension)
+        self.theta = self._unitVectors(shape) if theta is None else np.asarray(theta, dtype=float)
+        if self.theta.shape != shape:
+            raise ValueError("Error: the parameter theta of a ContextualMAB object has to be of shape {}, not {}.".format(shape, self.theta.shape))
+        print(" - with 'theta' =", self.theta)
+
+        # Shape of one context, and the last one drawn
+        self._contextShape = (nbArms, dimension) if shared else (dimension,)
+        self._context = None
+
+    def __repr__(self):
+        return "{}(nbArms: {}, dimension: {}, sigma: {:.3g}, shared: {})".format(self.__class__.__name__, self.nbArms, self.dimension, self.sigma, self.shared)
+
+    def setRNG(self, rng):
+        """ Draw the contexts and rewards from the numpy Generator rng."""
+        self.rng = rng
+
+    def _unitVectors(self, shape):
+        """ Vectors drawn uniformly on the unit sphere, along the last axis of shape."""
+        vectors = self.rng.standard_normal(shape)
+        return vectors / np.linalg.norm(vectors, axis=-1, keepdims=True)
+
+    # --- Draw contexts and samples
+
+    def draw_contexts(self, n):
+        """ Return a batch of n random contexts, of shape (n, d) or (n, nbArms, d) if the parameter is shared."""
+        return self._unitVectors((n,) + self._contextShape)
+
+    def draw_context(self, t=1):
+        """ Return a random context, used by the next calls to draw(). Usually t is not used."""
+        self._context = self.draw_contexts(1)[0]
+        return self._context
+
+    def draw(self, armId, t=1, context=None):
+        """ Return a random sample from the armId-th arm, for the context (by default the last one drawn), at time t."""
+        context = self._context if context is None else np.asarray(context, dtype=float)
+        mean = context[armId] @ self.theta if self.shared else context @ self.theta[armId]
+        return float(mean + self.sigma * self.rng.standard_normal())
+
+    def draw_multiple(self, armIds, contexts, t=1):
+        """ Return one random sample for each pair of arm of armIds and context of the batch contexts, as a numpy array."""
+        armIds = np.asarray(armIds)
+        means = self.means(contexts)[np.arange(len(armIds)), armIds]
+        return means + self.sigma * self.rng.standard_normal(len(armIds))
+
+    # --- Means and regret
+
+    def means(self, contexts):
+        """ Return the means of all the arms for a batch of contexts, of shape (n, nbArms), with one matrix product."""
+        contexts = np.asarray(contexts, dtype=float)
+        return contexts @ self.theta if self.shared else contexts @ self.theta.T
+
+    def contextRegrets(self, choices, contexts):
+        """ Return the (pseudo) regret of each choice of the batch, for its context: the gap between the best mean and the mean of the chosen arm.
+        - It is not named regrets(), as :meth:`MAB.regrets` takes the time of the first choice instead of the contexts.
+        """
+        means = self.means(contexts)
+        return np.max(means, axis=1) - means[np.arange(len(means)), np.asarray(choices)]
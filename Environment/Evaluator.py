@@ -0,0 +1,187 @@
+# -*- coding: utf-8 -*-
+"""
+:class:`Evaluator` class to play several policies on one MAB problem, with several repetitions, in parallel.
+- Each (policy, repetition) job is played in a process of a :class:`concurrent.futures.ProcessPoolExecutor`, with its own numpy Generators for the arms and the policy, spawned from one :class:`numpy.random.SeedSequence`: the results do not depend on the number of processes, and are reproducible bit for bit with the same seed.
+- The jobs write their choices and rewards directly in arrays in shared memory, of shape (nbPolicies, repetitions, horizon).
+- Example of configuration::
+    configuration = {
+        "horizon": 10000,
+        "repetitions": 100,
+        "n_jobs": -1,  # Number of processes, -1 for all the CPUs, 1 to play in this process
+        "seed": 42,    # None for a random seed, stored in evaluator.seed
+        "instrumentation": False,  # True to time the phases of the steps, in evaluator.instrumentation
+        "kernel": False,  # True to play the games with the compiled kernel of Environment.Kernel, if numba is installed
+        "environment": [Bernoulli(0.1), Bernoulli(0.5), Bernoulli(0.9)],  # or a dict configuration for MAB
+        "policies": [
+            {"archtype": UCB, "params": {}},
+            {"archtype": Thompson, "params": {"a": 100, "b": 50}},
+        ]
+    }
+"""
+
+import os
+import copy
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing.shared_memory import SharedMemory
+import numpy as np
+
+try:
+    from .MAB import MAB
+    from .Results import Result
+    from .Instrumentation import Instrumentation
+    from .Kernel import playGame
+except ImportError:
+    from MAB import MAB
+    from Results import Result
+    from Instrumentation import Instrumentation
+    from Kernel import playGame
+
+
+#: Default number of repetitions
+REPETITIONS = 100
+
+#: Default number of processes, -1 for all the CPUs
+N_JOBS = -1
+
+
+def _attach(name, shape, dtype):
+    """ Attach to the shared memory 'name', and return it with a numpy array of that shape and dtype on it."""
+    shm = SharedMemory(name=name)
+    return shm, np.ndarray(shape, dtype=dtype, buffer=shm.buf)
+
+
+def _playOneRepetition(env, policyConfiguration, horizon, seedSequence, policyId, repetitionId, choicesName, rewardsName, shape, instrumented=False, kernel=False):
+    """ Play one repetition of one policy on the MAB problem env, and write its choices and rewards in shared memory.
+    - If instrumented, return the :class:`Instrumentation` of its steps.
+    - Otherwise, if kernel, play it with :func:`Environment.Kernel.playGame`.
+    """
+    # A copy of the problem, so the jobs played in the same process do not share its state (eg. buffered rewards)
+    env = copy.deepcopy(env)
+
+    # Independent streams for the arms and for the policy, from this job's seed sequence
+    envSequence, policySequence = seedSequence.spawn(2)
+    env.setRNG(np.random.default_rng(envSequence))
+
+    policy = policyConfiguration["archtype"](env.nbArms, rng=np.random.default_rng(policySequence), **policyConfiguration.get("params", {}))
+    policy.startGame()
+    result = Result(env.nbArms, horizon)
+    instrumentation = Instrumentation().instrument(policy, env, result) if instrumented else None
+    if kernel and not instrumented:
+        result = playGame(env, policy, horizon)
+    else:
+        for t in range(horizon):
+            # 1. The player's policy choose an arm
+            choice = policy.choice()
+
+            # 2. A random reward is drawn, from this arm at this time
+            reward = env.draw(choice, t)
+
+            # 3. The policy sees the reward
+            policy.getReward(choice, reward)
+
+            # 4. Finally we store the results
+            result.store(t, choice, reward)
+
+    # Copy the results in shared memory
+    choicesShm, allChoices = _attach(choicesName, shape, int)
+    rewardsShm, allRewards = _attach(rewardsName, shape, float)
+    allChoices[policyId, repetitionId] = result.choices
+    allRewards[policyId, repetitionId] = result.rewards
+    del allChoices, allRewards
+    choicesShm.close()
+    rewardsShm.close()
+    if instrumentation is not None:
+        instrumentation.restore(policy, env, result)
+    return instrumentation
+
+
+class Evaluator(object):
+    """ Evaluate several policies on one MAB problem, with several repetitions played in parallel processes."""
+
+    def __init__(self, configuration):
+        """ New evaluator, see the module documentation for the configuration."""
+        # Horizon of each game
+        self.horizon = int(configuration["horizon"])
+
+        # Number of repetitions of each game
+        self.repetitions = int(configuration.get("repetitions", REPETITIONS))
+        assert self.repetitions > 0, "Error: the 'repetitions' parameter of an Evaluator object cannot be <= 0."  # DEBUG
+
+        # Number of processes
+        n_jobs = configuration.get("n_jobs", N_JOBS)
+        self.n_jobs = os.cpu_count() if n_jobs == -1 else max(1, int(n_jobs))
+
+        # Root seed of all the jobs
+        self.seed = np.random.SeedSequence(configuration.get("seed", None)).entropy
+
+        # MAB problem
+        environment = configuration["environment"]
+        self.env = environment if isinstance(environment, MAB) else MAB(environment)
+
+        # Timing of the phases of the steps, merged from all the jobs by evaluate(), or None
+        self.instrumentation = Instrumentation() if configuration.get("instrumentation", False) else None
+
+        # Play the games with the compiled kernel, when possible
+        self.kernel = configuration.get("kernel", False)
+
+        # Configurations of the policies
+        self.policies = configuration["policies"]
+        self.nbPolicies = len(self.policies)
+
+        # Choices and rewards of each policy and repetition, of shape (nbPolicies, repetitions, horizon), filled by evaluate()
+        self.choices = None
+        self.rewards = None
+
+    def __repr__(self):
+        return "{}(horizon: {}, repetitions: {}, n_jobs: {}, seed: {}, policies: {})".format(self.__class__.__name__, self.horizon, self.repetitions, self.n_jobs, self.seed, [p["archtype"].__name__ for p in self.policies])
+
+    def evaluate(self):
+        """ Play all the (policy, repetition) jobs, and fill self.choices and self.rewards."""
+        shape = (self.nbPolicies, self.repetitions, self.horizon)
+        size = int(np.prod(shape))
+        choicesShm = SharedMemory(create=True, size=max(1, size * np.dtype(int).itemsize))
+        rewardsShm = SharedMemory(create=True, size=max(1, size * np.dtype(float).itemsize))
+        try:
+            # One seed sequence by job, in a fixed order
+            seeds = np.random.SeedSequence(self.seed).spawn(self.nbPolicies * self.repetitions)
+            jobs = [
+                (self.env, policyConfiguration, self.horizon, seeds[policyId * self.repetitions + repetitionId], policyId, repetitionId, choicesShm.name, rewardsShm.name, shape, self.instrumentation is not None, self.kernel)
+                for policyId, policyConfiguration in enumerate(self.policies)
+                for repetitionId in range(self.repetitions)
+            ]
+            print("\nEvaluating {} policies, {} repetitions of horizon {}, with {} process(es) ...".format(self.nbPolicies, self.repetitions, self.horizon, self.n_jobs))  # DEBUG
+            if self.n_jobs == 1:
+                instrumentations = [_playOneRepetition(*job) for job in jobs]
+            else:
+                with ProcessPoolExecutor(max_workers=self.n_jobs) as executor:
+                    # Raise the errors of the jobs, if any
+                    instrumentations = [future.result() for future in [executor.submit(_playOneRepetition, *job) for job in jobs]]
+            if self.instrumentation is not None:
+                for instrumentation in instrumentations:
+                    self.instrumentation.merge(instrumentation)
+            self.choices = np.ndarray(shape, dtype=int, buffer=choicesShm.buf).copy()
+            self.rewards = np.ndarray(shape, dtype=float, buffer=rewardsShm.buf).copy()
+        finally:
+            for shm in (choicesShm, rewardsShm):
+                shm.close()
+                shm.unlink()
+        return self
+
+    # --- Getters
+
+    def getPolicyName(self, policyId):
+        """ Name of the policyId-th policy."""
+        policyConfiguration = self.policies[policyId]
+        return str(policyConfiguration["archtype"](self.env.nbArms, **policyConfiguration.get("params", {})))
+
+    def getAverageRewards(self, policyId):
+        """ Average reward until each time, averaged on the repetitions.
+        - It is a vector of length horizon.
+        """
+        return np.cumsum(np.mean(self.rewards[policyId], axis=0)) / np.arange(1, 1 + self.horizon)
+
+    def getCumulatedRegret(self, policyId):
+        """ Cumulated (pseudo) regret, averaged on the repetitions, against the best arm at each time.
+        - It is a vector of length horizon.
+        """
+        return np.cumsum(np.mean(self.env.regrets(self.choices[policyId]), axis=0))
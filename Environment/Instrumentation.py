@@ -0,0 +1,170 @@
+# -*- coding: utf-8 -*-
+"""
+:class:`Instrumentation` class to measure where the time of each step goes: ``choice()``, ``draw()``, ``getReward()`` or ``store()``.
+- instrument(obj) changes the class of obj (a policy, a :class:`MAB`, a result, a :class:`Policies.BanditPool`, a simulation...) to a subclass of the same name whose methods of these four phases are timed, and restore(obj) changes it back. Objects which are not instrumented run at full speed: there is no test in the hot path when disabled.
+- For each phase and each policy class (or arm type, for ``draw()``), the number of calls, the total time and a histogram of the times (by powers of 2 of ns) are accumulated, and :meth:`Instrumentation.report` shows them.
+- Only the outermost timed call is counted (eg. choice() called by choice_batch()). The counters are not protected by a lock: instrument one thread at a time.
+- From a simulation, give the instrumentation to :meth:`Environment.Simulation.BatchedSimulation.run`, or ``"instrumentation": True`` in the configuration of the :class:`Environment.Evaluator`. For a served policy::
+    instrumentation = Instrumentation().instrument(server.policy)
+    ...
+    print(instrumentation.report())
+"""
+
+import time
+import numpy as np
+
+
+#: Methods timed, and their phase
+METHODS = {
+    "choice": "choice",
+    "choice_batch": "choice",
+    "draw": "draw",
+    "draw_multiple": "draw",
+    "getReward": "getReward",
+    "getReward_batch": "getReward",
+    "store": "store",
+    "_choice": "choice",  # BatchedSimulation._choice(policy)
+}
+
+#: Order of the phases in the report
+PHASES = ["choice", "draw", "getReward", "store"]
+
+#: Number of buckets of the histograms: the bucket b counts the times in [2^(b-1), 2^b) ns
+NB_BUCKETS = 64
+
+
+class PhaseCounter(object):
+    """ Number of calls, total time and histogram of the times of one phase, for one label."""
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0
+        self.histogram = [0] * NB_BUCKETS
+
+    def add(self, elapsed):
+        """ Count one call which took 'elapsed' ns."""
+        self.count += 1
+        self.total += elapsed
+        self.histogram[min(NB_BUCKETS - 1, elapsed.bit_length())] += 1
+
+    def merge(self, other):
+        """ Add the counts of the PhaseCounter 'other'."""
+        self.count += other.count
+        self.total += other.total
+        self.histogram = [a + b for a, b in zip(self.histogram, other.histogram)]
+
+    def quantile(self, q):
+        """ Upper bound of the q-quantile of the times, in ns, from the histogram (at most 2 times too large)."""
+        rank = q * self.count
+        cumulated = np.cumsum(self.histogram)
+        return 1 << int(np.searchsorted(cumulated, rank))
+
+
+class Instrumentation(object):
+    """ Timing counters of the phases of the steps, for the instrumented objects."""
+
+    def __init__(self):
+        """ New instrumentation, with no counter."""
+        # PhaseCounter of each (phase, label)
+        self.counters = {}
+
+        # Instrumented subclass of each class
+        self._classes = {}
+
+        # Number of timed calls running, to count only the outermost one
+        self._depth = 0
+
+    def __repr__(self):
+        return "{}(counters: {})".format(self.__class__.__name__, len(self.counters))
+
+    def __getstate__(self):
+        """ Only the counters are pickled (eg. to be sent back by a process), not the instrumented classes."""
+        return {"counters": self.counters}
+
+    def __setstate__(self, state):
+        self.__init__()
+        self.counters = state["counters"]
+
+    def counter(self, phase, label):
+        """ PhaseCounter of that phase and label, created if needed."""
+        key = (phase, label)
+        if key not in self.counters:
+            self.counters[key] = PhaseCounter()
+        return self.counters[key]
+
+    def merge(self, other):
+        """ Add the counts of the instrumentation 'other', eg. played in another process."""
+        for (phase, label), counter in other.counters.items():
+            self.counter(phase, label).merge(counter)
+        return self
+
+    # --- Instrument objects
+
+    @staticmethod
+    def _label(name, obj, args, kwargs):
+        """ Label of a call to the method 'name' of obj: the type of the drawn arm for MAB.draw(armId), the class of the policy for BatchedSimulation._choice(policy), otherwise the class of obj."""
+        if name == "draw" and isinstance(getattr(obj, "arms", None), list):
+            return type(obj.arms[args[0] if args else kwargs["armId"]]).__name__
+        if name == "_choice":
+            obj = args[0]
+        return getattr(obj.__class__, "_originalClass", obj.__class__).__name__
+
+    def _timed(self, method, name, phase):
+        """ Timed version of the method 'name', counting in that phase."""
+        perf_counter_ns = time.perf_counter_ns
+        instrumentation = self
+
+        def timed(obj, *args, **kwargs):
+            if instrumentation._depth:
+                return method(obj, *args, **kwargs)
+            instrumentation._depth += 1
+            start = perf_counter_ns()
+            try:
+                return method(obj, *args, **kwargs)
+            finally:
+                elapsed = perf_counter_ns() - start
+                instrumentation._depth -= 1
+                instrumentation.counter(phase, instrumentation._label(name, obj, args, kwargs)).add(elapsed)
+        timed.__name__ = method.__name__
+        timed.__doc__ = method.__doc__
+        return timed
+
+    def _instrumentedClass(self, cls):
+        """ Subclass of cls with the same name, whose methods of the phases are timed."""
+        if cls not in self._classes:
+            namespace = {"__slots__": (), "_originalClass": cls, "__module__": cls.__module__}
+            for name, phase in METHODS.items():
+                method = getattr(cls, name, None)
+                if callable(method):
+                    namespace[name] = self._timed(method, name, phase)
+            self._classes[cls] = type(cls.__name__, (cls,), namespace)
+        return self._classes[cls]
+
+    def instrument(self, *objects):
+        """ Time the phases of these objects, until restore() is called. Their copies (copy.copy) are also timed, but they cannot be pickled."""
+        for obj in objects:
+            if getattr(obj.__class__, "_originalClass", None) is None:
+                obj.__class__ = self._instrumentedClass(obj.__class__)
+        return self
+
+    def restore(self, *objects):
+        """ Stop timing the phases of these objects."""
+        for obj in objects:
+            originalClass = getattr(obj.__class__, "_originalClass", None)
+            if originalClass is not None:
+                obj.__class__ = originalClass
+        return self
+
+    # --- Report
+
+    def report(self):
+        """ Table of the counts and times of each phase and label, and the share of each in the total time."""
+        total = float(sum(counter.total for counter in self.counters.values())) or 1.
+        lines = ["{:<10} {:<28} {:>10} {:>12} {:>10} {:>10} {:>10} {:>7}".format("Phase", "Label", "Calls", "Total (ms)", "Mean (ns)", "p50 (ns)", "p99 (ns)", "Share")]
+        order = sorted(self.counters, key=lambda key: (PHASES.index(key[0]) if key[0] in PHASES else len(PHASES), key[1]))
+        for phase, label in order:
+            counter = self.counters[(phase, label)]
+            lines.append("{:<10} {:<28} {:>10} {:>12.1f} {:>10.0f} {:>10} {:>10} {:>6.1%}".format(
+                phase, label, counter.count, counter.total / 1e6, counter.total / max(1, counter.count),
+                "<{}".format(counter.quantile(0.5)), "<{}".format(counter.quantile(0.99)), counter.total / total))
+        return "\n".join(lines)
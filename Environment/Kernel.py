@@ -0,0 +1,211 @@
+# -*- coding: utf-8 -*-
+"""
+:func:`playGame` plays one game of a policy on a MAB problem for the whole horizon, in one compiled function if :mod:`numba` is installed (optional dependency).
+- The compiled kernel runs the loop of choice, draw and getReward without the Python interpreter, for the policies UCB, UCBalpha, UCBplus, UCBV, EmpiricalMeans, EpsilonGreedy, ETC_KnownGap and Thompson (with its default :class:`BetaArray` posterior), and the arms Bernoulli, Gaussian, Uniform and Constant, of a stationary problem.
+- It draws its random values from numba's generator, seeded from the policy's rng: the games have the same distribution as with the Python loop, but not the same samples.
+- Without numba, or for any other policy or arm, :func:`playGame` runs the usual Python loop. In both cases it returns the same :class:`Result`, and leaves the policy in the same state as after the loop.
+"""
+
+import numpy as np
+
+try:
+    import numba
+except ImportError:
+    numba = None
+
+try:
+    from .Results import Result
+except ImportError:
+    from Results import Result
+
+try:
+    from ..Arms import Bernoulli, Gaussian, Uniform, Constant
+    from ..Policies import UCB, UCBalpha, UCBplus, UCBV, EmpiricalMeans, EpsilonGreedy, ETC_KnownGap, Thompson
+    from ..Policies.Posterior import BetaArray
+except ImportError:
+    from Arms import Bernoulli, Gaussian, Uniform, Constant
+    from Policies import UCB, UCBalpha, UCBplus, UCBV, EmpiricalMeans, EpsilonGreedy, ETC_KnownGap, Thompson
+    from Policies.Posterior import BetaArray
+
+
+#: True if numba is installed, and the games of the supported policies are compiled
+HAS_NUMBA = numba is not None
+
+# Codes of the supported policies, in the kernel
+UCB_CODE, UCBALPHA_CODE, UCBPLUS_CODE, UCBV_CODE, EMPIRICALMEANS_CODE, EPSILONGREEDY_CODE, THOMPSON_CODE = range(7)
+
+# Codes of the supported arms, in the kernel
+BERNOULLI_CODE, GAUSSIAN_CODE, UNIFORM_CODE, CONSTANT_CODE = range(4)
+
+#: Code of each supported policy class (not their subclasses)
+POLICY_CODES = {
+    UCB: UCB_CODE,
+    UCBalpha: UCBALPHA_CODE,
+    UCBplus: UCBPLUS_CODE,
+    UCBV: UCBV_CODE,
+    EmpiricalMeans: EMPIRICALMEANS_CODE,
+    EpsilonGreedy: EPSILONGREEDY_CODE,
+    ETC_KnownGap: EPSILONGREEDY_CODE,
+    Thompson: THOMPSON_CODE,
+}
+
+#: Code of each supported arm class
+ARM_CODES = {
+    Bernoulli: BERNOULLI_CODE,
+    Gaussian: GAUSSIAN_CODE,
+    Uniform: UNIFORM_CODE,
+    Constant: CONSTANT_CODE,
+}
+
+
+def _playKernel(policyCode, params, armCodes, armParams, horizon, seed, t, pulls, rewards, invPulls, rewardsSquared, posterior, choices, outRewards):
+    """ Play horizon steps of the policy of that code, write the choices and rewards in choices and outRewards, update its statistics in place, and return its new time t.
+    - params are [lower, amplitude, parameter, maxTime]: parameter is alpha for UCBalpha and epsilon for EpsilonGreedy, which explores at every step until t > maxTime.
+    - armParams has one row by arm: [probability] for Bernoulli, [mu, sigma, min, max] for Gaussian, [lower, amplitude] for Uniform, [constant_reward] for Constant.
+    """
+    np.random.seed(seed)
+    nbArms = len(armCodes)
+    lower, amplitude, parameter, maxTime = params[0], params[1], params[2], params[3]
+    for step in range(horizon):
+        # 1. The policy chooses an arm, uniformly at random among the ties
+        if policyCode == EPSILONGREEDY_CODE and np.random.random() < (parameter if t > maxTime else 1.):
+            arm = np.random.randint(0, nbArms)
+        else:
+            logTime = np.log(max(t, 1))
+            best, arm, ties = -np.inf, 0, 0
+            for k in range(nbArms):
+                if policyCode == THOMPSON_CODE:
+                    value = np.random.beta(posterior[1, k], posterior[0, k])
+                elif policyCode == EPSILONGREEDY_CODE:
+                    value = rewards[k]
+                elif pulls[k] < 1:
+                    value = np.inf
+                else:
+                    inv = invPulls[k]
+                    mean = rewards[k] * inv
+                    if policyCode == UCB_CODE:
+                        value = mean + np.sqrt(2. * logTime * inv)
+                    elif policyCode == UCBALPHA_CODE:
+                        value = mean + np.sqrt(0.5 * parameter * logTime * inv)
+                    elif policyCode == UCBPLUS_CODE:
+                        value = mean + np.sqrt(np.log(max(1., t * inv)) * 0.5 * inv)
+                    elif policyCode == UCBV_CODE:
+                        variance = max(0., rewardsSquared[k] * inv - mean * mean)
+                        value = mean + np.sqrt(2. * logTime * variance * inv) + 3. * amplitude * logTime * inv
+                    else:
+                        value = mean
+                if value > best:
+                    best, arm, ties = value, k, 1
+                elif value == best:
+                    # Reservoir sampling: each of the ties is kept with probability 1 / ties
+                    ties += 1
+                    if np.random.randint(0, ties) == 0:
+                        arm = k
+
+        # 2. A random reward is drawn, from this arm
+        armCode = armCodes[arm]
+        if armCode == BERNOULLI_CODE:
+            reward = 1. if np.random.random() < armParams[arm, 0] else 0.
+        elif armCode == GAUSSIAN_CODE:
+            reward = min(max(np.random.normal(armParams[arm, 0], armParams[arm, 1]), armParams[arm, 2]), armParams[arm, 3])
+        elif armCode == UNIFORM_CODE:
+            reward = armParams[arm, 0] + np.random.random() * armParams[arm, 1]
+        else:
+            reward = armParams[arm, 0]
+        choices[step] = arm
+        outRewards[step] = reward
+
+        # 3. The policy sees the reward, normalized in [0, 1]
+        t += 1
+        r = (reward - lower) / amplitude
+        if policyCode == THOMPSON_CODE:
+            # Random binarization of the reward, as bernoulliBinarization()
+            if r == 0. or (r != 1. and np.random.random() >= r):
+                posterior[0, arm] += 1.
+            else:
+                posterior[1, arm] += 1.
+        else:
+            pulls[arm] += 1
+            rewards[arm] += r
+            invPulls[arm] = 1. / pulls[arm]
+            rewardsSquared[arm] += r * r
+    return t
+
+
+#: Compiled kernel, or None without numba
+_compiledKernel = numba.njit(cache=True, nogil=True)(_playKernel) if numba is not None else None
+
+
+def isSupported(env, policy):
+    """ True if the game of this policy on the MAB problem env can be played by the compiled kernel (whether numba is installed or not)."""
+    if not env.isStationary or type(policy) not in POLICY_CODES or not all(type(arm) in ARM_CODES for arm in env.arms):
+        return False
+    if isinstance(policy, Thompson):
+        return isinstance(policy.posterior, BetaArray) and policy.posterior.N.ndim == 2
+    return policy.stats.ndim == 1
+
+
+def _armParams(arm):
+    """ Row of parameters of the arm, for the kernel."""
+    if isinstance(arm, Bernoulli):
+        return [arm.probability, 0., 0., 0.]
+    if isinstance(arm, Gaussian):
+        return [arm.mu, arm.sigma, arm.min, arm.max]
+    if isinstance(arm, Uniform):
+        return [arm.lower, arm.amplitude, 0., 0.]
+    return [arm.constant_reward, 0., 0., 0.]
+
+
+def _playCompiled(env, policy, horizon, result):
+    """ Play the game with the compiled kernel, and copy the statistics back in the policy."""
+    nbArms = policy.nbArms
+    if isinstance(policy, EpsilonGreedy):
+        # ETC_KnownGap explores until t > max_t, then never: it is an EpsilonGreedy with epsilon = 0 after max_t
+        params = [policy.lower, policy.amplitude, 0., policy.max_t] if isinstance(policy, ETC_KnownGap) else [policy.lower, policy.amplitude, policy.epsilon, -1.]
+    else:
+        params = [policy.lower, policy.amplitude, getattr(policy, 'alpha', 0.), -1.]
+    fields = policy.stats.dtype.names
+    pulls = np.ascontiguousarray(policy.pulls, dtype=np.int64)
+    rewards = np.ascontiguousarray(policy.rewards, dtype=float)
+    invPulls = np.ascontiguousarray(policy.invPulls) if 'invPulls' in fields else np.zeros(nbArms)
+    rewardsSquared = np.ascontiguousarray(policy.rewardsSquared) if 'rewardsSquared' in fields else np.zeros(nbArms)
+    posterior = np.ascontiguousarray(policy.posterior.N) if isinstance(policy, Thompson) else np.zeros((2, nbArms))
+    seed = int(policy.rng.integers(2**32))
+    policy.t = _compiledKernel(
+        POLICY_CODES[type(policy)], np.array(params, dtype=float),
+        np.array([ARM_CODES[type(arm)] for arm in env.arms], dtype=np.int64), np.array([_armParams(arm) for arm in env.arms], dtype=float),
+        horizon, seed, int(policy.t), pulls, rewards, invPulls, rewardsSquared, posterior, result.choices, result.rewards)
+    # Copy the statistics back in the policy, and rebuild its lazy tree if any
+    policy.pulls[:] = pulls
+    policy.rewards[:] = rewards
+    if 'invPulls' in fields:
+        policy.invPulls[:] = invPulls
+    if 'rewardsSquared' in fields:
+        policy.rewardsSquared[:] = rewardsSquared
+    if isinstance(policy, Thompson):
+        policy.posterior.N[:] = posterior
+    policy._setStateArrays(policy._stateArrays())
+    result.pulls += np.bincount(result.choices, minlength=nbArms)
+
+
+def playGame(env, policy, horizon):
+    """ Play one game of horizon steps of the policy on the MAB problem env, from the current state of the policy (eg. just after startGame()), and return its :class:`Result`.
+    - With numba, and a policy and arms supported by the kernel, the whole game is one call to the compiled kernel. Otherwise, it is the usual Python loop.
+    """
+    result = Result(env.nbArms, horizon)
+    if _compiledKernel is not None and isSupported(env, policy):
+        _playCompiled(env, policy, horizon, result)
+        return result
+    for t in range(horizon):
+        # 1. The player's policy choose an arm
+        choice = policy.choice()
+
+        # 2. A random reward is drawn, from this arm at this time
+        reward = env.draw(choice, t)
+
+        # 3. The policy sees the reward
+        policy.getReward(choice, reward)
+
+        # 4. Finally we store the results
+        result.store(t, choice, reward)
+    return result
@@ -3,12 +3,18 @@
 :class:`MAB` class to wrap the arms of some Multi-Armed Bandit problem.
 Such class has to have *at least* these methods:
 - ``draw(armId, t)`` to draw *one* sample from that ``armId`` at time ``t``,
+- ``draw_multiple(armIds, t)`` to draw one sample from each arm of ``armIds`` at time ``t``, in one call.
 """
 
 
 import numpy as np
 import matplotlib.pyplot as plt
 
+try:
+    from .Results import OnlineStatistics, NB_CHECKPOINTS
+except ImportError:
+    from Results import OnlineStatistics, NB_CHECKPOINTS
+
 
 class MAB(object):
     """ Basic Multi-Armed Bandit problem, for stochastic and i.i.d. arms.
@@ -28,9 +34,14 @@ class MAB(object):
             Bernoulli(0.9),
         ]
     - Both will create three Bernoulli arms, of parameters (means) 0.1, 0.5 and 0.9.
+    - With buffer_size = B, draw() takes its rewards from blocks of B samples of each arm, pre-drawn with draw_nparray() and refilled when empty. This removes the cost of one call to the random generator per reward.
+    - With rng = a numpy Generator, all the arms draw their rewards from it (see :meth:`setRNG`), otherwise each arm keeps its own (the shared default one, for the arms created without one).
     """
 
-    def __init__(self, configuration):
+    #: True if the means of the arms do not change with time
+    isStationary = True
+
+    def __init__(self, configuration, buffer_size=None, rng=None):
         """New MAB."""
         print("\n\nCreating a new MAB problem ...")  
         self.arms = []  #: List of arms
@@ -70,45 +81,94 @@ class MAB(object):
         self.minArm = np.min(self.means)  
         print(" - with 'minArm' =", self.minArm)  
 
+        # Size of the blocks of pre-drawn rewards, None for no buffer
+        assert buffer_size is None or buffer_size > 0, "Error: the 'buffer_size' parameter of a MAB object has to be None or > 0."  # DEBUG
+        self.buffer_size = buffer_size
+        if buffer_size is not None:
+            print(" - with 'buffer_size' =", self.buffer_size)  
+        self._buffers = [None] * self.nbArms
+        self._cursors = [0] * self.nbArms
+        if rng is not None:
+            self.setRNG(rng)
+
     def __repr__(self):
         return "{}(nbArms: {}, arms: {}, minArm: {:.3g}, maxArm: {:.3g})".format(self.__class__.__name__, self.nbArms, self.arms, self.minArm, self.maxArm)
 
+    def setRNG(self, rng):
+        """ Make all the arms draw their rewards from the numpy Generator rng, and drop the pre-drawn rewards."""
+        for arm in self.arms:
+            arm.rng = rng
+        self._buffers = [None] * self.nbArms
+
     # --- Draw samples
 
     def draw(self, armId, t=1):
         """ Return a random sample from the armId-th arm, at time t. Usually t is not used."""
-        return self.arms[armId].draw(t)
+        if self.buffer_size is None:
+            return self.arms[armId].draw(t)
+        # Take the next pre-drawn reward, and refill the block of that arm if needed
+        buffer, i = self._buffers[armId], self._cursors[armId]
+        if buffer is None or i >= self.buffer_size:
+            buffer = self._buffers[armId] = self.arms[armId].draw_nparray((self.buffer_size,))
+            i = 0
+        self._cursors[armId] = i + 1
+        return buffer[i]
+
+    def draw_multiple(self, armIds, t=1):
+        """ Return one random sample from each arm of armIds (arms can be repeated), at time t, as a numpy array. Usually t is not used.
+        - If these arms are of the same type and draw from the same numpy Generator (see :meth:`setRNG`), they are all drawn in one call, with the draw_arms() method of their class.
+        """
+        armIds = np.asarray(armIds)
+        arms = [self.arms[armId] for armId in armIds.ravel().tolist()]
+        if arms:
+            first = arms[0]
+            armType, rng = type(first), first.rng
+            if hasattr(armType, 'draw_arms') and all(type(arm) is armType and arm.rng is rng for arm in arms):
+                return armType.draw_arms(arms, rng).reshape(armIds.shape)
+        rewards = np.zeros(len(armIds))
+        for armId in np.unique(armIds):
+            chosen = armIds == armId
+            rewards[chosen] = self.arms[armId].draw_nparray((np.count_nonzero(chosen),))
+        return rewards
 
     #
     # --- Helper to compute vector of min arms, max arms, all arms
 
+    def sumBestMeans(self, M=1):
+        """Return the sum of the M best means of the arms, in O(nbArms) with :func:`numpy.partition`."""
+        assert 0 < M <= self.nbArms, "Error: the 'M' parameter of sumBestMeans() has to be in [1, nbArms]."  # DEBUG
+        return np.sum(np.partition(self.means, self.nbArms - M)[self.nbArms - M:])
+
     def get_minArm(self, horizon=None):
         """Return the vector of min mean of the arms.
-        - It is a vector of length horizon.
+        - It is a read-only vector of length horizon, which does not use O(horizon) memory.
         """
-        return np.full(horizon, self.minArm)
+        return np.broadcast_to(self.minArm, (horizon,))
         # return self.minArm  # XXX Nope, it's not a constant!
 
     def get_maxArm(self, horizon=None):
         """Return the vector of max mean of the arms.
-        - It is a vector of length horizon.
+        - It is a read-only vector of length horizon, which does not use O(horizon) memory.
         """
-        return np.full(horizon, self.maxArm)
+        return np.broadcast_to(self.maxArm, (horizon,))
         # return self.maxArm  # XXX Nope, it's not a constant!
 
     def get_maxArms(self, M=1, horizon=None):
         """Return the vector of sum of the M-best means of the arms.
-        - It is a vector of length horizon.
+        - It is a read-only vector of length horizon, which does not use O(horizon) memory.
         """
-        return np.full(horizon, self.sumBestMeans(M))
+        return np.broadcast_to(self.sumBestMeans(M), (horizon,))
 
     def get_allMeans(self, horizon=None):
         """Return the vector of means of the arms.
-        - It is a numpy array of shape (nbArms, horizon).
+        - It is a read-only numpy array of shape (nbArms, horizon), a view on self.means which does not use O(nbArms * horizon) memory.
         """
-        # allMeans = np.tile(self.means, (horizon, 1)).T
-        allMeans = np.zeros((self.nbArms, horizon))
-        for t in range(horizon):
-            allMeans[:, t] = self.means
-        return allMeans
+        return np.broadcast_to(self.means[:, np.newaxis], (self.nbArms, horizon))
+
+    def regrets(self, choices, start=0):
+        """Return the (pseudo) regret of each of these choices, made at the times start, start + 1, ... (along the last axis of choices): the gap between the best mean and the mean of the chosen arm."""
+        return self.maxArm - self.means[np.asarray(choices)]
 
+    def get_statistics(self, horizon, nbCheckpoints=NB_CHECKPOINTS):
+        """Return new :class:`OnlineStatistics` for one game on this problem, with nbCheckpoints log-spaced checkpoints until horizon."""
+        return OnlineStatistics(self.means, horizon, nbCheckpoints=nbCheckpoints)
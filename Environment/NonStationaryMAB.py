@@ -0,0 +1,165 @@
+# -*- coding: utf-8 -*-
+"""
+:class:`NonStationaryMAB` class, for Multi-Armed Bandit problems whose means change with time: piecewise-stationary (with breakpoints) or drifting.
+- The means follow a schedule, a vectorized function of the times: an array of T times gives an array of shape (T, nbArms) of means.
+- They are computed lazily by chunks of times, with the best mean of each time: a game costs O(nbArms * chunkSize) memory and one call to the schedule by chunk, not a dense (nbArms, horizon) array.
+- ``draw(armId, t)`` changes the mean of the arm with its ``set_mean_param()`` method only if it changed since its last draw, and draws as :class:`MAB`.
+- The regret is against the best arm at each time: :meth:`NonStationaryMAB.regrets` computes it for any block of choices, and :class:`Results.StreamingResult` accumulates it chunk by chunk if it is given the problem instead of the means.
+"""
+
+import numpy as np
+
+try:
+    from .MAB import MAB
+except ImportError:
+    from MAB import MAB
+
+
+#: Default number of means (nbArms * chunkSize) computed at once by the schedule
+CHUNK_VALUES = 1 << 20
+
+
+class PiecewiseStationary(object):
+    """ Schedule of piecewise-stationary means: means[i] from the time breakpoints[i] (included) to breakpoints[i + 1] (excluded), and the first breakpoint is 0."""
+
+    def __init__(self, breakpoints, means):
+        self.breakpoints = np.asarray(breakpoints, dtype=int)
+        self.means = np.asarray(means, dtype=float)
+        assert len(self.breakpoints) > 0 and self.breakpoints[0] == 0 and np.all(np.diff(self.breakpoints) > 0), "Error: the breakpoints of a PiecewiseStationary schedule have to be increasing, from 0."  # DEBUG
+        assert self.means.ndim == 2 and len(self.means) == len(self.breakpoints), "Error: a PiecewiseStationary schedule needs one vector of means by breakpoint."  # DEBUG
+
+    def __repr__(self):
+        return "{}(breakpoints: {})".format(self.__class__.__name__, self.breakpoints.tolist())
+
+    def __call__(self, times):
+        """ Means at these times, of shape (len(times), nbArms)."""
+        return self.means[np.searchsorted(self.breakpoints, times, side='right') - 1]
+
+
+class NonStationaryMAB(MAB):
+    """ Multi-Armed Bandit problem whose means follow a schedule.
+    - configuration is as for :class:`MAB`: all the arms need a ``set_mean_param()`` method (eg. Bernoulli, Gaussian, Uniform, Constant).
+    - schedule is a dict with 'breakpoints' and 'means' keys, for a piecewise-stationary problem (see :class:`PiecewiseStationary`), or a function of an array of times returning the means at these times, of shape (len(times), nbArms). Example of a drift::
+        def drift(times):
+            return 0.5 + 0.4 * np.sin(times[:, np.newaxis] / 1000. + np.arange(3))
+        env = NonStationaryMAB({'arm_type': Bernoulli, 'params': [0.5] * 3}, drift)
+    - The function has to be picklable (eg. not a lambda) for an :class:`Environment.Evaluator` with n_jobs > 1.
+    - chunkSize is the number of times of the means kept in memory, by default such that they are about :data:`CHUNK_VALUES` values.
+    - self.means, self.maxArm and self.minArm are the ones at time 0.
+    """
+
+    isStationary = False
+
+    def __init__(self, configuration, schedule, chunkSize=None, buffer_size=None, rng=None):
+        """New non-stationary MAB."""
+        super(NonStationaryMAB, self).__init__(configuration, buffer_size=buffer_size, rng=rng)
+        if isinstance(schedule, dict):
+            schedule = PiecewiseStationary(schedule["breakpoints"], schedule["means"])
+        self.schedule = schedule  #: Means at an array of times
+        self.chunkSize = max(1, CHUNK_VALUES // self.nbArms) if chunkSize is None else int(chunkSize)  #: Number of times of the means kept in memory
+        assert self.chunkSize > 0, "Error: the 'chunkSize' parameter of a NonStationaryMAB object cannot be <= 0."  # DEBUG
+        print(" - with 'schedule' =", self.schedule)
+
+        # Lazily computed chunk of means: first time, means of shape (chunkSize, nbArms), and best mean of each time
+        self._chunkStart = None
+        self._chunkMeans = None
+        self._chunkBest = None
+
+        # Means at time 0, and current mean of each arm
+        means = self.meansAt(np.arange(1))
+        if means.shape != (1, self.nbArms):
+            raise ValueError("Error: the schedule of a NonStationaryMAB object has to give {} means by time, not an array of shape {}.".format(self.nbArms, means.shape[1:]))
+        self.means = means[0].copy()
+        self.maxArm = np.max(self.means)
+        self.minArm = np.min(self.means)
+        for arm, mean in zip(self.arms, self.means.tolist()):
+            arm.set_mean_param(mean)
+        self._current = self.means.tolist()
+
+    def __repr__(self):
+        return "{}(nbArms: {}, arms: {}, schedule: {})".format(self.__class__.__name__, self.nbArms, self.arms, self.schedule)
+
+    # --- Means by chunks
+
+    def meansAt(self, times):
+        """Return the means at these times, as an array of shape (len(times), nbArms)."""
+        return np.asarray(self.schedule(np.asarray(times, dtype=int)), dtype=float)
+
+    def _chunk(self, t):
+        """ First time, means and best means of the chunk of time t, computed if it is not the current one."""
+        start = t - t % self.chunkSize
+        if start != self._chunkStart:
+            self._chunkMeans = self.meansAt(np.arange(start, start + self.chunkSize))
+            self._chunkBest = np.max(self._chunkMeans, axis=1)
+            self._chunkStart = start
+        return start, self._chunkMeans, self._chunkBest
+
+    def _byChunks(self, horizon, function):
+        """ Vector of length horizon, of the function of the means of each chunk of times (an array of shape (chunkSize, nbArms) giving a vector of length chunkSize)."""
+        values = np.zeros(horizon)
+        for start in range(0, horizon, self.chunkSize):
+            stop = min(horizon, start + self.chunkSize)
+            values[start:stop] = function(self.meansAt(np.arange(start, stop)))
+        return values
+
+    # --- Draw samples
+
+    def _setMean(self, armId, t):
+        """ Give the armId-th arm its mean at time t, and drop its pre-drawn rewards if it changed."""
+        start, means, _ = self._chunk(t)
+        mean = means[t - start, armId]
+        if mean != self._current[armId]:
+            self.arms[armId].set_mean_param(mean)
+            self._current[armId] = mean
+            self._buffers[armId] = None
+
+    def draw(self, armId, t=1):
+        """ Return a random sample from the armId-th arm, at time t."""
+        self._setMean(armId, t)
+        return super(NonStationaryMAB, self).draw(armId, t)
+
+    def draw_multiple(self, armIds, t=1):
+        """ Return one random sample from each arm of armIds (arms can be repeated), at time t, as a numpy array."""
+        for armId in np.unique(armIds).tolist():
+            self._setMean(armId, t)
+        return super(NonStationaryMAB, self).draw_multiple(armIds, t)
+
+    # --- Regret against the best arm at each time
+
+    def regrets(self, choices, start=0):
+        """Return the (pseudo) regret of each of these choices, made at the times start, start + 1, ... (along the last axis of choices): the gap between the best mean and the mean of the chosen arm, at each time."""
+        choices = np.asarray(choices)
+        regrets = np.zeros(choices.shape)
+        t, end = start, start + choices.shape[-1]
+        while t < end:
+            first, means, best = self._chunk(t)
+            stop = min(end, first + self.chunkSize)
+            rows = np.arange(t - first, stop - first)
+            regrets[..., t - start:stop - start] = best[rows] - means[rows, choices[..., t - start:stop - start]]
+            t = stop
+        return regrets
+
+    #
+    # --- Helper to compute vector of min arms, max arms, all arms
+
+    def get_minArm(self, horizon=None):
+        """Return the vector of min mean of the arms at each time, computed by chunks."""
+        return self._byChunks(horizon, lambda means: np.min(means, axis=1))
+
+    def get_maxArm(self, horizon=None):
+        """Return the vector of max mean of the arms at each time, computed by chunks."""
+        return self._byChunks(horizon, lambda means: np.max(means, axis=1))
+
+    def get_maxArms(self, M=1, horizon=None):
+        """Return the vector of sum of the M-best means of the arms at each time, computed by chunks."""
+        return self._byChunks(horizon, lambda means: np.sum(np.partition(means, -M, axis=1)[:, -M:], axis=1))
+
+    def get_allMeans(self, horizon=None):
+        """Return the means of the arms at each time.
+        - It is a numpy array of shape (nbArms, horizon): it uses O(nbArms * horizon) memory, prefer :meth:`meansAt` on blocks of times, or :meth:`regrets`.
+        """
+        return self.meansAt(np.arange(horizon)).T
+
+    def get_statistics(self, horizon, nbCheckpoints=None):
+        """The :class:`OnlineStatistics` are for fixed means: use a :class:`Results.StreamingResult` given this problem instead."""
+        raise NotImplementedError("Error: the OnlineStatistics cannot follow the means of a {}, use StreamingResult(..., means=env) instead.".format(self.__class__.__name__))
@@ -1,14 +1,100 @@
 # -*- coding: utf-8 -*-
-""" Result.Result class to wrap the simulation results."""
+""" Result.Result class to wrap the simulation results.
+- :class:`OnlineStatistics` updates the regret, the rate of selection of the best arm and the pulls at each step, and keeps them at log-spaced checkpoints only.
+- :class:`StreamingResult` stores them by chunks, in an append-only binary file read back as a :class:`numpy.memmap`, and keeps running aggregates: very long horizons do not have to fit in memory.
+"""
 import numpy as np
 
 
+#: Default number of log-spaced checkpoints of :class:`OnlineStatistics`
+NB_CHECKPOINTS = 1000
+
+#: Default number of steps kept in memory by :class:`StreamingResult`, before writing them to its file
+CHUNK_SIZE = 1 << 16
+
+
+def logCheckpoints(horizon, nbCheckpoints=NB_CHECKPOINTS):
+    """ At most nbCheckpoints numbers of steps in [1, horizon], log-spaced, always with 1 and horizon."""
+    return np.unique(np.geomspace(1, max(1, horizon), nbCheckpoints).round().astype(int))
+
+
+class OnlineStatistics(object):
+    """
+    Online accumulators of the statistics of one game, for arms of means 'means'.
+    - update() costs O(1): it increases the pulls, the cumulated reward and the cumulated (pseudo) regret, and counts the selections of a best arm.
+    - These values are kept after each number of steps in self.times, log-spaced by default: a regret curve costs O(nbCheckpoints) memory instead of O(horizon).
+    """
+
+    def __init__(self, means, horizon, nbCheckpoints=NB_CHECKPOINTS, checkpoints=None):
+        """ 
+        Create the accumulators, with the checkpoints 'checkpoints' (numbers of steps, increasing), or nbCheckpoints log-spaced ones.
+        """
+        means = np.asarray(means, dtype=float)
+        # Gap of each arm, and if it is a best arm, as lists for quick access
+        self._gaps = (np.max(means) - means).tolist()
+        self._isBest = (means == np.max(means)).tolist()
+
+        # Numbers of steps at which the statistics are kept
+        self.times = logCheckpoints(horizon, nbCheckpoints) if checkpoints is None else np.asarray(checkpoints, dtype=int)
+        self._nextCheckpoint = 0
+
+        # Running values
+        self.time = 0
+        self.pulls = np.zeros(len(means), dtype=int)
+        self.cumulatedReward = 0.
+        self.cumulatedRegret = 0.
+        self.nbBestArm = 0
+
+        # Values at the checkpoints
+        self.cumulatedRegrets = np.zeros(len(self.times))
+        self.averageRewards = np.zeros(len(self.times))
+        self.bestArmRates = np.zeros(len(self.times))
+
+    def update(self, choice, reward):
+        """ 
+        Update the statistics with one step.
+        """
+        self.time += 1
+        self.pulls[choice] += 1
+        self.cumulatedReward += reward
+        self.cumulatedRegret += self._gaps[choice]
+        self.nbBestArm += self._isBest[choice]
+        i = self._nextCheckpoint
+        if i < len(self.times) and self.time == self.times[i]:
+            self.cumulatedRegrets[i] = self.cumulatedRegret
+            self.averageRewards[i] = self.cumulatedReward / self.time
+            self.bestArmRates[i] = self.nbBestArm / float(self.time)
+            self._nextCheckpoint = i + 1
+
+    def getCumulatedRegret(self):
+        """ 
+        Cumulated (pseudo) regret at each checkpoint reached, and these times.
+        """
+        n = self._nextCheckpoint
+        return self.times[:n], self.cumulatedRegrets[:n]
+
+    def getAverageRewards(self):
+        """ 
+        Average reward at each checkpoint reached, and these times.
+        """
+        n = self._nextCheckpoint
+        return self.times[:n], self.averageRewards[:n]
+
+    def getBestArmRates(self):
+        """ 
+        Rate of selection of a best arm at each checkpoint reached, and these times.
+        """
+        n = self._nextCheckpoint
+        return self.times[:n], self.bestArmRates[:n]
+
+
 class Result(object):
     """
     Result accumulators.
+    - With the means of the arms, the statistics are also updated online, in self.statistics (:class:`OnlineStatistics`).
     """
 
-    def __init__(self, nbArms, horizon):
+    def __init__(self, nbArms, horizon, means=None):
         """ 
         Create Result Array
         """
@@ -21,6 +107,9 @@ class Result(object):
         # Store the pulls.
         self.pulls = np.zeros(nbArms, dtype=int)  
 
+        # Online statistics, if the means are known.
+        self.statistics = None if means is None else OnlineStatistics(means, horizon)
+
 
     def store(self, time, choice, reward):
         """ 
@@ -29,3 +118,158 @@ class Result(object):
         self.choices[time] = choice
         self.rewards[time] = reward
         self.pulls[choice] += 1
+        if self.statistics is not None:
+            self.statistics.update(choice, reward)
+
+
+class BatchedResult(object):
+    """
+    Result accumulators, for R repetitions played together by :class:`Environment.Simulation.BatchedSimulation`.
+    """
+
+    def __init__(self, nbArms, horizon, repetitions):
+        """ 
+        Create Result Arrays, of shape (repetitions, horizon)
+        """
+        # Store all the choices.
+        self.choices = np.zeros((repetitions, horizon), dtype=int)  
+        
+        # Store all the rewards, to compute the mean.
+        self.rewards = np.zeros((repetitions, horizon))  
+        
+        # Store the pulls.
+        self.pulls = np.zeros((repetitions, nbArms), dtype=int)  
+
+    def store(self, time, choices, rewards):
+        """ 
+        Store results of the R repetitions at that time.
+        """
+        self.choices[:, time] = choices
+        self.rewards[:, time] = rewards
+        self.pulls[np.arange(len(choices)), choices] += 1
+
+    def getCumulatedRegret(self, means):
+        """ 
+        Cumulated (pseudo) regret, averaged on the repetitions, for arms of means 'means', or against the best arm at each time of the MAB problem 'means'.
+        - It is a vector of length horizon.
+        """
+        if hasattr(means, 'contextRegrets'):
+            raise ValueError("Error: the regret of a contextual problem depends on the contexts, compute it with {}.contextRegrets().".format(means.__class__.__name__))
+        if hasattr(means, 'regrets'):
+            return np.cumsum(np.mean(means.regrets(self.choices), axis=0))
+        means = np.asarray(means)
+        return np.cumsum(np.max(means) - np.mean(means[self.choices], axis=0))
+
+
+class StreamingResult(object):
+    """
+    Result accumulators, written by chunks of chunkSize steps.
+    - The choices and rewards are appended to the binary file 'filename' (if given), as records of type :attr:`dtype`, and can be read back with :meth:`getTrace` as a :class:`numpy.memmap`.
+    - The pulls, cumulated reward and cumulated (pseudo) regret are updated for each chunk, and their values at the end of each chunk are kept to plot them.
+    - The times have to be stored in order, from 0.
+    """
+
+    def __init__(self, nbArms, horizon, filename=None, chunkSize=CHUNK_SIZE, means=None):
+        """ 
+        Create the chunk buffer, and the file 'filename' (overwritten) if the choices and rewards have to be kept.
+        - means: means of the arms, or a MAB problem (eg. a :class:`Environment.NonStationaryMAB.NonStationaryMAB`, for the regret against the best arm at each time), to compute the regret, optional.
+        """
+        assert chunkSize > 0, "Error: the 'chunkSize' parameter of a StreamingResult object cannot be <= 0."  # DEBUG
+        self.horizon = horizon
+        self.chunkSize = chunkSize
+
+        # Type of the records of the file: the smallest integer type for the choices
+        self.dtype = np.dtype([('choice', np.min_scalar_type(max(0, nbArms - 1))), ('reward', float)])
+
+        # Buffer of the current chunk, and number of its steps already stored and already written
+        self._chunk = np.zeros(chunkSize, dtype=self.dtype)
+        self._filled = 0
+        self._flushed = 0
+
+        # Append-only file of all the choices and rewards, if any
+        self.filename = filename
+        if filename is not None:
+            open(filename, 'wb').close()
+
+        # Regret of a block of choices made from a time, given by the MAB problem or from the means of the arms
+        if hasattr(means, 'contextRegrets'):
+            raise ValueError("Error: the regret of a contextual problem depends on the contexts, a StreamingResult cannot compute it.")
+        if means is None or hasattr(means, 'regrets'):
+            self._regrets = None if means is None else means.regrets
+        else:
+            means = np.asarray(means, dtype=float)
+            maxMean = np.max(means)
+            self._regrets = lambda choices, start: maxMean - means[choices]
+
+        # Running aggregates: number of steps stored, pulls, cumulated reward and regret
+        self.time = 0
+        self.pulls = np.zeros(nbArms, dtype=int)
+        self.cumulatedReward = 0.
+        self.cumulatedRegret = 0.
+
+        # Values of the aggregates at the end of each chunk
+        nbChunks = -(-horizon // chunkSize)
+        self.times = np.zeros(nbChunks, dtype=int)
+        self.cumulatedRewards = np.zeros(nbChunks)
+        self.cumulatedRegrets = np.zeros(nbChunks)
+        self._nbChunks = 0
+
+    def store(self, time, choice, reward):
+        """ 
+        Store results.
+        """
+        assert time == self.time + self._filled - self._flushed, "Error: StreamingResult.store() has to be called with times in order."  # DEBUG
+        self._chunk[self._filled] = (choice, reward)
+        self._filled += 1
+        if self._filled == self.chunkSize:
+            self.flush()
+
+    def flush(self):
+        """ 
+        Update the aggregates with the steps stored since the last flush, and append them to the file.
+        """
+        records = self._chunk[self._flushed:self._filled]
+        if len(records) > 0:
+            choices = records['choice']
+            if self._regrets is not None:
+                self.cumulatedRegret += np.sum(self._regrets(choices, self.time))
+            self.time += len(records)
+            self.pulls += np.bincount(choices, minlength=len(self.pulls))
+            self.cumulatedReward += np.sum(records['reward'])
+            if self.filename is not None:
+                with open(self.filename, 'ab') as f:
+                    records.tofile(f)
+            self._flushed = self._filled
+        if self._filled == self.chunkSize or (self.time == self.horizon and self._filled > 0):
+            # End of a chunk: keep the aggregates, and start a new chunk
+            self.times[self._nbChunks] = self.time
+            self.cumulatedRewards[self._nbChunks] = self.cumulatedReward
+            self.cumulatedRegrets[self._nbChunks] = self.cumulatedRegret
+            self._nbChunks += 1
+            self._filled = self._flushed = 0
+
+    def getTrace(self):
+        """ 
+        All the stored choices and rewards, read from the file as a read-only :class:`numpy.memmap` of records: use trace['choice'] and trace['reward'].
+        """
+        assert self.filename is not None, "Error: this StreamingResult does not keep the choices and rewards, give it a filename."  # DEBUG
+        self.flush()
+        if self.time == 0:
+            return np.zeros(0, dtype=self.dtype)
+        return np.memmap(self.filename, dtype=self.dtype, mode='r', shape=(self.time,))
+
+    def getAverageRewards(self):
+        """ 
+        Average reward until the end of each chunk, and these times.
+        """
+        self.flush()
+        times = self.times[:self._nbChunks]
+        return times, self.cumulatedRewards[:self._nbChunks] / times
+
+    def getCumulatedRegret(self):
+        """ 
+        Cumulated (pseudo) regret at the end of each chunk, and these times.
+        """
+        assert self._regrets is not None, "Error: this StreamingResult cannot compute the regret, give it the means of the arms."  # DEBUG
+        self.flush()
+        return self.times[:self._nbChunks], self.cumulatedRegrets[:self._nbChunks]
@@ -0,0 +1,96 @@
+# -*- coding: utf-8 -*-
+""" 
+:class:`BatchedSimulation` class to play R independent repetitions of one policy on one MAB problem, all together.
+- The policy state is allocated with shape (R, nbArms), so the indexes of all the repetitions are computed at once, and the rewards are drawn in vectorized form with :meth:`MAB.draw_multiple`: one step costs about the same Python overhead for R repetitions as for one.
+"""
+
+import copy
+import numpy as np
+
+try:
+    from .Results import BatchedResult
+except ImportError:
+    from Results import BatchedResult
+
+from Policies.IndexPolicy import IndexPolicy, argmaxRows
+from Policies.BayesianIndexPolicy import BayesianIndexPolicy
+from Policies.Posterior import BetaArray
+from Policies.EpsilonGreedy import EpsilonGreedy
+from Policies.ExploreThenCommit import ETC_RandomStop
+
+
+#: Default number of repetitions
+REPETITIONS = 1000
+
+
+class BatchedSimulation(object):
+    """ Play R independent repetitions of one policy on one MAB problem, all together.
+    - Supported policies are the index policies with a vectorized computeAllIndex() (UCB, UCBalpha, UCBplus, UCBV, KLUCB, EmpiricalMeans, and Thompson with its default :class:`BetaArray` posterior), and the EpsilonGreedy policies whose epsilon only depends on t (EpsilonGreedy, ETC_KnownGap).
+    """
+
+    def __init__(self, env, policy, repetitions=REPETITIONS):
+        """ New batched simulation, of the policy 'policy' on the MAB problem 'env'."""
+        assert repetitions > 0, "Error: the 'repetitions' parameter of a BatchedSimulation object cannot be <= 0."  # DEBUG
+        if isinstance(policy, ETC_RandomStop) \
+                or (isinstance(policy, BayesianIndexPolicy) and not isinstance(policy.posterior, BetaArray)) \
+                or (isinstance(policy, IndexPolicy) and type(policy).computeAllIndex is IndexPolicy.computeAllIndex) \
+                or not isinstance(policy, (IndexPolicy, EpsilonGreedy)):
+            raise ValueError("Error: the policy {} is not supported by BatchedSimulation.".format(policy))
+        # MAB problem
+        self.env = env
+
+        # Policy, used as a model: it is copied and its internal memory is allocated with shape (repetitions, nbArms)
+        self.policy = policy
+
+        # Number of repetitions
+        self.repetitions = repetitions
+
+    def __repr__(self):
+        return "{}(policy: {}, repetitions: {}, env: {})".format(self.__class__.__name__, self.policy, self.repetitions, self.env)
+
+    def _choice(self, policy):
+        """ Choose one arm for each repetition."""
+        if isinstance(policy, IndexPolicy):
+            policy.computeAllIndex()
+            return argmaxRows(policy.index, policy.rng)
+        # EpsilonGreedy: explore with probability epsilon, otherwise exploit on accumulated rewards
+        choices = argmaxRows(policy.rewards, policy.rng)
+        explore = policy.rng.random(self.repetitions) < policy.epsilon
+        choices[explore] = policy.rng.integers(0, policy.nbArms, size=np.count_nonzero(explore))
+        return choices
+
+    def run(self, horizon, instrumentation=None):
+        """ Play the R repetitions until the horizon, and return their :class:`BatchedResult`.
+        - instrumentation: an :class:`Environment.Instrumentation.Instrumentation` to time the phases of the steps, optional.
+        """
+        policy = copy.copy(self.policy)
+        if isinstance(policy, IndexPolicy):
+            policy._tree = None  # No lazy mode in batch
+        policy._allocate((self.repetitions, policy.nbArms))
+        policy.t = 0
+        result = BatchedResult(self.env.nbArms, horizon, self.repetitions)
+        if instrumentation is None:
+            self._play(policy, result, horizon)
+            return result
+        instrumentation.instrument(self, policy, self.env, result)
+        try:
+            self._play(policy, result, horizon)
+        finally:
+            instrumentation.restore(self, policy, self.env, result)
+        return result
+
+    def _play(self, policy, result, horizon):
+        """ Play the R repetitions until the horizon, with the policy already allocated, and store them in result."""
+        rows = np.arange(self.repetitions)
+        for t in range(horizon):
+            # 1. The policy chooses an arm, in each repetition
+            choices = self._choice(policy)
+
+            # 2. Random rewards are drawn, from these arms at this time
+            rewards = self.env.draw_multiple(choices, t)
+
+            # 3. The policy sees the rewards
+            policy.getReward((rows, choices), rewards)
+
+            # 4. Finally we store the results
+            result.store(t, choices, rewards)
@@ -1,3 +1,9 @@
 
 from .plotSettings import DPI, signature, maximizeWindow, show_and_save
-from .MAB import MAB
\ No newline at end of file
+from .MAB import MAB
+from .NonStationaryMAB import NonStationaryMAB
+from .ContextualMAB import ContextualMAB
+from .Simulation import BatchedSimulation
+from .Evaluator import Evaluator
+from .Instrumentation import Instrumentation
+from .Kernel import playGame
@@ -0,0 +1,113 @@
+# -*- coding: utf-8 -*-
+"""
+:class:`BanditPool` class to play many small independent bandits (eg. one by context key) with one index policy, all stored in 2-D arrays.
+- The statistics of the N bandits with K arms each are stored in arrays of shape (N, K), as for :class:`Environment.Simulation.BatchedSimulation`, and each bandit has its own time t.
+- The keys are the integers in [0, N), the rows of these arrays: a batch of keys is served with one vectorized call of :meth:`choice` or :meth:`getReward`, and only the rows of these keys are read or written.
+- Supported policies are the index policies with a vectorized computeAllIndex() (UCB, UCBalpha, UCBplus, UCBV, EmpiricalMeans, and Thompson with its default :class:`BetaArray` posterior), but not their sliding-window and discounted variants.
+- Example::
+    pool = BanditPool(1000000, UCB(10))
+    keys = np.array([3, 14, 15, 92])
+    arms = pool.choice(keys)
+    pool.getReward(keys, arms, rewards)
+"""
+
+import copy
+import numpy as np
+
+try:
+    from .IndexPolicy import IndexPolicy, argmaxRows
+    from .BayesianIndexPolicy import BayesianIndexPolicy
+    from .Posterior import BetaArray
+    from .snapshot import saveSnapshot, loadSnapshot
+    from .SlidingWindow import SWUCB, SWThompson
+    from .Discounted import DiscountedUCB, DiscountedThompson
+except ImportError:
+    from IndexPolicy import IndexPolicy, argmaxRows
+    from BayesianIndexPolicy import BayesianIndexPolicy
+    from Posterior import BetaArray
+    from snapshot import saveSnapshot, loadSnapshot
+    from SlidingWindow import SWUCB, SWThompson
+    from Discounted import DiscountedUCB, DiscountedThompson
+
+
+class BanditPool(object):
+    """ Many independent bandits, all playing the same index policy, stored in 2-D arrays of shape (nbBandits, nbArms)."""
+
+    def __init__(self, nbBandits, policy):
+        """ New pool of nbBandits bandits, playing the policy 'policy' (used as a model, for its parameters)."""
+        assert nbBandits > 0, "Error: the 'nbBandits' parameter of a BanditPool object cannot be <= 0."  # DEBUG
+        if (isinstance(policy, BayesianIndexPolicy) and not isinstance(policy.posterior, BetaArray)) \
+                or not isinstance(policy, IndexPolicy) \
+                or isinstance(policy, (SWUCB, SWThompson, DiscountedUCB, DiscountedThompson)) \
+                or type(policy).computeAllIndex is IndexPolicy.computeAllIndex:
+            raise ValueError("Error: the policy {} is not supported by BanditPool.".format(policy))
+        # Number of bandits, and of arms of each bandit
+        self.nbBandits = nbBandits
+        self.nbArms = policy.nbArms
+
+        # Policy holding the statistics of all the bandits, of shape (nbBandits, nbArms), but no index
+        self.policy = copy.copy(policy)
+        self.policy._tree = None  # No lazy mode in a pool
+        self.policy.index = None
+        self.policy._bindStats(np.zeros((nbBandits, self.nbArms), dtype=policy.stats.dtype))
+        if isinstance(policy, BayesianIndexPolicy):
+            self.policy.posterior = BetaArray((nbBandits, self.nbArms), a=policy.posterior._a, b=policy.posterior._b, rng=policy.rng)
+
+        # Internal time of each bandit
+        self.t = np.zeros(nbBandits, dtype=int)
+
+    def __repr__(self):
+        return "{}(policy: {}, nbBandits: {}, nbArms: {})".format(self.__class__.__name__, self.policy, self.nbBandits, self.nbArms)
+
+    def startGame(self, keys=None):
+        """ Start a new game for the bandits of these keys (all by default)."""
+        keys = slice(None) if keys is None else np.asarray(keys)
+        self.t[keys] = 0
+        self.policy.stats[keys] = 0
+        if isinstance(self.policy, BayesianIndexPolicy):
+            self.policy.posterior.N[0, keys] = self.policy.posterior._a
+            self.policy.posterior.N[1, keys] = self.policy.posterior._b
+
+    def _gather(self, keys):
+        """ Copy of the policy, with the statistics of the bandits of these keys only, of shape (len(keys), nbArms)."""
+        policy = copy.copy(self.policy)
+        policy._bindStats(self.policy.stats[keys])
+        policy.t = self.t[keys, np.newaxis]  # One time by row, broadcast on the arms
+        policy.index = np.zeros((len(keys), self.nbArms))
+        if isinstance(policy, BayesianIndexPolicy):
+            policy.posterior = copy.copy(self.policy.posterior)
+            policy.posterior.N = self.policy.posterior.N[:, keys]
+        return policy
+
+    def choice(self, keys):
+        """ Choose one arm for the bandit of each key, with maximal index (uniformly at random among ties)."""
+        policy = self._gather(np.asarray(keys))
+        policy.computeAllIndex()
+        return argmaxRows(policy.index, policy.rng)
+
+    def getReward(self, keys, arms, rewards):
+        """ Give to the bandit of each key the reward of its pulled arm: keys can be repeated, to give several rewards to one bandit."""
+        keys = np.asarray(keys)
+        np.add.at(self.t, keys, 1)
+        self.policy._addRewards((keys, np.asarray(arms)), rewards)
+
+    def save_state(self, filename):
+        """ Write the statistics and times of all the bandits in the snapshot file 'filename', see :mod:`Policies.snapshot`."""
+        arrays = {"stats": self.policy.stats, "t": self.t}
+        if isinstance(self.policy, BayesianIndexPolicy):
+            arrays["posterior"] = self.policy.posterior.N
+        saveSnapshot(filename, arrays, {"policy": self.policy.__class__.__name__, "nbArms": self.nbArms, "nbBandits": self.nbBandits})
+
+    def load_state(self, filename, mmap=True):
+        """ Restore the statistics and times of all the bandits from the snapshot file 'filename', written by save_state() by a pool of the same policy and size.
+        - With mmap=True, the arrays are not read but memory-mapped, copy-on-write: the file is never modified.
+        """
+        arrays, metadata = loadSnapshot(filename, mmap=mmap)
+        if metadata["policy"] != self.policy.__class__.__name__ or metadata["nbArms"] != self.nbArms or metadata.get("nbBandits") != self.nbBandits \
+                or arrays["stats"].dtype != self.policy.stats.dtype:
+            raise ValueError("Error: the snapshot '{}' of a pool of {} {} bandits with {} arms cannot be loaded by {}.".format(filename, metadata.get("nbBandits"), metadata["policy"], metadata["nbArms"], self))
+        self.policy._bindStats(arrays["stats"])
+        self.t = arrays["t"]
+        if isinstance(self.policy, BayesianIndexPolicy):
+            self.policy.posterior.N = arrays["posterior"]
+        return self
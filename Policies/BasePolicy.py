@@ -4,12 +4,35 @@
 
 import numpy as np
 
+try:
+    from .snapshot import saveSnapshot, loadSnapshot
+    from .with_proba import UniformBuffer
+except ImportError:
+    from snapshot import saveSnapshot, loadSnapshot
+    from with_proba import UniformBuffer
+
+try:
+    from ..Arms.Arm import defaultRNG
+except ImportError:
+    from Arms.Arm import defaultRNG
+
+
+def addAt(array, indexes, weights=None):
+    """ Add the weights (or 1) to array[indexes], with repeated indexes counted as many times: with :func:`numpy.bincount` for a 1-D array, :func:`numpy.add.at` otherwise."""
+    if array.ndim == 1 and not isinstance(indexes, tuple):
+        array += np.bincount(indexes, weights=weights, minlength=len(array)).astype(array.dtype, copy=False)
+    else:
+        np.add.at(array, indexes, 1 if weights is None else weights)
+
 
 class BasePolicy(object):
     """ Base class for any policy."""
 
-    def __init__(self, nbArms, lower=0., amplitude=1.):
-        """ New policy."""
+    #: Fields of the per-arm statistics, packed in one structured numpy array, each field is also an attribute of the same name
+    _statsFields = [('pulls', int), ('rewards', float)]
+
+    def __init__(self, nbArms, lower=0., amplitude=1., rng=None):
+        """ New policy, using the numpy Generator rng for all its random choices (the shared default one by default, see :func:`Arms.Arm.defaultRNG`)."""
         # Parameters
         assert nbArms > 0, "Error: the 'nbArms' parameter of a {} object cannot be <= 0.".format(self)  # DEBUG
         
@@ -23,25 +46,37 @@ class BasePolicy(object):
         # Larger values for rewards
         self.amplitude = amplitude  
         
+        # Random generator, and uniform values drawn from it by blocks
+        self.rng = defaultRNG(rng)
+        self._uniforms = UniformBuffer(self.rng)
+
         # Internal memory
         ## Internal time
         self.t = 0  
         
-        ## Number of pulls of each arms
-        self.pulls = np.zeros(nbArms, dtype=int)  
-        
-        ## Cumulated rewards of each arms
-        self.rewards = np.zeros(nbArms)  
+        self._allocate((nbArms,))
+
+    def _allocate(self, shape):
+        """ Allocate the internal memory of the policy, of shape (nbArms,).
+        - Shape (R, nbArms) is used by :class:`Environment.Simulation.BatchedSimulation` to play R independent games at once: arms are then given as (rows, arms) to getReward().
+        """
+        ## Per-arm statistics, packed in one structured array, one field by statistic
+        self._bindStats(np.zeros(shape, dtype=self._statsFields))
+
+    def _bindStats(self, stats):
+        """ Use the structured array 'stats' as the per-arm statistics: each of its fields becomes an attribute (self.pulls, self.rewards, etc)."""
+        self.stats = stats
+        for name in stats.dtype.names:
+            setattr(self, name, stats[name])
 
     def __str__(self):
         """ -> str"""
         return self.__class__.__name__
     
     def startGame(self):
-        """ Start the game (fill pulls and rewards with 0)."""
+        """ Start the game (fill pulls, rewards and all the other per-arm statistics with 0)."""
         self.t = 0
-        self.pulls.fill(0)
-        self.rewards.fill(0)
+        self.stats.fill(0)
 
     def getReward(self, arm, reward):
         """ Give a reward: increase t, pulls, and update cumulated sum of rewards for that arm (normalized in [0, 1])."""
@@ -50,8 +85,52 @@ class BasePolicy(object):
         reward = (reward - self.lower) / self.amplitude
         self.rewards[arm] += reward
 
+    def getReward_batch(self, arms, rewards):
+        """ Give a batch of rewards at once, as getReward() for each pair (arm, reward) but vectorized: arms can be repeated."""
+        arms = np.asarray(arms)
+        self.t += len(arms)
+        self._addRewards(arms, rewards)
+
+    def getRewardMultiple(self, arms, rewards):
+        """ Give the rewards of the distinct arms played at one step of multiple plays (eg. chosen by choiceMultiple()): t increases by one, and each arm gets its reward."""
+        self.t += 1
+        self._addRewards(np.asarray(arms), rewards)
+
+    def _addRewards(self, arms, rewards):
+        """ Add several rewards at once, as getReward() for each pair (arm, reward), but without changing t: arms can be repeated, see :func:`addAt`."""
+        addAt(self.pulls, arms)
+        addAt(self.rewards, arms, (np.asarray(rewards, dtype=float) - self.lower) / self.amplitude)
 
     def choice(self):
         """ Not defined."""
         raise NotImplementedError("This method choice() has to be implemented in the child class inheriting from BasePolicy.")
 
+    def choice_batch(self, n):
+        """ Choose n arms at once, with the same internal memory (eg. before a batch of delayed rewards): by default, n calls to choice()."""
+        return np.array([self.choice() for _ in range(n)], dtype=int)
+
+    # --- Snapshots
+
+    def _stateArrays(self):
+        """ Arrays of the internal memory of the policy, written by save_state()."""
+        return {"stats": self.stats}
+
+    def _setStateArrays(self, arrays):
+        """ Use the arrays read by load_state() as the internal memory of the policy."""
+        self._bindStats(arrays["stats"])
+
+    def save_state(self, filename):
+        """ Write the internal memory of the policy in the snapshot file 'filename', see :mod:`Policies.snapshot`."""
+        saveSnapshot(filename, self._stateArrays(), {"policy": self.__class__.__name__, "nbArms": self.nbArms, "t": int(self.t)})
+
+    def load_state(self, filename, mmap=True):
+        """ Restore the internal memory of the policy from the snapshot file 'filename', written by save_state() by a policy of the same class.
+        - With mmap=True, the arrays are not read but memory-mapped, copy-on-write: the file is never modified.
+        """
+        arrays, metadata = loadSnapshot(filename, mmap=mmap)
+        if metadata["policy"] != self.__class__.__name__ or metadata["nbArms"] != self.nbArms \
+                or arrays["stats"].dtype != np.dtype(self._statsFields) or arrays["stats"].shape != (self.nbArms,):
+            raise ValueError("Error: the snapshot '{}' of a {} policy with {} arms cannot be loaded by the policy {} with {} arms.".format(filename, metadata["policy"], metadata["nbArms"], self, self.nbArms))
+        self.t = metadata["t"]
+        self._setStateArrays(arrays)
+        return self
@@ -1,27 +1,40 @@
 # -*- coding: utf-8 -*-
 
+import numpy as np
+
 try:
+    from .BasePolicy import BasePolicy
     from .IndexPolicy import IndexPolicy
-    from .Posterior import Beta
+    from .Posterior import Beta, BetaArray
 except ImportError:
+    from BasePolicy import BasePolicy
     from IndexPolicy import IndexPolicy
-    from Posterior import Beta
+    from Posterior import Beta, BetaArray
 
 
 class BayesianIndexPolicy(IndexPolicy):
     """ 
     Basic Bayesian index policy.
 
-    - By default, it uses a Beta posterior (:class:`Policies.Posterior.Beta`), one by arm.
+    - By default, it uses a Beta posterior (:class:`Policies.Posterior.Beta`) for each arm, all stored in one :class:`Policies.Posterior.BetaArray`.
     """
 
+    #: Fields of the per-arm statistics: no 1 / pulls, the indexes only use the posteriors
+    _statsFields = BasePolicy._statsFields
+
     def __init__(self, nbArms,
             posterior=Beta,
             lower=0., amplitude=1.,
-            *args, **kwargs
+            *args, rng=None, **kwargs
         ):
-        """ Create a new Bayesian policy, by creating a default posterior on each arm."""
-        super(BayesianIndexPolicy, self).__init__(nbArms, lower=lower, amplitude=amplitude)
+        """ Create a new Bayesian policy, by creating a default posterior on each arm, all sampling with the random generator of the policy."""
+        super(BayesianIndexPolicy, self).__init__(nbArms, lower=lower, amplitude=amplitude, rng=rng)
+        if posterior is Beta and 'params_for_each_posterior' not in kwargs:
+            # Posteriors of all the arms stored in numpy arrays, self.posterior[arm] still gives a Beta-like posterior
+            self.posterior = BetaArray((nbArms,), *args, rng=self.rng, **kwargs)  #: Posterior for each arm
+            self._posterior_name = "Beta"
+            return
+
         self.posterior = [None] * nbArms  #: Posterior for each arm. List instead of dict, quicker access
         
         if 'params_for_each_posterior' in kwargs:
@@ -29,13 +42,19 @@ class BayesianIndexPolicy(IndexPolicy):
             print("'params_for_each_posterior' is in kwargs, so using params =\n{}\nas a list of parameters to give to each posterior.".format(params))  # DEBUG
             for arm in range(self.nbArms):
                 print("Creating posterior for arm {}, with params = {}.".format(arm, params[arm]))  # DEBUG
-                self.posterior[arm] = posterior(**params[arm])
+                self.posterior[arm] = posterior(rng=self.rng, **params[arm])
         else:
             for arm in range(self.nbArms):
                 # print("Creating posterior for arm {}, with args = {} and kwargs = {}.".format(arm, args, kwargs))  # DEBUG
-                self.posterior[arm] = posterior(*args, **kwargs)
+                self.posterior[arm] = posterior(*args, rng=self.rng, **kwargs)
         self._posterior_name = str(self.posterior[0].__class__.__name__)
 
+    def _allocate(self, shape):
+        """ Allocate the internal memory of the policy, and the posteriors if they are stored in a :class:`BetaArray`."""
+        super(BayesianIndexPolicy, self)._allocate(shape)
+        if isinstance(getattr(self, 'posterior', None), BetaArray):
+            self.posterior = BetaArray(shape, a=self.posterior._a, b=self.posterior._b, rng=self.posterior.rng)
+
 
     def __str__(self):
         """ -> str"""
@@ -50,6 +69,9 @@ class BayesianIndexPolicy(IndexPolicy):
         Reset the posterior on each arm.
         """
         self.t = 0
+        if isinstance(self.posterior, BetaArray):
+            self.posterior.reset()
+            return
         for arm in range(self.nbArms):
             self.posterior[arm].reset()
         # print("Policy {} reinitialized with posteriors: {}".format(self, [str(p) for p in self.posterior])) # DEBUG
@@ -59,7 +81,38 @@ class BayesianIndexPolicy(IndexPolicy):
         """ 
         Update the posterior on each arm, with the normalized reward.
         """
-        self.posterior[arm].update((reward - self.lower) / self.amplitude)
+        if isinstance(self.posterior, BetaArray):
+            self.posterior.update(arm, (reward - self.lower) / self.amplitude)
+        else:
+            self.posterior[arm].update((reward - self.lower) / self.amplitude)
         self.t += 1
 
+    def _addRewards(self, arms, rewards):
+        """ Update the posteriors with several normalized rewards at once, without changing t: arms can be repeated."""
+        rewards = (np.asarray(rewards) - self.lower) / self.amplitude
+        if isinstance(self.posterior, BetaArray):
+            self.posterior.update(arms, rewards)
+        else:
+            arms, rewards = np.ravel(arms), np.ravel(rewards)
+            for arm in np.unique(arms):
+                self.posterior[arm].update_batch(rewards[arms == arm])
+
+    def _stateArrays(self):
+        """ Arrays of the internal memory of the policy, with the parameters of the Beta posteriors, of shape (2, nbArms)."""
+        arrays = super(BayesianIndexPolicy, self)._stateArrays()
+        if isinstance(self.posterior, BetaArray):
+            arrays["posterior"] = self.posterior.N
+        elif self._posterior_name == "Beta":
+            arrays["posterior"] = np.array([posterior.N for posterior in self.posterior], dtype=float).T
+        else:
+            raise NotImplementedError("Error: only Beta posteriors can be saved, not {}.".format(self._posterior_name))
+        return arrays
 
+    def _setStateArrays(self, arrays):
+        """ Use the arrays read by load_state(), with the parameters of the Beta posteriors."""
+        super(BayesianIndexPolicy, self)._setStateArrays(arrays)
+        if isinstance(self.posterior, BetaArray):
+            self.posterior.N = arrays["posterior"]
+        else:
+            for arm, N in enumerate(arrays["posterior"].T.tolist()):
+                self.posterior[arm].N = N
@@ -0,0 +1,149 @@
+# -*- coding: utf-8 -*-
+"""
+:class:`ConcurrentPolicy` class to share one policy between several threads, without losing updates.
+- getReward() only appends to a buffer owned by the calling thread. Every ``mergeEvery`` rewards, the thread merges its buffer into the wrapped policy with one call to ``getReward_batch``, under a lock.
+- After each merge, a frozen copy of the statistics is published. choice() reads the last published copy, with its own indexes in each thread: it never waits for a writer, and sees the rewards merged so far.
+- :meth:`flush` merges the buffers of all the threads, eg. before reading the statistics of the wrapped policy.
+"""
+
+import copy
+import threading
+import numpy as np
+
+try:
+    from .IndexPolicy import IndexPolicy
+    from .BayesianIndexPolicy import BayesianIndexPolicy
+    from .Posterior import BetaArray
+    from .with_proba import UniformBuffer
+except ImportError:
+    from IndexPolicy import IndexPolicy
+    from BayesianIndexPolicy import BayesianIndexPolicy
+    from Posterior import BetaArray
+    from with_proba import UniformBuffer
+
+
+#: Default number of rewards buffered by a thread before they are merged
+MERGE_EVERY = 256
+
+
+class ConcurrentPolicy(object):
+    """ Share one policy between several threads: rewards are buffered by thread and merged in batches, choices read a published copy."""
+
+    def __init__(self, policy, mergeEvery=MERGE_EVERY):
+        """ New concurrent wrapper of the policy 'policy', which must not be used directly anymore."""
+        assert mergeEvery > 0, "Error: the 'mergeEvery' parameter of a ConcurrentPolicy object cannot be <= 0."  # DEBUG
+        self.policy = policy
+        self.nbArms = policy.nbArms
+        self.mergeEvery = mergeEvery
+
+        # Lock of the wrapped policy, only taken by the merges
+        self._lock = threading.Lock()
+
+        # Buffers of (arm, reward) of all the threads, and the one of the current thread
+        self._buffers = []
+        self._local = threading.local()
+
+        # Frozen copy of the policy, and its version, increased at each merge
+        self._snapshot = None
+        self._version = 0
+        self._publish()
+
+    def __str__(self):
+        return "Concurrent({})".format(self.policy)
+
+    # --- Published copy
+
+    def _publish(self):
+        """ Publish a frozen copy of the statistics of the wrapped policy: called with the lock, or before any thread starts."""
+        policy = self.policy
+        snapshot = copy.copy(policy)
+        snapshot._bindStats(policy.stats.copy())
+        if isinstance(policy, BayesianIndexPolicy):
+            if isinstance(policy.posterior, BetaArray):
+                snapshot.posterior = copy.copy(policy.posterior)
+                snapshot.posterior.N = policy.posterior.N.copy()
+            else:
+                snapshot.posterior = copy.deepcopy(policy.posterior)
+        if isinstance(policy, IndexPolicy):
+            snapshot._tree = None  # The copies compute all their indexes
+        self._snapshot = snapshot
+        self._version += 1
+
+    def _reader(self):
+        """ Copy of the last published policy owned by the current thread, with its own indexes."""
+        local = self._local
+        if getattr(local, 'version', None) != self._version:
+            snapshot = self._snapshot
+            reader = copy.copy(snapshot)
+            # Each thread draws its random ties from its own stream, spawned from the one of the policy
+            if getattr(local, 'rng', None) is None:
+                with self._lock:
+                    local.rng = np.random.default_rng(self.policy.rng.integers(2**63))
+            reader.rng, reader._uniforms = local.rng, UniformBuffer(local.rng)
+            if isinstance(reader, IndexPolicy):
+                reader.index = np.zeros(self.nbArms)
+            local.reader, local.version = reader, self._version
+        return local.reader
+
+    # --- Buffers
+
+    def _buffer(self):
+        """ Buffer of the current thread, created and registered at its first reward."""
+        try:
+            return self._local.buffer
+        except AttributeError:
+            buffer = self._local.buffer = []
+            with self._lock:
+                self._buffers.append(buffer)
+            return buffer
+
+    def _merge(self, buffer):
+        """ Merge the content of the buffer into the wrapped policy, and publish it: called with the lock."""
+        n = len(buffer)
+        if n == 0:
+            return
+        # Only the first n elements are taken: the owner thread can append more meanwhile
+        arms, rewards = zip(*buffer[:n])
+        del buffer[:n]
+        self.policy.getReward_batch(np.array(arms), np.array(rewards, dtype=float))
+        self._publish()
+
+    def flush(self):
+        """ Merge the buffers of all the threads into the wrapped policy."""
+        with self._lock:
+            for buffer in self._buffers:
+                self._merge(buffer)
+
+    # --- Policy API
+
+    def startGame(self):
+        """ Start the game: reset the wrapped policy and empty all the buffers. No thread must be playing."""
+        with self._lock:
+            for buffer in self._buffers:
+                del buffer[:]
+            self.policy.startGame()
+            self._publish()
+
+    def getReward(self, arm, reward):
+        """ Give a reward: it is buffered by the current thread, and merged with the next mergeEvery - 1 ones."""
+        buffer = self._buffer()
+        buffer.append((arm, reward))
+        if len(buffer) >= self.mergeEvery:
+            with self._lock:
+                self._merge(buffer)
+
+    def getReward_batch(self, arms, rewards):
+        """ Give a batch of rewards, buffered by the current thread as for getReward()."""
+        buffer = self._buffer()
+        buffer.extend(zip(np.asarray(arms).tolist(), np.asarray(rewards, dtype=float).tolist()))
+        if len(buffer) >= self.mergeEvery:
+            with self._lock:
+                self._merge(buffer)
+
+    def choice(self):
+        """ Choose an arm with the last published copy of the policy, without waiting for the writers."""
+        return self._reader().choice()
+
+    def choice_batch(self, n):
+        """ Choose n arms at once with the last published copy of the policy."""
+        return self._reader().choice_batch(n)
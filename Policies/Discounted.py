@@ -0,0 +1,243 @@
+# -*- coding: utf-8 -*-
+r"""
+Discounted variants of UCB, UCB-V and Thompson, for non-stationary arms (eg. with :meth:`Arms.Bernoulli.set_mean_param`): a reward observed s steps ago has a weight :math:`\gamma^s`.
+- The decay is applied lazily: the statistics are stored multiplied by :math:`\gamma^{-(t - t_0)}`, so an update adds one weight to the pulled arm in O(1), whatever the time since its last pull, and the other arms are not touched.
+- The indexes divide them back by this weight. When it becomes too large, all the statistics are rescaled once and :math:`t_0 = t`: the memory is O(nbArms) whatever the horizon.
+- Reference: [Garivier & Moulines - ALT, 2011], [Raj & Kalyani, 2017] for Thompson sampling.
+"""
+
+from math import log, sqrt
+import numpy as np
+
+try:
+    from .BasePolicy import addAt
+    from .UCB import UCB
+    from .UCBV import UCBV
+    from .Thompson import Thompson
+    from .Posterior import BetaArray
+    from .Posterior.Beta import bernoulliBinarization, bernoulliBinarization_nparray
+except ImportError:
+    from BasePolicy import addAt
+    from UCB import UCB
+    from UCBV import UCBV
+    from Thompson import Thompson
+    from Posterior import BetaArray
+    from Posterior.Beta import bernoulliBinarization, bernoulliBinarization_nparray
+
+
+#: Default discount factor
+GAMMA = 0.99
+
+#: Largest weight :math:`\gamma^{-(t - t_0)}`, before the statistics are rescaled
+MAX_WEIGHT = 1e100
+
+
+class DiscountedUCB(UCB):
+    r""" The discounted UCB policy: UCB on the discounted pulls :math:`N_k(t) = \sum_{s \leq t} \gamma^{t-s} 1(A(s) = k)` and rewards, with :math:`\log(\sum_k N_k(t))`."""
+
+    #: Fields of the per-arm statistics, with the discounted pulls and rewards, multiplied by the current weight
+    _statsFields = UCB._statsFields + [('discountedPulls', float), ('discountedRewards', float)]
+
+    def __init__(self, nbArms, gamma=GAMMA, lower=0., amplitude=1., rng=None):
+        assert 0 < gamma <= 1, "Error: the 'gamma' parameter of a {} object has to be in (0, 1].".format(self.__class__.__name__)  # DEBUG
+        #: Discount factor
+        self.gamma = gamma
+        # All the arms change at every step: no lazy mode
+        super(DiscountedUCB, self).__init__(nbArms, lower=lower, amplitude=amplitude, lazy=False, rng=rng)
+
+    def __str__(self):
+        return r"D-UCB($\gamma={:.3g}$)".format(self.gamma)
+
+    def _allocate(self, shape):
+        """ Allocate the internal memory of the policy, and restart the decay."""
+        super(DiscountedUCB, self)._allocate(shape)
+        self._t0 = 0
+
+    def startGame(self):
+        super(DiscountedUCB, self).startGame()
+        self._t0 = 0
+
+    def _discountedFields(self):
+        """ Names of the discounted statistics, rescaled together."""
+        return [name for name in self.stats.dtype.names if name.startswith('discounted')]
+
+    def _weight(self):
+        r""" Current weight :math:`\gamma^{-(t - t_0)}` of a new reward, after rescaling the discounted statistics if it is too large."""
+        weight = self.gamma ** (self._t0 - self.t)
+        if weight > MAX_WEIGHT:
+            for name in self._discountedFields():
+                getattr(self, name)[...] /= weight
+            self._t0, weight = self.t, 1.
+        return weight
+
+    def getReward(self, arm, reward):
+        """ Give a reward: as for UCB, and add it with the current weight to the discounted statistics of that arm."""
+        super(DiscountedUCB, self).getReward(arm, reward)
+        weight = self._weight()
+        self.discountedPulls[arm] += weight
+        self.discountedRewards[arm] += weight * (reward - self.lower) / self.amplitude
+
+    def _addRewards(self, arms, rewards):
+        """ Add several rewards at once, all with the current weight: arms can be repeated."""
+        super(DiscountedUCB, self)._addRewards(arms, rewards)
+        weight = self._weight()
+        addAt(self.discountedPulls, arms, np.full(np.shape(rewards), weight))
+        addAt(self.discountedRewards, arms, weight * (np.asarray(rewards, dtype=float) - self.lower) / self.amplitude)
+
+    def _discountedMeans(self):
+        """ Discounted means, inverses of the discounted pulls and log of their total (by row), with an infinite index for the arms with no weight."""
+        weight = self._weight()
+        with np.errstate(divide='ignore', invalid='ignore'):
+            means = self.discountedRewards / self.discountedPulls
+            invPulls = weight / self.discountedPulls
+        logTotal = np.log(np.maximum(1., self.discountedPulls.sum(axis=-1, keepdims=True) / weight))
+        return means, invPulls, logTotal
+
+    def _discountedArm(self, arm):
+        """ Discounted mean of the arm, inverse of its discounted pulls and log of their total, as :meth:`_discountedMeans` for one arm of one game, or None if it has no weight."""
+        weight = self._weight()
+        pulls = float(self.discountedPulls[arm])
+        if not pulls > 0:
+            return None
+        return float(self.discountedRewards[arm]) / pulls, weight / pulls, log(max(1., float(self.discountedPulls.sum()) / weight))
+
+    def computeIndex(self, arm):
+        r""" Compute the current index of the arm, on its discounted statistics: :math:`\frac{X_k(t)}{N_k(t)} + \sqrt{\frac{2 \log(\sum_j N_j(t))}{N_k(t)}}`."""
+        discounted = self._discountedArm(arm)
+        if discounted is None:
+            return float('+inf')
+        mean, invPulls, logTotal = discounted
+        return mean + sqrt(2 * logTotal * invPulls)
+
+    def computeAllIndex(self):
+        """ Compute the current indexes for all arms, in a vectorized manner."""
+        means, invPulls, logTotal = self._discountedMeans()
+        index = self.index
+        with np.errstate(invalid='ignore'):
+            index[...] = means + np.sqrt(2 * logTotal * invPulls)
+        index[~(self.discountedPulls > 0)] = float('+inf')
+
+    def _stateArrays(self):
+        """ Arrays of the internal memory of the policy, with the time of the current weight."""
+        arrays = super(DiscountedUCB, self)._stateArrays()
+        arrays["t0"] = np.array([self._t0])
+        return arrays
+
+    def _setStateArrays(self, arrays):
+        """ Use the arrays read by load_state(), with the time of the current weight."""
+        super(DiscountedUCB, self)._setStateArrays(arrays)
+        self._t0 = int(arrays["t0"][0])
+
+
+class DiscountedUCBV(DiscountedUCB, UCBV):
+    """ The discounted UCB-V policy: UCB-V on the discounted pulls, rewards and squared rewards."""
+
+    #: Fields of the per-arm statistics, with the discounted squared rewards
+    _statsFields = UCBV._statsFields + [('discountedPulls', float), ('discountedRewards', float), ('discountedRewardsSquared', float)]
+
+    def __str__(self):
+        return r"D-UCB-V($\gamma={:.3g}$)".format(self.gamma)
+
+    def getReward(self, arm, reward):
+        """ Give a reward: as for discounted UCB, and its square."""
+        super(DiscountedUCBV, self).getReward(arm, reward)
+        self.discountedRewardsSquared[arm] += self._weight() * ((reward - self.lower) / self.amplitude) ** 2
+
+    def _addRewards(self, arms, rewards):
+        """ Add several rewards at once, and their squares."""
+        super(DiscountedUCBV, self)._addRewards(arms, rewards)
+        addAt(self.discountedRewardsSquared, arms, self._weight() * ((np.asarray(rewards, dtype=float) - self.lower) / self.amplitude) ** 2)
+
+    def computeIndex(self, arm):
+        """ Compute the current index of the arm, as UCB-V on its discounted statistics."""
+        discounted = self._discountedArm(arm)
+        if discounted is None:
+            return float('+inf')
+        mean, invPulls, logTotal = discounted
+        variance = max(0., float(self.discountedRewardsSquared[arm]) / float(self.discountedPulls[arm]) - mean ** 2)
+        return mean + sqrt(2 * logTotal * variance * invPulls) + 3 * self.amplitude * logTotal * invPulls
+
+    def computeAllIndex(self):
+        """ Compute the current indexes for all arms, in a vectorized manner."""
+        means, invPulls, logTotal = self._discountedMeans()
+        with np.errstate(divide='ignore', invalid='ignore'):
+            variances = np.maximum(0., self.discountedRewardsSquared / self.discountedPulls - means ** 2)
+            index = self.index
+            index[...] = means + np.sqrt(2 * logTotal * variances * invPulls) + 3 * self.amplitude * logTotal * invPulls
+        index[~(self.discountedPulls > 0)] = float('+inf')
+
+
+class DiscountedThompson(Thompson):
+    r""" The discounted Thompson sampling policy: the Beta posteriors count the discounted successes and failures of the (binarized) rewards, added to their prior parameters."""
+
+    def __init__(self, nbArms, gamma=GAMMA, lower=0., amplitude=1., rng=None, **kwargs):
+        assert 0 < gamma <= 1, "Error: the 'gamma' parameter of a {} object has to be in (0, 1].".format(self.__class__.__name__)  # DEBUG
+        #: Discount factor
+        self.gamma = gamma
+        super(DiscountedThompson, self).__init__(nbArms, lower=lower, amplitude=amplitude, rng=rng, **kwargs)
+        if not isinstance(self.posterior, BetaArray):
+            raise ValueError("Error: the policy {} only supports its default Beta posteriors.".format(self))
+
+    def __str__(self):
+        return r"D-Thompson($\gamma={:.3g}$)".format(self.gamma)
+
+    def _allocate(self, shape):
+        """ Allocate the internal memory of the policy, and the discounted failures and successes of shape (2,) + shape, multiplied by the current weight."""
+        super(DiscountedThompson, self)._allocate(shape)
+        self.discounted = np.zeros((2,) + tuple(shape))
+        self._t0 = 0
+
+    def startGame(self):
+        super(DiscountedThompson, self).startGame()
+        self.discounted.fill(0)
+        self._t0 = 0
+
+    def _weight(self):
+        r""" Current weight :math:`\gamma^{-(t - t_0)}` of a new reward, after rescaling the discounted counts if it is too large."""
+        weight = self.gamma ** (self._t0 - self.t)
+        if weight > MAX_WEIGHT:
+            self.discounted /= weight
+            self._t0, weight = self.t, 1.
+        return weight
+
+    def getReward(self, arm, reward):
+        """ Give a reward: its binarization is counted with the current weight for that arm."""
+        self.t += 1
+        if np.ndim(reward) == 0:
+            obs = bernoulliBinarization((reward - self.lower) / self.amplitude, self.rng)
+            self.discounted[(obs,) + (arm if isinstance(arm, tuple) else (arm,))] += self._weight()
+        else:
+            self._addRewards(arm, reward)
+
+    def _addRewards(self, arms, rewards):
+        """ Add several rewards at once, all with the current weight: arms can be repeated."""
+        obs = bernoulliBinarization_nparray((np.asarray(rewards, dtype=float) - self.lower) / self.amplitude, self.rng)
+        np.add.at(self.discounted, (obs,) + (arms if isinstance(arms, tuple) else (np.asarray(arms),)), self._weight())
+
+    def _updatePosterior(self):
+        """ Parameters of the posteriors: the prior ones, plus the discounted failures and successes."""
+        posterior = self.posterior
+        np.divide(self.discounted, self._weight(), out=posterior.N)
+        posterior.N[0] += posterior._a
+        posterior.N[1] += posterior._b
+
+    def computeAllIndex(self):
+        """ Compute the current indexes for all arms, by sampling the discounted posteriors."""
+        self._updatePosterior()
+        super(DiscountedThompson, self).computeAllIndex()
+
+    def choice_batch(self, n):
+        """ Choose n arms at once, each with its own sample of the discounted posteriors."""
+        self._updatePosterior()
+        return super(DiscountedThompson, self).choice_batch(n)
+
+    def _stateArrays(self):
+        """ Arrays of the internal memory of the policy, with the discounted counts and the time of the current weight."""
+        arrays = super(DiscountedThompson, self)._stateArrays()
+        arrays["discounted"], arrays["t0"] = self.discounted, np.array([self._t0])
+        return arrays
+
+    def _setStateArrays(self, arrays):
+        """ Use the arrays read by load_state(), with the discounted counts and the time of the current weight."""
+        super(DiscountedThompson, self)._setStateArrays(arrays)
+        self.discounted, self._t0 = arrays["discounted"], int(arrays["t0"][0])
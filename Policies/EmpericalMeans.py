@@ -24,6 +24,12 @@ class EmpiricalMeans(IndexPolicy):
         """ 
         Compute the current indexes for all arms, in a vectorized manner.
         """
-        indexes = self.rewards / self.pulls
-        indexes[self.pulls < 1] = float('+inf')
-        self.index[:] = indexes
\ No newline at end of file
+        np.multiply(self.rewards, self.invPulls, out=self.index)
+        self.index[self.pulls < 1] = float('+inf')
+
+    def indexCoefficients(self, arms):
+        """ 
+        Coefficients of the indexes of the pulled arms 'arms': the means, and no dependency on t.
+        """
+        pulls = self.pulls[arms]
+        return self.rewards[arms] / pulls, np.zeros(len(pulls)), np.zeros(len(pulls))
@@ -5,16 +5,14 @@ The epsilon-greedy random policies, with the naive one and some variants.
 - Ref: https://en.wikipedia.org/wiki/Multi-armed_bandit#Semi-uniform_strategies
 """
 
-from random import random
 import numpy as np
-import numpy.random as rn
 
 try:
     from .BasePolicy import BasePolicy
-    from .with_proba import with_proba
+    from .IndexPolicy import argmaxRandom, argmaxMultiple
 except ImportError:
     from BasePolicy import BasePolicy
-    from with_proba import with_proba
+    from IndexPolicy import argmaxRandom, argmaxMultiple
 
 
 #: Default value for epsilon for :class:`EpsilonGreedy`
@@ -28,8 +26,8 @@ class EpsilonGreedy(BasePolicy):
         - Ref: https://en.wikipedia.org/wiki/Multi-armed_bandit#Semi-uniform_strategies
     """
 
-    def __init__(self, nbArms, epsilon=EPSILON, lower=0., amplitude=1.):
-        super(EpsilonGreedy, self).__init__(nbArms, lower=lower, amplitude=amplitude)
+    def __init__(self, nbArms, epsilon=EPSILON, lower=0., amplitude=1., rng=None):
+        super(EpsilonGreedy, self).__init__(nbArms, lower=lower, amplitude=amplitude, rng=rng)
         assert 0 <= epsilon <= 1, "Error: the 'epsilon' parameter for EpsilonGreedy class has to be in [0, 1]."  # DEBUG
         self._epsilon = epsilon
 
@@ -44,9 +42,30 @@ class EpsilonGreedy(BasePolicy):
         """
         With a probability of epsilon, explore (uniform choice), otherwhise exploit based on just accumulated *rewards* (not empirical mean rewards).
         """
-        if with_proba(self.epsilon):  # Proba epsilon : explore
-            return rn.randint(0, self.nbArms)
+        if self._uniforms.with_proba(self.epsilon):  # Proba epsilon : explore
+            return self._uniforms.randint(self.nbArms)
         else:  # Proba 1 - epsilon : exploit
             # Uniform choice among the best arms
             # biased_means = self.rewards / (1 + self.pulls)
-            return rn.choice(np.nonzero(self.rewards == np.max(self.rewards))[0])
\ No newline at end of file
+            return argmaxRandom(self.rewards, self._uniforms)
+
+    def choiceMultiple(self, nb=1):
+        """
+        Choose nb distinct arms: with a probability of epsilon, explore (uniformly at random), otherwise exploit the nb largest empirical means, and the arms never pulled first.
+        - Not on accumulated rewards as choice(): the arms of the first slates would keep the largest sums, and stay in the slate whatever their means.
+        """
+        if self._uniforms.with_proba(self.epsilon):  # Proba epsilon : explore
+            return self.rng.choice(self.nbArms, size=nb, replace=False)
+        else:  # Proba 1 - epsilon : exploit
+            means = np.full(self.nbArms, float('+inf'))
+            np.divide(self.rewards, self.pulls, out=means, where=self.pulls > 0)
+            return argmaxMultiple(means, nb, self.rng)
+
+    def choice_batch(self, n):
+        """
+        Choose n arms at once, with the same epsilon: each one explores with a probability of epsilon, otherwise exploits, as choice().
+        """
+        choices = self.rng.choice(np.nonzero(self.rewards == np.max(self.rewards))[0], size=n)
+        explore = self.rng.random(n) < self.epsilon
+        choices[explore] = self.rng.integers(0, self.nbArms, size=np.count_nonzero(explore))
+        return choices
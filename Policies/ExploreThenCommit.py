@@ -5,11 +5,9 @@ from scipy.special import lambertw
 try:
     from .EpsilonGreedy import EpsilonGreedy
     from .BasePolicy import BasePolicy
-    from .with_proba import with_proba
 except ImportError:
     from EpsilonGreedy import EpsilonGreedy
     from BasePolicy import BasePolicy
-    from with_proba import with_proba
 
 # default value for the gap
 GAP = 0.1
@@ -23,8 +21,8 @@ class ETC_KnownGap(EpsilonGreedy):
                     https://jmlr.csail.mit.edu/papers/volume7/evendar06a/evendar06a.pdf
     """
 
-    def __init__(self, nbArms, horizon=None, gap=GAP, lower=0., amplitude=1.):
-        super(ETC_KnownGap, self).__init__(nbArms, epsilon=0.5, lower=lower, amplitude=amplitude)
+    def __init__(self, nbArms, horizon=None, gap=GAP, lower=0., amplitude=1., rng=None):
+        super(ETC_KnownGap, self).__init__(nbArms, epsilon=0.5, lower=lower, amplitude=amplitude, rng=rng)
         # Arguments
 
         #: Parameter :math:`T` = known horizon of the experiment.
@@ -68,8 +66,8 @@ class ETC_RandomStop(EpsilonGreedy):
     """
 
     def __init__(self, nbArms, horizon=None, alpha=ALPHA,
-                 lower=0., amplitude=1.):
-        super(ETC_RandomStop, self).__init__(nbArms, epsilon=0.5, lower=lower, amplitude=amplitude)
+                 lower=0., amplitude=1., rng=None):
+        super(ETC_RandomStop, self).__init__(nbArms, epsilon=0.5, lower=lower, amplitude=amplitude, rng=rng)
 
         # Arguments
 
@@ -3,27 +3,96 @@
 - If rewards are not in [0, 1], be sure to give the lower value and the amplitude. Eg, if rewards are in [-3, 3], lower = -3, amplitude = 6.
 """
 
+from math import log
 import numpy as np
 
 try:
     from .BasePolicy import BasePolicy
+    from .IndexTree import IndexTree
 except (ImportError, SystemError):
     from BasePolicy import BasePolicy
+    from IndexTree import IndexTree
+
+try:
+    from ..Arms.Arm import defaultRNG
+except ImportError:
+    from Arms.Arm import defaultRNG
+
+
+#: Size of the table of the logarithms of the first times
+LOG_TABLE_SIZE = 1 << 12
+
+#: log(t) for t < LOG_TABLE_SIZE, as Python floats, and log(1) = 0 for t = 0 (all the indexes are infinite then)
+LOG_TABLE = [0.] + [log(t) for t in range(1, LOG_TABLE_SIZE)]
+
+
+def argmaxRows(values, rng=None):
+    """ Index of a maximal value of each row of 'values', uniformly at random among ties (drawn with the numpy Generator rng, the shared default one by default)."""
+    best = values == np.max(values, axis=1, keepdims=True)
+    choices = np.argmax(best, axis=1)
+    ties = np.nonzero(np.count_nonzero(best, axis=1) > 1)[0]
+    if len(ties) > 0:
+        # Uniform choice among the best arms: largest uniform random value among them
+        uniforms = defaultRNG(rng).random((len(ties), values.shape[1]))
+        choices[ties] = np.argmax(best[ties] * uniforms, axis=1)
+    return choices
+
+
+def argmaxRandom(values, uniforms):
+    """ Index of a maximal value of the 1-D array 'values', uniformly at random among ties, with the random integers of the :class:`UniformBuffer` uniforms.
+    - Fast path: one argmax, and the ties are only searched after the first maximum, so nothing is drawn when it is unique (almost always).
+    """
+    i = int(np.argmax(values))
+    best = values[i]
+    if not (values[i + 1:] == best).any():
+        return i
+    ties = np.nonzero(values == best)[0]
+    return int(ties[uniforms.randint(len(ties))])
+
+
+def argmaxMultiple(values, nb, rng):
+    """ Indexes of nb maximal values of the 1-D array 'values', by decreasing value, uniformly at random among the ties of the nb-th largest value (drawn with the numpy Generator rng).
+    - O(len(values)) with :func:`numpy.argpartition`, and O(nb log(nb)) to sort the chosen ones, instead of nb argmax or a full sort.
+    """
+    n = len(values)
+    assert 0 < nb <= n, "Error: cannot choose {} distinct values among {}.".format(nb, n)  # DEBUG
+    chosen = np.argpartition(values, n - nb)[n - nb:]
+    kth = np.min(values[chosen])
+    ties = np.nonzero(values == kth)[0]
+    if len(ties) > np.count_nonzero(values[chosen] == kth):
+        # Some ties of the nb-th value were left out: draw the ones kept among all of them
+        above = chosen[values[chosen] > kth]
+        chosen = np.concatenate([above, rng.choice(ties, size=nb - len(above), replace=False)])
+    return chosen[np.argsort(-values[chosen], kind='stable')]
 
 
 class IndexPolicy(BasePolicy):
     """ Class that implements a generic index policy."""
 
-    def __init__(self, nbArms, lower=0., amplitude=1.):
+    #: Fields of the per-arm statistics, with 1 / pulls (0 for an unpulled arm), updated only for the pulled arms
+    _statsFields = BasePolicy._statsFields + [('invPulls', float)]
+
+    def __init__(self, nbArms, lower=0., amplitude=1., lazy=False, rng=None):
         """ New generic index policy.
         - nbArms: the number of arms,
-        - lower, amplitude: lower value and known amplitude of the rewards.
+        - lower, amplitude: lower value and known amplitude of the rewards,
+        - lazy: if True, choice() keeps the indexes in a kinetic tournament tree (:class:`IndexTree`) instead of computing all of them at every step. It requires :meth:`indexCoefficients`, defined for the indexes of the policy (a ValueError is raised otherwise),
+        - rng: numpy Generator used to break the ties (the shared default one by default, see :func:`Arms.Arm.defaultRNG`).
         """
-        super(IndexPolicy, self).__init__(nbArms, lower=lower, amplitude=amplitude)
-        
-        # Numerical index for each arms
-        self.index = np.zeros(nbArms) 
+        super(IndexPolicy, self).__init__(nbArms, lower=lower, amplitude=amplitude, rng=rng)
+
+        # Tournament tree of the indexes, only in lazy mode (then self.index is not updated)
+        if lazy and not self._hasIndexCoefficients():
+            raise ValueError("Error: the policy {} cannot use the lazy mode, its indexes are not given by its indexCoefficients() method.".format(self.__class__.__name__))
+        self.lazy = lazy
+        self._tree = IndexTree(self) if lazy else None
 
+    def _allocate(self, shape):
+        """ Allocate the internal memory of the policy, and the indexes."""
+        super(IndexPolicy, self)._allocate(shape)
+
+        # Numerical index for each arms
+        self.index = np.zeros(shape) 
 
     def startGame(self):
         """ 
@@ -31,6 +100,30 @@ class IndexPolicy(BasePolicy):
         """
         super(IndexPolicy, self).startGame()
         self.index.fill(0)
+        if self._tree is not None:
+            self._tree.reset()
+
+    def getReward(self, arm, reward):
+        """ Give a reward: as for any policy, and in lazy mode the index of that arm will be updated in the tree."""
+        super(IndexPolicy, self).getReward(arm, reward)
+        self.invPulls[arm] = 1 / self.pulls[arm]  # 1 / numpy int gives a numpy float, quicker than converting the pulls to int first
+        if self._tree is not None:
+            self._tree.touch(arm)
+
+    def _addRewards(self, arms, rewards):
+        """ Add several rewards at once, and in lazy mode the indexes of these arms will be updated in the tree."""
+        super(IndexPolicy, self)._addRewards(arms, rewards)
+        self.invPulls[arms] = 1 / self.pulls[arms]
+        if self._tree is not None:
+            for arm in np.unique(arms):
+                self._tree.touch(arm)
+
+    def logTime(self):
+        """ log(t), read in LOG_TABLE for small t, or log(max(t, 1)) for each row if t is an array (eg. in a :class:`BanditPool`)."""
+        t = self.t
+        if isinstance(t, np.ndarray):
+            return np.log(np.maximum(t, 1))
+        return LOG_TABLE[t] if t < LOG_TABLE_SIZE else log(t)
 
     def computeIndex(self, arm):
         """
@@ -45,18 +138,56 @@ class IndexPolicy(BasePolicy):
         for arm in range(self.nbArms):
             self.index[arm] = self.computeIndex(arm)
 
+    def indexCoefficients(self, arms):
+        r""" 
+        Coefficients (a, b, c) of the indexes of the pulled arms 'arms', written as :math:`I_k(t) = a_k + b_k x + c_k x^2` with :math:`x = \sqrt{\log(t)}`.
+        - Needed by the lazy mode, to know when the indexes of two arms can cross.
+        """
+        raise NotImplementedError("This method indexCoefficients(arms) has to be implemented in the child class inheriting from IndexPolicy, to use the lazy mode.")
+
+    @classmethod
+    def _hasIndexCoefficients(cls):
+        """ True if :meth:`indexCoefficients` is defined by the class defining the indexes (computeIndex() or computeAllIndex()), or by a child of it: otherwise it gives the coefficients of other indexes, eg. UCB ones for UCB+."""
+        mro = cls.__mro__
+        position = lambda name: next(i for i, klass in enumerate(mro) if name in vars(klass))
+        return mro[position('indexCoefficients')] is not IndexPolicy \
+            and position('indexCoefficients') <= min(position('computeIndex'), position('computeAllIndex'))
+
     # --- Basic choice() method
 
     def choice(self):
         r""" In an index policy, choose an arm with maximal index (uniformly at random):
         .. math:: A(t) \sim U(\arg\max_{1 \leq k \leq K} I_k(t)).
-        .. warning:: In almost all cases, there is a unique arm with maximal index, so we loose a lot of time with this generic code, but I couldn't find a way to be more efficient without loosing generality.
+        In almost all cases, there is a unique arm with maximal index: :func:`argmaxRandom` only breaks the ties when there are some.
         """
+        if self._tree is not None:
+            return self._tree.choice()
         # I prefer to let this be another method, so child of IndexPolicy only needs to implement it (if they want, or just computeIndex)
         self.computeAllIndex()
         # Uniform choice among the best arms
-        try:
-            return np.random.choice(np.nonzero(self.index == np.max(self.index))[0])
-        except ValueError:
+        arm = argmaxRandom(self.index, self._uniforms)
+        if self.index[arm] != self.index[arm]:
             print("Warning: unknown error in IndexPolicy.choice(): the indexes were {} but couldn't be used to select an arm.".format(self.index))
-            return np.random.randint(self.nbArms)
\ No newline at end of file
+            return self._uniforms.randint(self.nbArms)
+        return arm
+
+    def choice_batch(self, n):
+        """ Choose n arms at once, with the same indexes: n independent uniform choices among the arms with maximal index."""
+        if self._tree is not None:
+            return np.array([self._tree.choice() for _ in range(n)], dtype=int)
+        self.computeAllIndex()
+        return self.rng.choice(np.nonzero(self.index == np.max(self.index))[0], size=n)
+
+    def choiceMultiple(self, nb=1):
+        """ Choose nb distinct arms, of maximal indexes (uniformly at random among ties), by decreasing index: the slate of one step of multiple plays, see :func:`argmaxMultiple`."""
+        self.computeAllIndex()
+        return argmaxMultiple(self.index, nb, self.rng)
+
+    def _setStateArrays(self, arrays):
+        """ Use the arrays read by load_state(), and in lazy mode rebuild the tree from them."""
+        super(IndexPolicy, self)._setStateArrays(arrays)
+        self.index = np.zeros(self.stats.shape)
+        if self._tree is not None:
+            self._tree.reset()
+            for arm in np.nonzero(self.pulls > 0)[0]:
+                self._tree.touch(arm)
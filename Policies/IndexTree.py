@@ -0,0 +1,178 @@
+# -*- coding: utf-8 -*-
+r""" Kinetic tournament tree of the indexes of an :class:`IndexPolicy`, used by its ``choice()`` method in lazy mode.
+- The indexes have to be written as :math:`I_k(t) = a_k + b_k x + c_k x^2`, with :math:`x = \sqrt{\log(t)}`, see :meth:`IndexPolicy.indexCoefficients`. This is the case for UCB, UCBalpha, UCBV and EmpiricalMeans.
+- Each node of the tree stores the arm with maximal index in its sub-tree, the number of arms tied with it, and the value of x at which the comparison of its two children could change.
+- Only the paths of the changed arms are recomputed after a reward, and as t grows only the nodes whose comparison could have changed are recomputed, so a step costs :math:`\mathcal{O}(\log K)` amortized, instead of :math:`\mathcal{O}(K)`.
+- Ties are still broken uniformly at random, by going down the tree with probabilities proportional to the number of tied arms in each child.
+"""
+
+from math import sqrt
+import numpy as np
+
+
+class IndexTree(object):
+    """ Kinetic tournament tree of the indexes of an :class:`IndexPolicy`."""
+
+    def __init__(self, policy):
+        """ New tree, for the index policy 'policy'."""
+        # Policy giving the indexes, with indexCoefficients(arms)
+        self.policy = policy
+
+        # Number of leaves, a power of 2, the extra leaves are never chosen
+        self.size = 1 << max(0, (policy.nbArms - 1).bit_length())
+
+        self.reset()
+
+    def reset(self):
+        """ Empty the tree, for a new game."""
+        nbArms, size = self.policy.nbArms, self.size
+
+        # Arms never pulled (with an infinite index), and their position in this list for O(1) removal
+        self.unpulled = list(range(nbArms))
+        self.position = list(range(nbArms))
+
+        # Arms changed since the last choice, and arms whose leaf is to update (kept while some arms are unpulled)
+        self.dirty = []
+        self.changed = set()
+
+        # Coefficients of the index of each leaf
+        self.a = [float('-inf')] * size
+        self.b = [0.] * size
+        self.c = [0.] * size
+
+        # For each node: best arm of its sub-tree, number of arms tied with it, value of x at which its comparison fails, and minimum of that in its sub-tree
+        self.winner = [0] * (2 * size)
+        self.winner[size:] = range(size)
+        self.count = [0] * (2 * size)
+        self.count[size:size + nbArms] = [1] * nbArms
+        self.fail = [float('inf')] * (2 * size)
+        self.minFail = [float('inf')] * (2 * size)
+
+        # Current value of x = sqrt(log(t)), None until the tree is built
+        self.x = None
+
+    def touch(self, arm):
+        """ Mark the arm 'arm' as changed (pulled, or with rewards removed, eg. by a sliding window): its index will be updated before the next choice."""
+        self.dirty.append(arm)
+
+    def _remove_unpulled(self, arm):
+        """ Remove the arm 'arm' from the list of unpulled arms, in O(1)."""
+        i = self.position[arm]
+        if i < 0:
+            return
+        last = self.unpulled.pop()
+        if last != arm:
+            self.unpulled[i] = last
+            self.position[last] = i
+        self.position[arm] = -1
+
+    def _add_unpulled(self, arm):
+        """ Add the arm 'arm' back to the list of unpulled arms (with no reward left), in O(1)."""
+        if self.position[arm] < 0:
+            self.position[arm] = len(self.unpulled)
+            self.unpulled.append(arm)
+
+    def _set_leaves(self, arms):
+        """ Read the coefficients of the indexes of the arms 'arms' from the policy."""
+        a, b, c = self.policy.indexCoefficients(np.asarray(arms))
+        for arm, ak, bk, ck in zip(arms, a.tolist(), b.tolist(), c.tolist()):
+            self.a[arm], self.b[arm], self.c[arm] = ak, bk, ck
+
+    def _crossing(self, w, l, x):
+        """ Smallest value y >= x at which the index of the arm 'l' could become larger than the one of the arm 'w'."""
+        if self.a[l] == float('-inf'):
+            return float('inf')
+        da, db, dc = self.a[l] - self.a[w], self.b[l] - self.b[w], self.c[l] - self.c[w]
+        if da == db == dc == 0:
+            return float('inf')  # Same index forever
+        if da + (db + dc * x) * x >= 0:
+            return x  # Tied now, to be recomputed as soon as x changes
+        if dc == 0:
+            return -da / db if db > 0 else float('inf')
+        delta = db * db - 4 * dc * da
+        if delta < 0:
+            return float('inf')
+        roots = ((-db - sqrt(delta)) / (2 * dc), (-db + sqrt(delta)) / (2 * dc))
+        return min((root for root in roots if root > x), default=float('inf'))
+
+    def _compute(self, i, x):
+        """ Recompute the node i, from its two children, at the value x."""
+        a, b, c, winner, count = self.a, self.b, self.c, self.winner, self.count
+        left, right = winner[2 * i], winner[2 * i + 1]
+        valueLeft = a[left] + (b[left] + c[left] * x) * x
+        valueRight = a[right] + (b[right] + c[right] * x) * x
+        if valueLeft > valueRight:
+            winner[i], count[i] = left, count[2 * i]
+            self.fail[i] = self._crossing(left, right, x)
+        elif valueRight > valueLeft:
+            winner[i], count[i] = right, count[2 * i + 1]
+            self.fail[i] = self._crossing(right, left, x)
+        else:
+            winner[i], count[i] = left, count[2 * i] + count[2 * i + 1]
+            self.fail[i] = self._crossing(left, right, x)
+        self.minFail[i] = min(self.fail[i], self.minFail[2 * i], self.minFail[2 * i + 1])
+
+    def _advance(self, i, x):
+        """ Recompute the nodes of the sub-tree of node i whose comparison could have changed before the value x."""
+        if i >= self.size or self.minFail[i] > x:
+            return
+        self._advance(2 * i, x)
+        self._advance(2 * i + 1, x)
+        self._compute(i, x)
+
+    def _build(self, x):
+        """ Read all the indexes and compute all the nodes, at the value x."""
+        self._set_leaves(list(range(self.policy.nbArms)))
+        for i in range(self.size - 1, 0, -1):
+            self._compute(i, x)
+        self.x = x
+
+    def choice(self):
+        r""" Choose an arm with maximal index (uniformly at random among ties), as :meth:`IndexPolicy.choice` does."""
+        # Unpulled arms have an infinite index, the tree is used only when they have all been pulled
+        if self.dirty:
+            pulls = self.policy.pulls
+            for arm in self.dirty:
+                if pulls[arm] > 0:
+                    self._remove_unpulled(arm)
+                else:
+                    self._add_unpulled(arm)
+            self.changed.update(self.dirty)
+            self.dirty = []
+        if self.unpulled:
+            return self.unpulled[self.policy._uniforms.randint(len(self.unpulled))]
+
+        x = sqrt(self.policy.logTime())
+        if self.x is None:
+            self._build(x)
+        else:
+            # Update the paths of the changed arms, then the nodes whose comparison failed
+            if self.changed:
+                arms = list(self.changed)
+                self._set_leaves(arms)
+                for arm in arms:
+                    i = (self.size + arm) // 2
+                    while i >= 1:
+                        self._compute(i, self.x)
+                        i //= 2
+            if x > self.x:
+                self._advance(1, x)
+                self.x = x
+        self.changed = set()
+
+        if self.count[1] == 1:
+            return self.winner[1]
+        # Uniform choice among the best arms, going down the tree
+        a, b, c, winner, count = self.a, self.b, self.c, self.winner, self.count
+        x, i = self.x, 1
+        while i < self.size:
+            left, right = winner[2 * i], winner[2 * i + 1]
+            valueLeft = a[left] + (b[left] + c[left] * x) * x
+            valueRight = a[right] + (b[right] + c[right] * x) * x
+            if valueLeft > valueRight:
+                i = 2 * i
+            elif valueRight > valueLeft:
+                i = 2 * i + 1
+            else:
+                i = 2 * i if self.policy._uniforms.randint(count[2 * i] + count[2 * i + 1]) < count[2 * i] else 2 * i + 1
+        return winner[i]
@@ -0,0 +1,217 @@
+# -*- coding: utf-8 -*-
+r""" The KL-UCB policy, for Bernoulli (or bounded) rewards: the index of an arm is the largest mean q for which its rewards are still likely,
+.. math:: I_k(t) = \max \{ q \in [\hat{\mu}_k(t), 1] : N_k(t) \mathrm{kl}(\hat{\mu}_k(t), q) \leq \log(t) + c \log(\log(t)) \}.
+- The indexes are solved by :func:`klucbBern`, or for arrays of arms at once by :func:`klucbBern_nparray`, with Newton iterations: :math:`q \mapsto \mathrm{kl}(p, q)` is convex and increasing on :math:`[p, 1]`, so from an upper bound they decrease to the index, quadratically.
+- They start from the best of two cheap upper bounds, and of one Newton step from the previous index of the arm (warm start): it moves little from one step to the next, so a few iterations are enough.
+- choice() only solves the indexes of the arms which can be the best, from a lower and an upper bound of each index (see :meth:`KLUCB.choice`). At each step, it costs a few vectorized operations on all the arms, as UCB, and a few Newton iterations on the pulled arm and on the arms whose bounds reach the best one.
+- Reference: [Garivier & Cappé - COLT, 2011].
+"""
+
+from math import log, sqrt, expm1
+import numpy as np
+
+try:
+    from .IndexPolicy import IndexPolicy, argmaxRandom
+except ImportError:
+    from IndexPolicy import IndexPolicy, argmaxRandom
+
+
+#: Smallest distance to 0 and 1 of the means in the KL divergences, to avoid log(0)
+EPS = 1e-15
+
+#: Precision of the indexes computed by :func:`klucbBern`
+PRECISION = 1e-10
+
+#: Maximum number of Newton iterations of :func:`klucbBern`
+MAX_ITERATIONS = 50
+
+#: Largest number of indexes solved one by one by :func:`klucbBern_nparray`: for a few of them, Python floats are quicker than numpy calls
+SCALAR_SIZE = 8
+
+
+def klBern(p, q):
+    r""" Kullback-Leibler divergence of Bernoulli distributions, :math:`\mathrm{kl}(p, q) = p \log(p / q) + (1 - p) \log((1 - p) / (1 - q))`."""
+    p, q = min(max(p, EPS), 1 - EPS), min(max(q, EPS), 1 - EPS)
+    return p * log(p / q) + (1 - p) * log((1 - p) / (1 - q))
+
+
+def klBern_nparray(p, q):
+    """ Kullback-Leibler divergence of Bernoulli distributions, for arrays."""
+    p, q = np.clip(p, EPS, 1 - EPS), np.clip(q, EPS, 1 - EPS)
+    return p * np.log(p / q) + (1 - p) * np.log((1 - p) / (1 - q))
+
+
+def klucbBern(p, d, start=None, precision=PRECISION, maxIterations=MAX_ITERATIONS):
+    r""" Largest q in [p, 1] such that :math:`\mathrm{kl}(p, q) \leq d`, with Newton iterations.
+    - Start from the best of two upper bounds: Pinsker's inequality :math:`\mathrm{kl}(p, q) \geq 2 (q - p)^2`, and :math:`\mathrm{kl}(p, q) \geq -(1 - p) \log(1 - q) - H(p)`, tight for a large d.
+    - And from one Newton step from start (eg. the previous index), if it is in (p, 1): by convexity, it lands above the solution.
+    - The result is an upper bound of the solution, within precision of it.
+    """
+    if p >= 1:
+        return 1.
+    p = max(p, 0.)
+    if d <= 0:
+        return p
+    pc = min(max(p, EPS), 1 - EPS)
+    q = min(p + sqrt(0.5 * d), -expm1(-(d - pc * log(pc)) / (1 - pc) + log(1 - pc)))
+    if start is not None and p < start < 1 - EPS:
+        q = min(q, start - (klBern(pc, start) - d) * start * (1 - start) / (start - p))
+    q = min(max(q, p), 1 - EPS)
+    for _ in range(maxIterations):
+        if q - p <= precision:
+            break
+        step = max(0., (klBern(pc, q) - d) * q * (1 - q) / (q - p))
+        q = max(q - step, p)
+        if step <= precision:
+            break
+    return q
+
+
+def klucbBern_nparray(p, d, start=None, precision=PRECISION, maxIterations=MAX_ITERATIONS):
+    """ Largest q in [p, 1] such that kl(p, q) <= d, for arrays p and d (and start, optional), as :func:`klucbBern` but with the Newton iterations on all of them at once."""
+    if len(p) <= SCALAR_SIZE:
+        starts = [None] * len(p) if start is None else np.asarray(start, dtype=float).tolist()
+        return np.array([klucbBern(a, b, c, precision, maxIterations) for a, b, c in zip(np.asarray(p, dtype=float).tolist(), np.asarray(d, dtype=float).tolist(), starts)])
+    p = np.clip(np.asarray(p, dtype=float), 0., 1.)
+    d = np.maximum(np.asarray(d, dtype=float), 0.)
+    pc = np.clip(p, EPS, 1 - EPS)
+    q = np.minimum(p + np.sqrt(0.5 * d), -np.expm1(-(d - pc * np.log(pc)) / (1 - pc) + np.log(1 - pc)))
+    if start is not None:
+        start = np.asarray(start, dtype=float)
+        valid = (start > p) & (start < 1 - EPS)
+        w = start[valid]
+        q[valid] = np.minimum(q[valid], w - (klBern_nparray(pc[valid], w) - d[valid]) * w * (1 - w) / (w - p[valid]))
+    q = np.clip(q, p, 1 - EPS)
+    # Newton iterations, only on the solutions not yet precise enough: they decrease to the solution
+    active = np.nonzero(q - p > precision)[0]
+    for _ in range(maxIterations):
+        if len(active) == 0:
+            break
+        pa, qa = p[active], q[active]
+        step = np.maximum(0., (klBern_nparray(pc[active], qa) - d[active]) * qa * (1 - qa) / (qa - pa))
+        q[active] = np.maximum(qa - step, pa)
+        active = active[(step > precision) & (q[active] - pa > precision)]
+    q[p >= 1] = 1.
+    q[d <= 0] = p[d <= 0]
+    return q
+
+
+class KLUCB(IndexPolicy):
+    """ The KL-UCB policy, with Bernoulli KL divergences, for rewards in [0, 1] (after normalization).
+    - Reference: [Garivier & Cappé - COLT, 2011].
+    """
+
+    def __init__(self, nbArms, c=0., lower=0., amplitude=1., rng=None):
+        #: Parameter c of the exploration term log(t) + c log(log(t))
+        self.c = c
+        # No lazy mode: the indexes are not of the form a + b sqrt(log(t))
+        super(KLUCB, self).__init__(nbArms, lower=lower, amplitude=amplitude, lazy=False, rng=rng)
+
+    def __str__(self):
+        return "KL-UCB" if self.c == 0 else r"KL-UCB($c={:.3g}$)".format(self.c)
+
+    def _allocate(self, shape):
+        """ Allocate the internal memory of the policy, and the bounds of the indexes used by choice()."""
+        super(KLUCB, self)._allocate(shape)
+        self._resetBounds()
+
+    def _resetBounds(self):
+        """ No index is known: their upper bounds are infinite, and no arm was pulled since the last choice."""
+        # Exploration term of the last computation of each index, and derivative of the index in it
+        self._exploredAt = np.full(self.index.shape, -np.inf)
+        self._slope = np.full(self.index.shape, np.inf)
+        # Arms pulled since their index was last solved: a set, so it holds each arm at most once whatever the calls between two choices
+        self._pulled = set()
+
+    def startGame(self):
+        super(KLUCB, self).startGame()
+        self._resetBounds()
+
+    def _exploration(self):
+        """ Exploration term log(t) + c log(log(t)) (with log(log(t)) taken as 0 for t < e)."""
+        logTime = self.logTime()
+        if self.c == 0:
+            return logTime
+        return logTime + self.c * np.log(np.maximum(logTime, 1.))
+
+    def getReward(self, arm, reward):
+        """ Give a reward: as for any index policy, and the index of that arm is no longer a bound of its new one."""
+        super(KLUCB, self).getReward(arm, reward)
+        self._pulled.add(arm)
+
+    def _addRewards(self, arms, rewards):
+        """ Add several rewards at once: the indexes of these arms are no longer bounds of their new ones (only for one game, the others do not use choice())."""
+        super(KLUCB, self)._addRewards(arms, rewards)
+        if not isinstance(arms, tuple):
+            self._pulled.update(np.unique(arms).tolist())
+
+    def computeIndex(self, arm):
+        r""" Compute the current index, at time t and after :math:`N_k(t)` pulls of arm k:
+        .. math:: I_k(t) = \max \{ q \in [\frac{X_k(t)}{N_k(t)}, 1] : N_k(t) \mathrm{kl}(\frac{X_k(t)}{N_k(t)}, q) \leq \log(t) + c \log(\log(t)) \}.
+        """
+        if self.pulls[arm] < 1:
+            return float('+inf')
+        return klucbBern(self.rewards[arm] / self.pulls[arm], self._exploration() / self.pulls[arm], self.index[arm])
+
+    def computeAllIndex(self):
+        """ Compute the current indexes for all arms, in a vectorized manner, warm-started from the previous ones.
+        - The bounds used by choice() are refreshed too, and no pulled arm is left to solve (except for the copies of a :class:`BanditPool`, whose indexes are their own).
+        """
+        index = self.index
+        pulled = self.pulls > 0
+        exploration = np.broadcast_to(self._exploration(), index.shape)[pulled]
+        if self._slope.shape == index.shape:
+            self._solveArms(pulled, exploration)
+            self._pulled.clear()
+        else:
+            invPulls = self.invPulls[pulled]
+            index[pulled] = klucbBern_nparray(self.rewards[pulled] * invPulls, exploration * invPulls, index[pulled])
+        index[~pulled] = float('+inf')
+
+    def _solveArm(self, arm, exploration):
+        r""" Compute the index of this arm, and its derivative in the exploration term: it is :math:`q (1 - q) / ((q - \hat{\mu}_k) N_k)` as :math:`\partial \mathrm{kl}(p, q) / \partial q = (q - p) / (q (1 - q))`, 0 for a mean of 1 and infinite for q = p < 1 (at t = 1)."""
+        pulls = int(self.pulls[arm])
+        mean = float(self.rewards[arm]) / pulls
+        q = self.index[arm] = klucbBern(mean, exploration / pulls, float(self.index[arm]))
+        self._slope[arm] = q * (1 - q) / ((q - mean) * pulls) if q > mean else (0. if mean >= 1 else float('+inf'))
+        self._exploredAt[arm] = exploration
+
+    def _solveArms(self, arms, exploration):
+        """ Compute the indexes of these arms (an array of arms, or a boolean mask), and their derivatives in the exploration term (a number, or one by arm), as :meth:`_solveArm`."""
+        invPulls = self.invPulls[arms]
+        means = self.rewards[arms] * invPulls
+        q = self.index[arms] = klucbBern_nparray(means, exploration * invPulls, self.index[arms])
+        with np.errstate(divide='ignore', invalid='ignore'):
+            self._slope[arms] = np.where(q > means, q * (1 - q) * invPulls / (q - means), np.where(means >= 1, 0., np.inf))
+        self._exploredAt[arms] = exploration
+
+    def choice(self):
+        r""" Choose an arm with maximal index (uniformly at random), without computing all the indexes:
+        - The indexes of the arms pulled since the last choice are computed first, warm-started from their previous ones.
+        - The other indexes only grew with the exploration term e since they were computed, and they are concave in it (as inverses of a convex function): their previous value is a lower bound, and its tangent :math:`I_k + (e - e_k) \partial I_k / \partial e` an upper bound.
+        - Only the arms whose upper bound reaches the largest lower bound can be the best: only their indexes are computed, and none if there is only one.
+        """
+        index, exploration, pulled = self.index, self._exploration(), self._pulled
+        if len(pulled) == 1:
+            self._solveArm(pulled.pop(), exploration)
+        elif pulled:
+            self._solveArms(np.fromiter(pulled, dtype=int, count=len(pulled)), exploration)
+            pulled.clear()
+        unpulled = self.pulls < 1
+        if unpulled.any():
+            index[unpulled] = float('+inf')
+            return argmaxRandom(index, self._uniforms)
+        with np.errstate(invalid='ignore'):
+            upper = np.multiply(exploration - self._exploredAt, self._slope)
+        upper += index
+        # An unknown upper bound (infinite slope and no change of the exploration term) is not < the best index
+        candidates = np.nonzero(~(upper < np.max(index)))[0]
+        if len(candidates) == 1:
+            return int(candidates[0])
+        self._solveArms(candidates, exploration)
+        return argmaxRandom(index, self._uniforms)
+
+    def _setStateArrays(self, arrays):
+        """ Use the arrays read by load_state(): no index is known."""
+        super(KLUCB, self)._setStateArrays(arrays)
+        self._resetBounds()
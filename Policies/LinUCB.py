@@ -0,0 +1,198 @@
+# -*- coding: utf-8 -*-
+r"""
+Linear contextual policies: LinUCB and linear Thompson sampling, for rewards :math:`r = x^T \theta_k + \text{noise}` of a context :math:`x`.
+- The context is given to choice(context), and kept for getReward(arm, reward) (or given again as its third argument). It is either a vector of dimension d, the same for all arms, or a matrix (nbArms, d) with one vector of features by arm.
+- With shared=False (disjoint model), each arm has its own :math:`\theta_k`, :math:`A_k^{-1}` and :math:`b_k`. With shared=True, all the arms share them, and the contexts have to be one vector by arm.
+- An update changes the inverse :math:`A^{-1}` of :math:`A = \lambda I + \sum x x^T` with the Sherman-Morrison formula, in :math:`O(d^2)`: :math:`A` is never inverted.
+- :meth:`LinUCB.computeScores` scores a batch of n contexts against all the arms at once, with one (batched) matrix product, and choice_batch(contexts) chooses one arm for each.
+- Reference: [Li et al. - WWW, 2010], [Agrawal & Goyal - ICML, 2013].
+"""
+
+import numpy as np
+
+try:
+    from .BasePolicy import BasePolicy
+    from .IndexPolicy import argmaxRows, argmaxRandom, argmaxMultiple
+except ImportError:
+    from BasePolicy import BasePolicy
+    from IndexPolicy import argmaxRows, argmaxRandom, argmaxMultiple
+
+
+#: Default weight of the confidence width of LinUCB
+ALPHA = 1.
+
+#: Default scale of the posterior covariance of the linear Thompson sampling
+V = 1.
+
+#: Default regularization lambda of A
+REGULARIZATION = 1.
+
+
+class LinUCB(BasePolicy):
+    r""" The LinUCB policy: the score of an arm for the context x is :math:`x^T \hat{\theta}_k + \alpha \sqrt{x^T A_k^{-1} x}`."""
+
+    def __init__(self, nbArms, dimension, alpha=ALPHA, regularization=REGULARIZATION, shared=False, lower=0., amplitude=1., rng=None):
+        assert dimension > 0, "Error: the 'dimension' parameter of a {} object cannot be <= 0.".format(self.__class__.__name__)  # DEBUG
+        assert regularization > 0, "Error: the 'regularization' parameter of a {} object has to be > 0.".format(self.__class__.__name__)  # DEBUG
+        #: Dimension d of the contexts
+        self.dimension = dimension
+        #: Weight of the confidence width
+        self.alpha = alpha
+        #: Regularization lambda: A starts at lambda I
+        self.regularization = regularization
+        #: True if all the arms share one parameter
+        self.shared = shared
+        super(LinUCB, self).__init__(nbArms, lower=lower, amplitude=amplitude, rng=rng)
+
+    def __str__(self):
+        return r"LinUCB($\alpha={:.3g}${})".format(self.alpha, ", shared" if self.shared else "")
+
+    def _allocate(self, shape):
+        """ Allocate the internal memory of the policy, and A^{-1}, b and theta of each arm (or shared)."""
+        if len(shape) != 1:
+            raise ValueError("Error: the policy {} cannot play several games at once.".format(self))
+        super(LinUCB, self)._allocate(shape)
+        prefix = () if self.shared else (self.nbArms,)
+        self.Ainv = np.zeros(prefix + (self.dimension, self.dimension))
+        self.b = np.zeros(prefix + (self.dimension,))
+        self.theta = np.zeros(prefix + (self.dimension,))
+        self._reset()
+
+    def _reset(self):
+        """ Start from A = lambda I, b = 0, and no context."""
+        self.Ainv[...] = np.eye(self.dimension) / self.regularization
+        self.b.fill(0)
+        self.theta.fill(0)
+        self._context = None
+
+    def startGame(self):
+        super(LinUCB, self).startGame()
+        self._reset()
+
+    # --- Scores
+
+    def _contexts(self, contexts):
+        """ The batch of contexts as an array of shape (n, d), shared by the arms, or (n, nbArms, d), one vector by arm."""
+        contexts = np.asarray(contexts, dtype=float)
+        if contexts.shape[-1] != self.dimension or contexts.ndim not in (2, 3) or (contexts.ndim == 3 and contexts.shape[1] != self.nbArms):
+            raise ValueError("Error: the policy {} needs contexts of shape (n, {d}) or (n, {k}, {d}), not {}.".format(self, contexts.shape, d=self.dimension, k=self.nbArms))
+        if self.shared and contexts.ndim == 2:
+            raise ValueError("Error: the policy {} shares its parameter between the arms, it needs one context by arm.".format(self))
+        return contexts
+
+    def _meansAndWidths(self, contexts):
+        r""" Estimated means :math:`x^T \hat{\theta}_k` and squared widths :math:`x^T A_k^{-1} x` of the contexts (n, d) or (n, nbArms, d), of shape (n, nbArms)."""
+        if contexts.ndim == 2:
+            # Disjoint arms, one context for all: (n, d) @ (d, K), and (n, d) @ (K, d, d) -> (K, n, d)
+            means = contexts @ self.theta.T
+            widths = np.sum((contexts @ self.Ainv) * contexts, axis=-1).T
+        elif self.shared:
+            # (n, K, d) @ (d,) and (n, K, d) @ (d, d)
+            means = contexts @ self.theta
+            widths = np.sum((contexts @ self.Ainv) * contexts, axis=-1)
+        else:
+            # One context by arm and one matrix by arm: (n, K, 1, d) @ (K, d, d) -> (n, K, 1, d)
+            means = np.sum(contexts * self.theta, axis=-1)
+            widths = np.sum((contexts[:, :, np.newaxis, :] @ self.Ainv)[:, :, 0, :] * contexts, axis=-1)
+        return means, np.maximum(0., widths)
+
+    def computeScores(self, contexts):
+        """ Scores of all the arms for a batch of contexts (n, d) or (n, nbArms, d), of shape (n, nbArms)."""
+        means, widths = self._meansAndWidths(self._contexts(contexts))
+        return means + self.alpha * np.sqrt(widths)
+
+    def choice(self, context=None):
+        """ Choose the arm of highest score for the context (uniformly at random among ties), and keep the context for getReward(). Without a context, use the last one."""
+        if context is not None:
+            self._context = np.asarray(context, dtype=float)
+        assert self._context is not None, "Error: the policy {} needs a context to choose an arm.".format(self)  # DEBUG
+        scores = self.computeScores(self._context[np.newaxis])[0]
+        return argmaxRandom(scores, self._uniforms)
+
+    def choiceMultiple(self, nb=1, context=None):
+        """ Choose nb distinct arms of highest scores for the context (or the last one), by decreasing score, and keep the context for getRewardMultiple()."""
+        if context is not None:
+            self._context = np.asarray(context, dtype=float)
+        assert self._context is not None, "Error: the policy {} needs a context to choose arms.".format(self)  # DEBUG
+        return argmaxMultiple(self.computeScores(self._context[np.newaxis])[0], nb, self.rng)
+
+    def choice_batch(self, contexts):
+        """ Choose one arm for each context of the batch (n, d) or (n, nbArms, d), with the same internal memory."""
+        return argmaxRows(self.computeScores(contexts), self.rng)
+
+    # --- Rank-one updates
+
+    def _update(self, arm, reward, context):
+        """ Add the observation of the normalized reward of the arm, for the context, to A^{-1}, b and theta (Sherman-Morrison)."""
+        x = context[arm] if context.ndim == 2 else context
+        Ainv, b = (self.Ainv, self.b) if self.shared else (self.Ainv[arm], self.b[arm])
+        Ax = Ainv @ x
+        Ainv -= np.outer(Ax, Ax) / (1. + x @ Ax)
+        b += reward * x
+        if self.shared:
+            self.theta[...] = Ainv @ b
+        else:
+            self.theta[arm] = Ainv @ b
+
+    def getReward(self, arm, reward, context=None):
+        """ Give a reward: as for BasePolicy, and update the estimate of the arm for the context (by default, the last one given to choice())."""
+        super(LinUCB, self).getReward(arm, reward)
+        context = self._context if context is None else np.asarray(context, dtype=float)
+        self._update(arm, (reward - self.lower) / self.amplitude, context)
+
+    def getRewardMultiple(self, arms, rewards, context=None):
+        """ Give the rewards of the distinct arms played at one step, all for the context (by default, the last one given to a choice)."""
+        super(LinUCB, self).getRewardMultiple(arms, rewards)
+        context = self._context if context is None else np.asarray(context, dtype=float)
+        for arm, reward in zip(np.asarray(arms).tolist(), ((np.asarray(rewards, dtype=float) - self.lower) / self.amplitude).tolist()):
+            self._update(arm, reward, context)
+
+    def getReward_batch(self, arms, rewards, contexts):
+        """ Give a batch of rewards at once, each for its context of the batch (n, d) or (n, nbArms, d): one rank-one update by reward."""
+        arms = np.asarray(arms)
+        self.t += len(arms)
+        self._addRewards(arms, rewards)
+        contexts = np.asarray(contexts, dtype=float)
+        for arm, reward, context in zip(arms.tolist(), ((np.asarray(rewards, dtype=float) - self.lower) / self.amplitude).tolist(), contexts):
+            self._update(arm, reward, context)
+
+    # --- Snapshots
+
+    def _stateArrays(self):
+        """ Arrays of the internal memory of the policy, with A^{-1}, b and theta."""
+        arrays = super(LinUCB, self)._stateArrays()
+        arrays["Ainv"], arrays["b"], arrays["theta"] = self.Ainv, self.b, self.theta
+        return arrays
+
+    def _setStateArrays(self, arrays):
+        """ Use the arrays read by load_state(), with A^{-1}, b and theta."""
+        super(LinUCB, self)._setStateArrays(arrays)
+        if arrays["theta"].shape != self.theta.shape:
+            raise ValueError("Error: the snapshot of a linear policy with parameters of shape {} cannot be loaded by the policy {}.".format(arrays["theta"].shape, self))
+        self.Ainv, self.b, self.theta = arrays["Ainv"], arrays["b"], arrays["theta"]
+
+
+class LinThompson(LinUCB):
+    r""" The linear Thompson sampling policy: the score of an arm for the context x is :math:`x^T \tilde{\theta}_k`, for a sample :math:`\tilde{\theta}_k \sim \mathcal{N}(\hat{\theta}_k, v^2 A_k^{-1})`.
+    - Disjoint arms are independent: the score of each arm is directly sampled from its law :math:`\mathcal{N}(x^T \hat{\theta}_k, v^2 x^T A_k^{-1} x)`.
+    - A shared parameter is sampled once by context, with a Cholesky factor of :math:`A^{-1}`, so that the scores of the arms are correlated as they should.
+    """
+
+    def __init__(self, nbArms, dimension, v=V, regularization=REGULARIZATION, shared=False, lower=0., amplitude=1., rng=None):
+        super(LinThompson, self).__init__(nbArms, dimension, alpha=0., regularization=regularization, shared=shared, lower=lower, amplitude=amplitude, rng=rng)
+        #: Scale of the posterior covariance
+        self.v = v
+
+    def __str__(self):
+        return r"LinThompson($v={:.3g}${})".format(self.v, ", shared" if self.shared else "")
+
+    def computeScores(self, contexts):
+        """ Sampled scores of all the arms for a batch of contexts (n, d) or (n, nbArms, d), of shape (n, nbArms): one independent sample by context."""
+        contexts = self._contexts(contexts)
+        if self.shared:
+            # One sample of theta by context: (n, d) @ (d, d)
+            factor = np.linalg.cholesky(self.Ainv)
+            thetas = self.theta + self.v * (self.rng.standard_normal((len(contexts), self.dimension)) @ factor.T)
+            return np.sum(contexts * thetas[:, np.newaxis, :], axis=-1)
+        means, widths = self._meansAndWidths(contexts)
+        return means + self.v * np.sqrt(widths) * self.rng.standard_normal(means.shape)
@@ -7,32 +7,28 @@ Rewards not in {0, 1} are handled with a trick, see bernoulliBinarization, with
 .. [Agrawal12] http://jmlr.org/proceedings/papers/v23/agrawal12/agrawal12.pdf
 """
 
-from random import random
-try:
-    from numpy.random import beta as betavariate  # Faster! Yes!
-except ImportError:
-    from random import betavariate
-
-
+import numpy as np
 # Local imports
 try:
     from .Posterior import Posterior
-
-    from .with_proba import with_proba
 except:
     from Posterior import Posterior
 
-    from with_proba import with_proba
+try:
+    from ...Arms.Arm import defaultRNG
+except ImportError:
+    from Arms.Arm import defaultRNG
 
 
 # --- Utility functions
 
 
-def bernoulliBinarization(r_t):
+def bernoulliBinarization(r_t, rng=None):
     """ 
     Return a (random) binarization of a reward :math:`r_t`, in the continuous interval :math:`[0, 1]` as an observation in discrete :math:`{0, 1}`.
     - Useful to allow to use a Beta posterior for non-Bernoulli experiments,
     - That way, :class:`Thompson` sampling can be used for any continuous-valued bounded rewards.
+    - The random value is drawn from the numpy Generator rng (the shared default one by default, see :func:`Arms.Arm.defaultRNG`).
     """
     if r_t == 0:
         return 0  # Returns a int!
@@ -40,7 +36,16 @@ def bernoulliBinarization(r_t):
         return 1  # Returns a int!
     else:
         assert 0 <= r_t <= 1, "Error: only bounded rewards in [0, 1] are supported by this Beta posterior right now."
-        return int(with_proba(r_t))
+        return int(defaultRNG(rng).random() < r_t)
+
+
+def bernoulliBinarization_nparray(r_t, rng=None):
+    """
+    Return a (random) binarization of an array of rewards in :math:`[0, 1]`, as observations in discrete :math:`{0, 1}`, see :func:`bernoulliBinarization`.
+    """
+    r_t = np.asarray(r_t)
+    assert np.all((0 <= r_t) & (r_t <= 1)), "Error: only bounded rewards in [0, 1] are supported by this Beta posterior right now."
+    return (defaultRNG(rng).random(r_t.shape) < r_t).astype(int)
 
 
 # --- Class
@@ -48,13 +53,16 @@ def bernoulliBinarization(r_t):
 class Beta(Posterior):
     """ Manipulate posteriors of Bernoulli/Beta experiments."""
 
-    def __init__(self, a=1, b=1):
-        r""" Create a Beta posterior :math:`\mathrm{Beta}(\alpha, \beta)` with no observation, i.e., :math:`\alpha = 1` and :math:`\beta = 1` by default."""
+    __slots__ = ('_a', '_b', 'N', 'rng')
+
+    def __init__(self, a=1, b=1, rng=None):
+        r""" Create a Beta posterior :math:`\mathrm{Beta}(\alpha, \beta)` with no observation, i.e., :math:`\alpha = 1` and :math:`\beta = 1` by default, sampled with the numpy Generator rng (the shared default one by default, see :func:`Arms.Arm.defaultRNG`)."""
         assert a >= 0, "Error: parameter 'a' for Beta posterior has to be >= 0."  # DEBUG
         self._a = a
         assert b >= 0, "Error: parameter 'b' for Beta posterior has to be >= 0."  # DEBUG
         self._b = b
         self.N = [a, b]  #: List of two parameters [a, b]
+        self.rng = defaultRNG(rng)  #: Random generator of the samples
 
     def __str__(self):
         return r"Beta(\alpha={:.3g}, \beta={:.3g})".format(self.N[1], self.N[0])
@@ -68,10 +76,10 @@ class Beta(Posterior):
         self.N = [a, b]
 
     def sample(self):
-        """Get a random sample from the Beta posterior (using :func:`numpy.random.betavariate`).
+        """Get a random sample from the Beta posterior (using the beta method of its numpy Generator).
         - Used only by :class:`Thompson` Sampling and :class:`AdBandits` so far.
         """
-        return betavariate(self.N[1], self.N[0])
+        return self.rng.beta(self.N[1], self.N[0])
 
     
     def mean(self):
@@ -82,7 +90,7 @@ class Beta(Posterior):
         """Forget the last observation."""
         # print("Info: calling Beta.forget() with obs = {} ...".format(obs))  # DEBUG
         # FIXED update this code, to accept obs that are FLOAT in [0, 1] and not just in {0, 1}...
-        self.N[bernoulliBinarization(obs)] -= 1
+        self.N[bernoulliBinarization(obs, self.rng)] -= 1
 
     def update(self, obs):
         r"""Add an observation.
@@ -92,4 +100,10 @@ class Beta(Posterior):
         """
         # print("Info: calling Beta.update() with obs = {} ...".format(obs))  # DEBUG
         # FIXED update this code, to accept obs that are FLOAT in [0, 1] and not just in {0, 1}...
-        self.N[bernoulliBinarization(obs)] += 1
\ No newline at end of file
+        self.N[bernoulliBinarization(obs, self.rng)] += 1
+
+    def update_batch(self, obs):
+        """Add several observations at once, in an array, as update() for each of them."""
+        successes = int(np.count_nonzero(bernoulliBinarization_nparray(obs, self.rng)))
+        self.N[1] += successes
+        self.N[0] += len(obs) - successes
@@ -0,0 +1,131 @@
+# -*- coding: utf-8 -*-
+"""
+Manipulate the Beta posteriors of all the arms at once, stored in one numpy array.
+- Same parameters as :class:`Beta`: ``N[0]`` counts the failures (parameter :math:`\\beta`) and ``N[1]`` the successes (parameter :math:`\\alpha`), but ``N`` has shape (2, nbArms).
+- Sampling all the arms is one call to the beta method of a numpy Generator, and an update is one array increment.
+- ``posterior[arm]`` gives a :class:`BetaArm` view on one arm, with the :class:`Posterior` API, for compatibility with the list of :class:`Beta` posteriors.
+"""
+
+import numpy as np
+
+# Local imports
+try:
+    from .Posterior import Posterior
+    from .Beta import bernoulliBinarization, bernoulliBinarization_nparray
+except ImportError:
+    from Posterior import Posterior
+    from Beta import bernoulliBinarization, bernoulliBinarization_nparray
+
+try:
+    from ...Arms.Arm import defaultRNG
+except ImportError:
+    from Arms.Arm import defaultRNG
+
+
+# --- Classes
+
+class BetaArray(object):
+    """ Manipulate the Beta posteriors of all the arms at once."""
+
+    def __init__(self, shape, a=1, b=1, rng=None):
+        r""" Create Beta posteriors :math:`\mathrm{Beta}(\alpha, \beta)` with no observation, for arms of that shape, i.e., :math:`\alpha = 1` and :math:`\beta = 1` by default, sampled with the numpy Generator rng (the shared default one by default, see :func:`Arms.Arm.defaultRNG`)."""
+        assert a >= 0, "Error: parameter 'a' for Beta posterior has to be >= 0."  # DEBUG
+        self._a = a
+        assert b >= 0, "Error: parameter 'b' for Beta posterior has to be >= 0."  # DEBUG
+        self._b = b
+        self.N = np.zeros((2,) + tuple(np.atleast_1d(shape)))  #: Array of the two parameters [a, b] of each arm
+        self.rng = defaultRNG(rng)  #: Random generator of the samples
+        self.reset()
+
+    def __str__(self):
+        return r"BetaArray(\alpha={}, \beta={})".format(self.N[1], self.N[0])
+
+    def __len__(self):
+        return self.N.shape[-1]
+
+    def __getitem__(self, arm):
+        return BetaArm(self, arm)
+
+    def reset(self, a=None, b=None):
+        """Reset alpha and beta of all the arms, both to 1 as when creating a new default Beta."""
+        self.N[0] = self._a if a is None else a
+        self.N[1] = self._b if b is None else b
+
+    def sample(self, arms=slice(None), size=None):
+        """Get one random sample from the Beta posterior of each of the arms (all by default), in one call to rng.beta(), or size samples of each, in an array of shape (size, len(arms))."""
+        a, b = self.N[1][arms], self.N[0][arms]
+        return self.rng.beta(a, b, size=None if size is None else (size,) + np.shape(a))
+
+    def mean(self, arms=slice(None)):
+        """Compute the means of the Beta posteriors of the arms (all by default)."""
+        return self.N[1][arms] / (self.N[0][arms] + self.N[1][arms])
+
+    def _index(self, arm, obs):
+        """Index in N of the observations obs of the arm(s) arm, which can be a tuple of indexes for several dimensions."""
+        if np.ndim(obs) == 0:
+            obs = bernoulliBinarization(obs, self.rng)
+        else:
+            obs = bernoulliBinarization_nparray(obs, self.rng)
+        return (obs,) + (arm if isinstance(arm, tuple) else (arm,))
+
+    def forget(self, arm, obs):
+        """Forget the last observation obs of the arm(s) arm."""
+        if np.ndim(obs) == 0:
+            self.N[self._index(arm, obs)] -= 1
+        else:
+            np.subtract.at(self.N, self._index(arm, obs), 1)
+
+    def update(self, arm, obs):
+        r"""Add an observation obs to the arm(s) arm, obs can be an array of observations of several arms (repeated arms are counted as many times, with :func:`numpy.add.at`).
+        - If obs is 1, update :math:`\alpha` the count of positive observations,
+        - If it is 0, update :math:`\beta` the count of negative observations.
+        .. note:: Otherwise, a trick with :func:`bernoulliBinarization` has to be used.
+        """
+        if np.ndim(obs) == 0:
+            self.N[self._index(arm, obs)] += 1
+        elif self.N.ndim == 2 and not isinstance(arm, tuple):
+            # Bulk update: count the observations of each (obs, arm) pair
+            obs, arm = self._index(arm, obs)
+            nbArms = self.N.shape[1]
+            self.N += np.bincount(obs * nbArms + arm, minlength=2 * nbArms).reshape(2, nbArms)
+        else:
+            np.add.at(self.N, self._index(arm, obs), 1)
+
+
+class BetaArm(Posterior):
+    """ View on the Beta posterior of one arm of a :class:`BetaArray`, with the :class:`Posterior` API."""
+
+    __slots__ = ('_posteriors', '_arm')
+
+    def __init__(self, posteriors, arm):
+        self._posteriors = posteriors
+        self._arm = arm
+
+    @property
+    def N(self):
+        """Array of the two parameters [a, b] of this arm."""
+        return self._posteriors.N[:, self._arm]
+
+    def __str__(self):
+        return r"Beta(\alpha={:.3g}, \beta={:.3g})".format(self.N[1], self.N[0])
+
+    def reset(self, a=None, b=None):
+        """Reset alpha and beta of this arm, both to 1 as when creating a new default Beta."""
+        self._posteriors.N[0, self._arm] = self._posteriors._a if a is None else a
+        self._posteriors.N[1, self._arm] = self._posteriors._b if b is None else b
+
+    def sample(self):
+        """Get a random sample from the Beta posterior of this arm."""
+        return self._posteriors.rng.beta(self.N[1], self.N[0])
+
+    def mean(self):
+        """Compute the mean of the Beta posterior of this arm."""
+        return self.N[1] / float(sum(self.N))
+
+    def forget(self, obs):
+        """Forget the last observation."""
+        self._posteriors.forget(self._arm, obs)
+
+    def update(self, obs):
+        """Add an observation."""
+        self._posteriors.update(self._arm, obs)
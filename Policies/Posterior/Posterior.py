@@ -5,6 +5,9 @@ from __future__ import division, print_function  # Python 2 compatibility
 class Posterior(object):
     """ Manipulate posteriors experiments."""
 
+    # No __dict__ for posteriors: a policy has one by arm
+    __slots__ = ()
+
     def __init__(self, *args, **kwargs):
         raise NotImplementedError("This method __init__(self, *args, **kwargs) has to be implemented in the child class inheriting from Posterior.")
 
@@ -30,4 +33,9 @@ class Posterior(object):
 
     def update(self, obs):
         """Update posterior with this observation."""
-        raise NotImplementedError("This method update(self, obs) has to be implemented in the child class inheriting from Posterior.")
\ No newline at end of file
+        raise NotImplementedError("This method update(self, obs) has to be implemented in the child class inheriting from Posterior.")
+
+    def update_batch(self, obs):
+        """Update posterior with several observations: by default, one call to update() for each."""
+        for o in obs:
+            self.update(o)
@@ -1 +1,2 @@
-from .Beta import Beta
\ No newline at end of file
+from .Beta import Beta
+from .BetaArray import BetaArray
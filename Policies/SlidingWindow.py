@@ -0,0 +1,237 @@
+# -*- coding: utf-8 -*-
+"""
+Sliding-window variants of UCB, UCB-V and Thompson, for non-stationary arms (eg. with :meth:`Arms.Bernoulli.set_mean_param`): only the rewards of the last ``window`` steps are used.
+- The rewards of the last steps, with their arm and time, are kept in one ring buffer shared by all the arms (:class:`RewardWindow`): the memory is O(window) whatever the horizon.
+- An update adds the new reward to the statistics of its arm, and removes the rewards which left the window from the statistics of their arms, in O(1) (amortized): the indexes are then computed as for the stationary policies.
+- The rewards expire with time, not with the pulls of their arm: an arm not pulled for ``window`` steps has no reward left, its index becomes infinite and it is played again.
+- Reference: [Garivier & Moulines - ALT, 2011].
+"""
+
+from math import log
+import numpy as np
+
+try:
+    from .IndexPolicy import LOG_TABLE, LOG_TABLE_SIZE
+    from .UCB import UCB
+    from .UCBV import UCBV
+    from .Thompson import Thompson
+    from .Posterior import BetaArray
+    from .Posterior.Beta import bernoulliBinarization
+except ImportError:
+    from IndexPolicy import LOG_TABLE, LOG_TABLE_SIZE
+    from UCB import UCB
+    from UCBV import UCBV
+    from Thompson import Thompson
+    from Posterior import BetaArray
+    from Posterior.Beta import bernoulliBinarization
+
+
+#: Default number of steps kept in the window
+WINDOW = 100
+
+
+class RewardWindow(object):
+    """ Observations (time, arm, value) of the last 'size' steps, in one ring buffer shared by all the arms.
+    - It holds 'size' observations, one by step, and grows only if several arms are played at the same step (multiple plays).
+    """
+
+    __slots__ = ('size', 'times', 'arms', 'values', 'start', 'length')
+
+    def __init__(self, size=WINDOW):
+        assert size > 0, "Error: the 'size' parameter of a RewardWindow object cannot be <= 0."  # DEBUG
+        self.size = size  #: Number of steps kept
+        self.times = np.zeros(size, dtype=int)  #: Time of each observation
+        self.arms = np.zeros(size, dtype=int)  #: Arm of each observation
+        self.values = np.zeros(size)  #: Value of each observation
+        self.start = 0  #: Position of the oldest observation
+        self.length = 0  #: Number of observations in the window
+
+    def reset(self):
+        """ Forget all the observations."""
+        self.start = self.length = 0
+
+    def expire(self, time):
+        """ Remove the observations which left the window at this time (made at time - size or before), and return them as a list of pairs (arm, value)."""
+        old = []
+        times, capacity = self.times, len(self.times)
+        while self.length and times[self.start] <= time - self.size:
+            old.append((int(self.arms[self.start]), float(self.values[self.start])))
+            self.start = (self.start + 1) % capacity
+            self.length -= 1
+        return old
+
+    def push(self, time, arm, value):
+        """ Add an observation of the arm at this time."""
+        capacity = len(self.times)
+        if self.length == capacity:
+            # Several observations by step: double the ring buffer, from its oldest observation
+            order = (self.start + np.arange(capacity)) % capacity
+            self.times, self.arms, self.values = [np.concatenate([array[order], np.zeros_like(array)]) for array in (self.times, self.arms, self.values)]
+            self.start, capacity = 0, 2 * capacity
+        i = (self.start + self.length) % capacity
+        self.times[i], self.arms[i], self.values[i] = time, arm, value
+        self.length += 1
+
+    def toArrays(self):
+        """ Size of the window, and times, arms and values of its observations from the oldest, as arrays for a snapshot."""
+        order = (self.start + np.arange(self.length)) % len(self.times)
+        return {"window": np.array([self.size]), "windowTimes": self.times[order], "windowArms": self.arms[order], "windowValues": self.values[order]}
+
+    def fromArrays(self, arrays):
+        """ Use the arrays of a snapshot, written by :meth:`toArrays`."""
+        self.size = int(arrays["window"][0])
+        self.times, self.arms, self.values = [np.array(arrays[name]) for name in ("windowTimes", "windowArms", "windowValues")]
+        self.start, self.length = 0, len(self.times)
+        if self.length < self.size:
+            self.times, self.arms, self.values = [np.concatenate([array, np.zeros(self.size - self.length, dtype=array.dtype)]) for array in (self.times, self.arms, self.values)]
+
+
+def _checkShape(policy, shape):
+    """ The window is of one game: raise a ValueError for a shape of several games."""
+    if len(shape) != 1:
+        raise ValueError("Error: the policy {} keeps one window of rewards, it cannot play several games at once.".format(policy))
+
+
+class SWUCB(UCB):
+    r""" The UCB policy, on the rewards of the last 'window' steps: :math:`I_k(t) = \frac{X_k(t, \tau)}{N_k(t, \tau)} + \sqrt{\frac{2 \log(\min(t, \tau))}{N_k(t, \tau)}}`."""
+
+    def __init__(self, nbArms, window=WINDOW, lower=0., amplitude=1., lazy=False, rng=None):
+        super(SWUCB, self).__init__(nbArms, lower=lower, amplitude=amplitude, lazy=lazy, rng=rng)
+        #: Number of steps kept in the window
+        self.window = window
+        self._rewardWindow = RewardWindow(window)
+
+    def __str__(self):
+        return r"SW-UCB($\tau={}$)".format(self.window)
+
+    def _allocate(self, shape):
+        _checkShape(self, shape)
+        super(SWUCB, self)._allocate(shape)
+
+    def startGame(self):
+        super(SWUCB, self).startGame()
+        self._rewardWindow.reset()
+
+    def logTime(self):
+        """ log(min(t, window)): the rewards of at most window steps are used."""
+        t = min(self.t, self.window)
+        return LOG_TABLE[t] if t < LOG_TABLE_SIZE else log(t)
+
+    def getReward(self, arm, reward):
+        """ Give a reward: as for UCB, it enters the window, and the rewards which left it are removed from the statistics of their arms."""
+        super(SWUCB, self).getReward(arm, reward)
+        self._slide([arm], [(reward - self.lower) / self.amplitude])
+
+    def getReward_batch(self, arms, rewards):
+        """ Give a batch of rewards at once, as getReward() for each pair (arm, reward): each of them is one step of the window."""
+        for arm, reward in zip(np.asarray(arms).tolist(), np.asarray(rewards, dtype=float).tolist()):
+            self.getReward(arm, reward)
+
+    def _addRewards(self, arms, rewards):
+        """ Add several rewards at once, all at the current time (eg. the slate of one step of multiple plays), and remove the ones which left the window."""
+        arms, rewards = np.asarray(arms), np.asarray(rewards, dtype=float)
+        super(SWUCB, self)._addRewards(arms, rewards)
+        self._slide(arms.tolist(), ((rewards - self.lower) / self.amplitude).tolist())
+
+    def _slide(self, arms, values):
+        """ Add the normalized rewards of the arms to the window at the current time, and remove the ones which left it from the statistics."""
+        for arm, old in self._rewardWindow.expire(self.t):
+            self._remove(arm, old)
+        for arm, value in zip(arms, values):
+            self._rewardWindow.push(self.t, arm, value)
+
+    def _remove(self, arm, old):
+        """ Remove the normalized reward 'old' from the statistics of the arm: with no reward left, its index is infinite again."""
+        self.pulls[arm] -= 1
+        self.rewards[arm] -= old
+        pulls = int(self.pulls[arm])
+        if pulls > 0:
+            self.invPulls[arm] = 1 / pulls
+        else:
+            self.stats[arm] = 0  # Exactly 0, without rounding errors
+        if self._tree is not None:
+            self._tree.touch(arm)
+
+    def _stateArrays(self):
+        """ Arrays of the internal memory of the policy, with the window."""
+        arrays = super(SWUCB, self)._stateArrays()
+        arrays.update(self._rewardWindow.toArrays())
+        return arrays
+
+    def _setStateArrays(self, arrays):
+        """ Use the arrays read by load_state(), with the window and its size."""
+        super(SWUCB, self)._setStateArrays(arrays)
+        self._rewardWindow.fromArrays(arrays)
+        self.window = self._rewardWindow.size
+
+
+class SWUCBV(SWUCB, UCBV):
+    """ The UCB-V policy, on the rewards of the last 'window' steps."""
+
+    def __str__(self):
+        return r"SW-UCB-V($\tau={}$)".format(self.window)
+
+    def _remove(self, arm, old):
+        """ Remove the normalized reward 'old' from the statistics of the arm, and its square."""
+        self.rewardsSquared[arm] -= old ** 2
+        super(SWUCBV, self)._remove(arm, old)
+
+
+class SWThompson(Thompson):
+    """ The Thompson sampling policy, with Beta posteriors on the (binarized) rewards of the last 'window' steps."""
+
+    def __init__(self, nbArms, window=WINDOW, lower=0., amplitude=1., rng=None, **kwargs):
+        super(SWThompson, self).__init__(nbArms, lower=lower, amplitude=amplitude, rng=rng, **kwargs)
+        #: Number of steps kept in the window
+        self.window = window
+        self._rewardWindow = RewardWindow(window)
+
+    def __str__(self):
+        return r"SW-Thompson($\tau={}$)".format(self.window)
+
+    def _allocate(self, shape):
+        _checkShape(self, shape)
+        super(SWThompson, self)._allocate(shape)
+
+    def startGame(self):
+        super(SWThompson, self).startGame()
+        self._rewardWindow.reset()
+
+    def _slide(self, arms, observations):
+        """ Add the binary observations of the arms to their posteriors and to the window at the current time, and forget the ones which left it."""
+        if isinstance(self.posterior, BetaArray):
+            update, forget = self.posterior.update, self.posterior.forget
+        else:
+            update, forget = (lambda arm, obs: self.posterior[arm].update(obs)), (lambda arm, obs: self.posterior[arm].forget(obs))
+        for arm, old in self._rewardWindow.expire(self.t):
+            forget(arm, int(old))
+        for arm, obs in zip(arms, observations):
+            update(arm, obs)
+            self._rewardWindow.push(self.t, arm, obs)
+
+    def getReward(self, arm, reward):
+        """ Give a reward: its binarization is added to the posterior of the arm and enters the window, and the observations which left it are forgotten."""
+        self.t += 1
+        self._slide([arm], [bernoulliBinarization((reward - self.lower) / self.amplitude, self.rng)])
+
+    def getReward_batch(self, arms, rewards):
+        """ Give a batch of rewards at once, as getReward() for each pair (arm, reward): each of them is one step of the window."""
+        for arm, reward in zip(np.asarray(arms).tolist(), np.asarray(rewards, dtype=float).tolist()):
+            self.getReward(arm, reward)
+
+    def _addRewards(self, arms, rewards):
+        """ Add several rewards at once, all at the current time (eg. the slate of one step of multiple plays), as getReward() without changing t."""
+        rewards = (np.asarray(rewards, dtype=float) - self.lower) / self.amplitude
+        self._slide(np.asarray(arms).tolist(), [bernoulliBinarization(reward, self.rng) for reward in rewards.tolist()])
+
+    def _stateArrays(self):
+        """ Arrays of the internal memory of the policy, with the window."""
+        arrays = super(SWThompson, self)._stateArrays()
+        arrays.update(self._rewardWindow.toArrays())
+        return arrays
+
+    def _setStateArrays(self, arrays):
+        """ Use the arrays read by load_state(), with the window and its size."""
+        super(SWThompson, self)._setStateArrays(arrays)
+        self._rewardWindow.fromArrays(arrays)
+        self.window = self._rewardWindow.size
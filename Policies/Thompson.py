@@ -2,9 +2,15 @@
 
 
 try:
+    from .BasePolicy import BasePolicy
+    from .IndexPolicy import argmaxRows
     from .BayesianIndexPolicy import BayesianIndexPolicy
+    from .Posterior import BetaArray
 except (ImportError, SystemError):
+    from BasePolicy import BasePolicy
+    from IndexPolicy import argmaxRows
     from BayesianIndexPolicy import BayesianIndexPolicy
+    from Posterior import BetaArray
 
 
 class Thompson(BayesianIndexPolicy):
@@ -23,4 +29,21 @@ class Thompson(BayesianIndexPolicy):
         Compute the current index, at time t and after N_k(t) pulls of arm k, giving S_k(t) rewards of 1, by sampling from the Beta posterior:
 
         """
-        return self.posterior[arm].sample()
\ No newline at end of file
+        return self.posterior[arm].sample()
+
+    def computeAllIndex(self):
+        """ 
+        Compute the current indexes for all arms: with a :class:`BetaArray` posterior, all the samples are drawn in one call.
+        """
+        if isinstance(self.posterior, BetaArray):
+            self.index[:] = self.posterior.sample()
+        else:
+            super(Thompson, self).computeAllIndex()
+
+    def choice_batch(self, n):
+        """ 
+        Choose n arms at once, each with its own sample of the posteriors: with a :class:`BetaArray` posterior, the n samples of all arms are drawn in one call.
+        """
+        if isinstance(self.posterior, BetaArray):
+            return argmaxRows(self.posterior.sample(size=n), self.rng)
+        return BasePolicy.choice_batch(self, n)
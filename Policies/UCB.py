@@ -3,7 +3,7 @@
 - Reference: [Lai & Robbins, 1985].
 """
 
-from math import sqrt, log
+from math import sqrt
 import numpy as np
 
 try:
@@ -24,4 +24,20 @@ class UCB(IndexPolicy):
         if self.pulls[arm] < 1:
             return float('+inf')
         else:
-            return (self.rewards[arm] / self.pulls[arm]) + sqrt((2 * log(self.t)) / self.pulls[arm])
\ No newline at end of file
+            return (self.rewards[arm] / self.pulls[arm]) + sqrt((2 * self.logTime()) / self.pulls[arm])
+
+    def computeAllIndex(self):
+        """ 
+        Compute the current indexes for all arms, in a vectorized manner.
+        """
+        invPulls, index = self.invPulls, self.index
+        np.sqrt(np.multiply(invPulls, 2 * self.logTime(), out=index), out=index)
+        index += self.rewards * invPulls
+        index[self.pulls < 1] = float('+inf')
+
+    def indexCoefficients(self, arms):
+        r""" 
+        Coefficients of the indexes of the pulled arms 'arms': :math:`a_k = \frac{X_k(t)}{N_k(t)}`, :math:`b_k = \sqrt{\frac{2}{N_k(t)}}` and :math:`c_k = 0`.
+        """
+        pulls = self.pulls[arms]
+        return self.rewards[arms] / pulls, np.sqrt(2. / pulls), np.zeros(len(pulls))
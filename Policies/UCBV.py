@@ -1,10 +1,12 @@
 # -*- coding: utf-8 -*-
-from math import sqrt, log
+from math import sqrt
 import numpy as np
 try:
     from .UCB import UCB
+    from .BasePolicy import addAt
 except ImportError:
     from UCB import UCB
+    from BasePolicy import addAt
 
 
 class UCBV(UCB):
@@ -12,12 +14,14 @@ class UCBV(UCB):
     The UCB-V policy for bounded bandits, with a variance correction term.
     Reference: [Audibert, Munos, & Szepesvári - Theoret. Comput. Sci., 2009].
     """
+    #: Fields of the per-arm statistics, with the squared rewards to compute an empirical variance
+    _statsFields = UCB._statsFields + [('rewardsSquared', float)]
+
     def __str__(self):
         return "UCB-V"
 
-    def __init__(self, nbArms, lower=0., amplitude=1.):
-        super(UCBV, self).__init__(nbArms, lower=lower, amplitude=amplitude)
-        self.rewardsSquared = np.zeros(self.nbArms)  #: Keep track of squared of rewards, to compute an empirical variance
+    def __init__(self, nbArms, lower=0., amplitude=1., lazy=False, rng=None):
+        super(UCBV, self).__init__(nbArms, lower=lower, amplitude=amplitude, lazy=lazy, rng=rng)
 
     def startGame(self):
         super(UCBV, self).startGame()
@@ -30,6 +34,11 @@ class UCBV(UCB):
         super(UCBV, self).getReward(arm, reward)
         self.rewardsSquared[arm] += ((reward - self.lower) / self.amplitude) ** 2
 
+    def _addRewards(self, arms, rewards):
+        """ Add several rewards at once, and their squares."""
+        super(UCBV, self)._addRewards(arms, rewards)
+        addAt(self.rewardsSquared, arms, ((np.asarray(rewards, dtype=float) - self.lower) / self.amplitude) ** 2)
+
     def computeIndex(self, arm):
         """ 
         Compute the current index, at time t and after N_k(t) pulls of arm k:
@@ -39,4 +48,28 @@ class UCBV(UCB):
         else:
             mean = self.rewards[arm] / self.pulls[arm]   # Mean estimate
             variance = (self.rewardsSquared[arm] / self.pulls[arm]) - mean ** 2  # Variance estimate
-            return mean + sqrt(2.0 * log(self.t) * variance / self.pulls[arm]) + 3.0 * self.amplitude * log(self.t) / self.pulls[arm]
\ No newline at end of file
+            logTime = self.logTime()
+            return mean + sqrt(2.0 * logTime * variance / self.pulls[arm]) + 3.0 * self.amplitude * logTime / self.pulls[arm]
+
+    def computeAllIndex(self):
+        """ 
+        Compute the current indexes for all arms, in a vectorized manner.
+        """
+        invPulls, index, logTime = self.invPulls, self.index, self.logTime()
+        means = self.rewards * invPulls   # Mean estimates
+        variances = np.maximum(0., self.rewardsSquared * invPulls - means ** 2)  # Variance estimates
+        np.multiply(variances, invPulls, out=index)
+        index *= 2.0 * logTime
+        np.sqrt(index, out=index)
+        index += means
+        index += (3.0 * self.amplitude * logTime) * invPulls
+        index[self.pulls < 1] = float('+inf')
+
+    def indexCoefficients(self, arms):
+        r""" 
+        Coefficients of the indexes of the pulled arms 'arms': :math:`a_k` is the mean, :math:`b_k = \sqrt{\frac{2 V_k(t)}{N_k(t)}}` and :math:`c_k = \frac{3 A}{N_k(t)}`.
+        """
+        pulls = self.pulls[arms]
+        means = self.rewards[arms] / pulls
+        variances = np.maximum(0., (self.rewardsSquared[arms] / pulls) - means ** 2)
+        return means, np.sqrt(2.0 * variances / pulls), 3.0 * self.amplitude / pulls
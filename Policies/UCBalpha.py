@@ -1,5 +1,5 @@
 # -*- coding: utf-8 -*-
-from math import sqrt, log
+from math import sqrt
 import numpy as np
 
 try:
@@ -18,8 +18,8 @@ class UCBalpha(UCB):
     Reference: [Auer et al. 02].
     """
 
-    def __init__(self, nbArms, alpha=ALPHA, lower=0., amplitude=1.):
-        super(UCBalpha, self).__init__(nbArms, lower=lower, amplitude=amplitude)
+    def __init__(self, nbArms, alpha=ALPHA, lower=0., amplitude=1., lazy=False, rng=None):
+        super(UCBalpha, self).__init__(nbArms, lower=lower, amplitude=amplitude, lazy=lazy, rng=rng)
         
         #: Parameter alpha
         self.alpha = alpha  
@@ -34,4 +34,20 @@ class UCBalpha(UCB):
         if self.pulls[arm] < 1:
             return float('+inf')
         else:
-            return (self.rewards[arm] / self.pulls[arm]) + sqrt((self.alpha * log(self.t)) / (2 * self.pulls[arm]))
\ No newline at end of file
+            return (self.rewards[arm] / self.pulls[arm]) + sqrt((self.alpha * self.logTime()) / (2 * self.pulls[arm]))
+
+    def computeAllIndex(self):
+        """ 
+        Compute the current indexes for all arms, in a vectorized manner.
+        """
+        invPulls, index = self.invPulls, self.index
+        np.sqrt(np.multiply(invPulls, (self.alpha / 2.) * self.logTime(), out=index), out=index)
+        index += self.rewards * invPulls
+        index[self.pulls < 1] = float('+inf')
+
+    def indexCoefficients(self, arms):
+        r""" 
+        Coefficients of the indexes of the pulled arms 'arms': :math:`a_k = \frac{X_k(t)}{N_k(t)}`, :math:`b_k = \sqrt{\frac{\alpha}{2 N_k(t)}}` and :math:`c_k = 0`.
+        """
+        pulls = self.pulls[arms]
+        return self.rewards[arms] / pulls, np.sqrt(self.alpha / (2. * pulls)), np.zeros(len(pulls))
@@ -9,10 +9,11 @@ except ImportError:
 
 
 class UCBplus(UCB):
-    """ 
+    r""" 
     The UCB+ policy for bounded bandits, with a small trick on the index.
     - Reference: [Auer et al. 2002], and [[Garivier et al. 2016](https://arxiv.org/pdf/1605.08988.pdf)]
      (it is noted UCB in the second article).
+    - No lazy mode: its indexes, with :math:`\log(t / N_k(t))`, are not of the form :math:`a + b \sqrt{\log(t)}`.
     """
 
     def __str__(self):
@@ -27,3 +28,14 @@ class UCBplus(UCB):
             return float('+inf')
         else:
             return (self.rewards[arm] / self.pulls[arm]) + sqrt(max(0., log(self.t / (self.pulls[arm]))) / (2 * self.pulls[arm]))
+
+    def computeAllIndex(self):
+        """ 
+        Compute the current indexes for all arms, in a vectorized manner.
+        """
+        invPulls, index = self.invPulls, self.index
+        # max(0, log(t / N_k(t))) = log(max(1, t / N_k(t))), also 0 for the unpulled arms (1 / N_k(t) = 0)
+        np.log(np.maximum(self.t * invPulls, 1.), out=index)
+        np.sqrt(np.multiply(index, 0.5 * invPulls, out=index), out=index)
+        index += self.rewards * invPulls
+        index[self.pulls < 1] = float('+inf')
@@ -1,10 +1,10 @@
 from .BasePolicy import BasePolicy
-from .Posterior import Beta
+from .Posterior import Beta, BetaArray
 
 # --- Naive or less naive epsilon-greedy policies
 from .EpsilonGreedy import EpsilonGreedy
 # --- Mine, simple exploratory policies
-# from .EmpiricalMeans import EmpiricalMeans
+from .EmpericalMeans import EmpiricalMeans
 
 # --- Variants on EpsilonFirst, Explore-Then-Commit from E.Kaufmann's slides at IEEE ICC 2017
 from .ExploreThenCommit import ETC_KnownGap, ETC_RandomStop
@@ -14,10 +14,26 @@ from .UCB import UCB
 from .UCBalpha import UCBalpha  # Different indexes
 from .UCBplus import UCBplus    # Different indexes
 
+# --- KL-UCB, with indexes solved for all arms at once
+from .KLUCB import KLUCB
+
 # --- UCB policies with variance terms
 from .UCBV import UCBV          # Different indexes
 
 # --- Thompson sampling index policy
 from .Thompson import Thompson
 
-from .with_proba import with_proba
+# --- Sliding-window and discounted variants, for non-stationary arms
+from .SlidingWindow import SWUCB, SWUCBV, SWThompson
+from .Discounted import DiscountedUCB, DiscountedUCBV, DiscountedThompson
+
+# --- Linear contextual policies, choosing with a context
+from .LinUCB import LinUCB, LinThompson
+
+# --- Many small bandits playing one index policy, in 2-D arrays
+from .BanditPool import BanditPool
+
+# --- One policy shared by several threads
+from .ConcurrentPolicy import ConcurrentPolicy
+
+from .with_proba import UniformBuffer
@@ -0,0 +1,67 @@
+# -*- coding: utf-8 -*-
+""" Snapshots of the internal memory of the policies, in a compact binary file, used by ``save_state()`` and ``load_state()``.
+- The file starts with a header: the magic string ``MABSNAP``, the version of the format, and a JSON description of the policy and of its arrays (name, dtype, shape and offset of each, from the end of the header).
+- Each array follows, raw and aligned on 64 bytes: they are loaded without copy with :class:`numpy.memmap`, so restoring millions of arms takes milliseconds.
+"""
+
+import json
+import struct
+import numpy as np
+from numpy.lib.format import dtype_to_descr, descr_to_dtype
+
+
+#: Magic string at the beginning of a snapshot file
+MAGIC = b'MABSNAP\x00'
+
+#: Version of the format of the snapshot files
+VERSION = 1
+
+#: Alignment of the arrays in the file, in bytes
+ALIGNMENT = 64
+
+
+def _align(offset):
+    """ Smallest multiple of ALIGNMENT >= offset."""
+    return -(-offset // ALIGNMENT) * ALIGNMENT
+
+
+def saveSnapshot(filename, arrays, metadata):
+    """ Write the arrays (a dict name -> numpy array) and the metadata (a JSON-serializable dict) in the snapshot file 'filename'."""
+    arrays = {name: np.ascontiguousarray(array) for name, array in arrays.items()}
+    descriptions, offset = [], 0
+    for name, array in arrays.items():
+        descriptions.append({"name": name, "dtype": dtype_to_descr(array.dtype), "shape": list(array.shape), "offset": offset})
+        offset = _align(offset + array.nbytes)
+    header = json.dumps(dict(metadata, arrays=descriptions)).encode('utf-8')
+    start = _align(len(MAGIC) + 8 + len(header))
+    with open(filename, 'wb') as f:
+        f.write(MAGIC)
+        f.write(struct.pack('<II', VERSION, len(header)))
+        f.write(header)
+        for description, array in zip(descriptions, arrays.values()):
+            f.seek(start + description["offset"])
+            array.tofile(f)
+        f.truncate(start + offset)
+
+
+def loadSnapshot(filename, mmap=True):
+    """ Read the snapshot file 'filename', and return its arrays (a dict name -> numpy array) and its metadata.
+    - With mmap=True, the arrays are copy-on-write memory maps of the file: nothing is read before it is used, and changes are not written to the file.
+    """
+    with open(filename, 'rb') as f:
+        if f.read(len(MAGIC)) != MAGIC:
+            raise ValueError("Error: the file '{}' is not a snapshot of a policy.".format(filename))
+        version, length = struct.unpack('<II', f.read(8))
+        if version != VERSION:
+            raise ValueError("Error: the snapshot '{}' has version {}, but only version {} can be read.".format(filename, version, VERSION))
+        metadata = json.loads(f.read(length).decode('utf-8'))
+        start = _align(len(MAGIC) + 8 + length)
+        arrays = {}
+        for description in metadata.pop("arrays"):
+            dtype, shape = descr_to_dtype(description["dtype"]), tuple(description["shape"])
+            if mmap and int(np.prod(shape)) > 0:
+                arrays[description["name"]] = np.memmap(filename, dtype=dtype, mode='c', offset=start + description["offset"], shape=shape)
+            else:
+                f.seek(start + description["offset"])
+                arrays[description["name"]] = np.fromfile(f, dtype=dtype, count=int(np.prod(shape))).reshape(shape)
+    return arrays, metadata
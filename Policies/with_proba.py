@@ -1,9 +1,36 @@
 # -*- coding: utf-8 -*-
-""" Simply defines a function :func:`with_proba` that is used everywhere.
+""" Simply defines :class:`UniformBuffer`, used everywhere to draw uniform values (eg. :meth:`UniformBuffer.with_proba`) from a numpy Generator, faster than one call to it by value.
 """
-from random import random
 
 
-def with_proba(epsilon):
-    # True with proba epsilon
-    return random() < epsilon  
\ No newline at end of file
+#: Default number of uniforms drawn at once by :class:`UniformBuffer`
+BUFFER_SIZE = 256
+
+
+class UniformBuffer(object):
+    """ Uniform random values in [0, 1), drawn by blocks of size values from a :class:`numpy.random.Generator`: one value costs about as much as Python's random()."""
+
+    __slots__ = ('rng', 'size', '_values', '_index')
+
+    def __init__(self, rng, size=BUFFER_SIZE):
+        self.rng = rng
+        self.size = size
+        self._values = []
+        self._index = size
+
+    def random(self):
+        """ One uniform random value in [0, 1)."""
+        i = self._index
+        if i >= self.size:
+            self._values = self.rng.random(self.size).tolist()
+            i = 0
+        self._index = i + 1
+        return self._values[i]
+
+    def with_proba(self, epsilon):
+        """ True with proba epsilon."""
+        return self.random() < epsilon
+
+    def randint(self, n):
+        """ One uniform random integer in [0, n)."""
+        return int(self.random() * n)
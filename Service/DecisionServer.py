@@ -0,0 +1,173 @@
+# -*- coding: utf-8 -*-
+"""
+:class:`DecisionServer` class to serve the decisions of one policy to concurrent requests, with :mod:`asyncio`.
+- The ``choose`` and ``report_reward`` requests are queued, and every ``batchInterval`` seconds (or as soon as ``maxBatchSize`` requests are waiting) they are applied to the policy as one micro-batch: all the rewards with one call to ``getReward_batch``, then all the choices with one call to ``choice_batch``.
+- The policy can also be a :class:`Policies.BanditPool`: the requests then give the key of their bandit.
+- :class:`LocalClient` sends requests to a server in the same process, eg. for tests. Example::
+    async def main():
+        async with DecisionServer(Thompson(10)) as server:
+            client = LocalClient(server)
+            arm = await client.choose()
+            await client.report_reward(arm, 1.)
+    asyncio.run(main())
+"""
+
+import asyncio
+import numpy as np
+
+from Policies.BanditPool import BanditPool
+
+
+#: Default time between two micro-batches, in seconds
+BATCH_INTERVAL = 0.002
+
+#: Default maximum number of requests in one micro-batch
+MAX_BATCH_SIZE = 4096
+
+
+class DecisionServer(object):
+    """ Serve the decisions of one policy (or :class:`BanditPool`) to concurrent requests, applied by micro-batches."""
+
+    def __init__(self, policy, batchInterval=BATCH_INTERVAL, maxBatchSize=MAX_BATCH_SIZE):
+        """ New server for the policy 'policy', which has to be started with :meth:`start` (or ``async with``)."""
+        assert batchInterval >= 0, "Error: the 'batchInterval' parameter of a DecisionServer object cannot be < 0."  # DEBUG
+        assert maxBatchSize > 0, "Error: the 'maxBatchSize' parameter of a DecisionServer object cannot be <= 0."  # DEBUG
+        self.policy = policy
+        self.batchInterval = batchInterval
+        self.maxBatchSize = maxBatchSize
+
+        # Waiting requests: (key, future) for the choices, (key, arm, reward, future) for the rewards
+        self._choices = []
+        self._rewards = []
+
+        # Set when a request is waiting, and task applying the micro-batches
+        self._wakeUp = None
+        self._full = None
+        self._task = None
+
+        # Number of micro-batches and of requests served
+        self.nbBatches = 0
+        self.nbRequests = 0
+
+    def __repr__(self):
+        return "{}(policy: {}, batchInterval: {}, maxBatchSize: {})".format(self.__class__.__name__, self.policy, self.batchInterval, self.maxBatchSize)
+
+    # --- Start and stop
+
+    async def start(self):
+        """ Start the task applying the micro-batches, in the running event loop."""
+        assert self._task is None, "Error: this DecisionServer is already started."  # DEBUG
+        self._wakeUp = asyncio.Event()
+        self._full = asyncio.Event()
+        self._task = asyncio.get_running_loop().create_task(self._serve())
+        return self
+
+    async def stop(self):
+        """ Serve the waiting requests, and stop."""
+        task, self._task = self._task, None
+        if task is not None:
+            task.cancel()
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+            self._applyBatch()
+
+    async def __aenter__(self):
+        return await self.start()
+
+    async def __aexit__(self, *exc_info):
+        await self.stop()
+
+    # --- Requests
+
+    def _submit(self, queue, request):
+        """ Queue a request, and return the future of its answer."""
+        assert self._task is not None, "Error: this DecisionServer is not started."  # DEBUG
+        future = asyncio.get_running_loop().create_future()
+        queue.append(request + (future,))
+        self._wakeUp.set()
+        if len(self._choices) + len(self._rewards) >= self.maxBatchSize:
+            self._full.set()
+        return future
+
+    async def choose(self, key=None):
+        """ Arm chosen by the policy (for the bandit of that key, for a :class:`BanditPool`)."""
+        return await self._submit(self._choices, (key,))
+
+    async def report_reward(self, arm, reward, key=None):
+        """ Give the reward of the arm 'arm' to the policy (to the bandit of that key, for a :class:`BanditPool`), and wait for it to be applied."""
+        await self._submit(self._rewards, (key, arm, reward))
+
+    # --- Micro-batches
+
+    async def _serve(self):
+        """ Apply the waiting requests every batchInterval seconds, or as soon as maxBatchSize are waiting."""
+        while True:
+            await self._wakeUp.wait()
+            try:
+                await asyncio.wait_for(self._full.wait(), self.batchInterval)
+            except asyncio.TimeoutError:
+                pass
+            self._applyBatch()
+
+    def _applyBatch(self):
+        """ Apply all the waiting rewards, then answer all the waiting choices, with one vectorized call each."""
+        choices, self._choices = self._choices, []
+        rewards, self._rewards = self._rewards, []
+        self._wakeUp.clear()
+        self._full.clear()
+        if not choices and not rewards:
+            return
+        self.nbBatches += 1
+        self.nbRequests += len(choices) + len(rewards)
+        if rewards:
+            keys, arms, values, futures = zip(*rewards)
+            try:
+                if isinstance(self.policy, BanditPool):
+                    self.policy.getReward(np.array(keys), np.array(arms), np.array(values, dtype=float))
+                else:
+                    self.policy.getReward_batch(np.array(arms), np.array(values, dtype=float))
+            except Exception as error:
+                self._answer(futures, exception=error)
+            else:
+                self._answer(futures, [None] * len(futures))
+        if choices:
+            keys, futures = zip(*choices)
+            try:
+                if isinstance(self.policy, BanditPool):
+                    arms = self.policy.choice(np.array(keys))
+                else:
+                    arms = self.policy.choice_batch(len(futures))
+                arms = np.asarray(arms).tolist()
+            except Exception as error:
+                self._answer(futures, exception=error)
+            else:
+                self._answer(futures, arms)
+
+    @staticmethod
+    def _answer(futures, results=None, exception=None):
+        """ Give its result (or the exception) to each future still waiting."""
+        for i, future in enumerate(futures):
+            if not future.done():
+                if exception is None:
+                    future.set_result(results[i])
+                else:
+                    future.set_exception(exception)
+
+
+class LocalClient(object):
+    """ Client of a :class:`DecisionServer` running in the same process and event loop, eg. for tests."""
+
+    def __init__(self, server, key=None):
+        """ New client of the server 'server', for the bandit of that key (for a :class:`BanditPool`)."""
+        self.server = server
+        self.key = key
+
+    async def choose(self):
+        """ Ask the server for an arm."""
+        return await self.server.choose(key=self.key)
+
+    async def report_reward(self, arm, reward):
+        """ Send the reward of the arm 'arm' to the server."""
+        await self.server.report_reward(arm, reward, key=self.key)
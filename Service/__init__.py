@@ -0,0 +1,4 @@
+# -*- coding: utf-8 -*-
+""" Serving layer: answer the requests of concurrent clients with one policy."""
+
+from .DecisionServer import DecisionServer, LocalClient
@@ -3,19 +3,14 @@ from Policies.UCB import UCB
 from Policies.EpsilonGreedy import EpsilonGreedy
 from Policies.Thompson import Thompson
 from Arms import Gaussian, Bernoulli
-from Environment.MAB import MAB
-from Environment.Results import Result
-from tqdm import tqdm 
+from Environment.Evaluator import Evaluator
 from collections import Counter
 import matplotlib.pyplot as plt 
 import numpy as np
 
 
-policy = EpsilonGreedy(nbArms=3, epsilon=0.1)
-policy = UCB(nbArms=3)
 prior_failures  = a = 100
 prior_successes = b = 50
-policy = Thompson(nbArms=2, a=a, b=b)
 
 armConfiguration = [
             Bernoulli(0.1),
@@ -23,31 +18,26 @@ armConfiguration = [
             Bernoulli(0.9),
         ]
 
-
-env = MAB(armConfiguration)
-
-horizon = 10000
-results = Result(env.nbArms, horizon)
-
-prettyRange = tqdm(range(horizon), desc="Time t")
-for t in prettyRange:
-        # 1. The player's policy choose an arm
-        choice = policy.choice()
-
-        # 2. A random reward is drawn, from this arm at this time
-        reward = env.draw(choice, t)
-
-        # 3. The policy sees the reward
-        policy.getReward(choice, reward)
-
-        # 4. Finally we store the results
-        results.store(t, choice, reward)
-
-print(Counter(results.choices))
-# print(results.choices)
-# print(results.rewards)
-
-plot_x = np.arange(1, 1 + horizon)
-plot_y = np.cumsum(results.rewards) / plot_x
-plt.plot(plot_x, plot_y)
-plt.savefig("rewards.png")
\ No newline at end of file
+configuration = {
+    "horizon": 10000,
+    "repetitions": 4,
+    "n_jobs": -1,
+    "seed": 42,
+    "environment": armConfiguration,
+    "policies": [
+        {"archtype": EpsilonGreedy, "params": {"epsilon": 0.1}},
+        {"archtype": UCB, "params": {}},
+        {"archtype": Thompson, "params": {"a": a, "b": b}},
+    ]
+}
+
+
+if __name__ == "__main__":
+    evaluation = Evaluator(configuration).evaluate()
+
+    plot_x = np.arange(1, 1 + evaluation.horizon)
+    for policyId in range(evaluation.nbPolicies):
+        print(evaluation.getPolicyName(policyId), Counter(evaluation.choices[policyId].ravel()))
+        plt.plot(plot_x, evaluation.getAverageRewards(policyId), label=evaluation.getPolicyName(policyId))
+    plt.legend()
+    plt.savefig("rewards.png")
@@ -0,0 +1,7 @@
+# -*- coding: utf-8 -*-
+""" The tests import the packages of the repository (Arms, Environment, Policies) from its root."""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -0,0 +1,76 @@
+# -*- coding: utf-8 -*-
+""" Tests of the DecisionServer, with concurrent LocalClients in one event loop."""
+
+import asyncio
+
+import numpy as np
+import pytest
+
+from Policies import UCB
+from Service import DecisionServer, LocalClient
+
+K = 5
+
+#: Time after which a request is considered hanging, in seconds
+TIMEOUT = 5.
+
+
+class FailingUCB(UCB):
+    """ UCB policy whose choices fail."""
+
+    def choice_batch(self, n):
+        raise RuntimeError("choice_batch failed")
+
+
+async def play(client, rng, rounds):
+    """ Choose an arm and report a reward for it, rounds times, and return the arms chosen."""
+    arms = []
+    for _ in range(rounds):
+        arm = await client.choose()
+        await client.report_reward(arm, float(rng.random()))
+        arms.append(arm)
+    return arms
+
+
+def test_concurrentClients():
+    """ All the requests of concurrent clients are answered, and the policy gets all the rewards reported."""
+    policy = UCB(K, rng=np.random.default_rng(0))
+
+    async def main():
+        async with DecisionServer(policy, batchInterval=0.001, maxBatchSize=8) as server:
+            rngs = np.random.default_rng(1).spawn(20)
+            results = await asyncio.wait_for(asyncio.gather(*[play(LocalClient(server), rng, 10) for rng in rngs]), TIMEOUT)
+        return server, results
+
+    server, results = asyncio.run(main())
+    arms = [arm for result in results for arm in result]
+    assert len(arms) == 20 * 10 and all(0 <= arm < K for arm in arms)
+    assert policy.t == 20 * 10 and np.sum(policy.pulls) == 20 * 10
+    assert server.nbRequests == 2 * 20 * 10 and server.nbBatches > 1
+
+
+def test_policyErrors():
+    """ An exception raised by the policy reaches all the clients waiting for that micro-batch, instead of hanging them, and the server keeps serving."""
+    policy = FailingUCB(K, rng=np.random.default_rng(2))
+
+    async def main():
+        async with DecisionServer(policy, batchInterval=0.001) as server:
+            clients = [LocalClient(server) for _ in range(10)]
+            choices = await asyncio.wait_for(asyncio.gather(*[client.choose() for client in clients], return_exceptions=True), TIMEOUT)
+            rewards = await asyncio.wait_for(asyncio.gather(clients[0].report_reward(K + 10, 1.), return_exceptions=True), TIMEOUT)
+            await asyncio.wait_for(asyncio.gather(*[client.report_reward(arm, 1.) for arm, client in enumerate(clients[:K])]), TIMEOUT)
+        return choices, rewards
+
+    choices, rewards = asyncio.run(main())
+    assert all(isinstance(choice, RuntimeError) for choice in choices)
+    assert isinstance(rewards[0], Exception)
+    assert np.array_equal(policy.pulls, np.ones(K))
+
+
+def test_notStarted():
+    """ A request to a server not started fails at once."""
+    async def main():
+        await LocalClient(DecisionServer(UCB(K))).choose()
+
+    with pytest.raises(AssertionError):
+        asyncio.run(main())
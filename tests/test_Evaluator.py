@@ -0,0 +1,37 @@
+# -*- coding: utf-8 -*-
+""" Tests of the Evaluator."""
+
+import numpy as np
+
+from Arms import Bernoulli
+from Environment import Evaluator
+from Environment.Instrumentation import PHASES
+from Policies import UCB
+
+
+def makeEvaluator(**configuration):
+    """ Evaluator of UCB on 3 Bernoulli arms, played in this process."""
+    return Evaluator(dict({
+        "horizon": 200, "repetitions": 2, "n_jobs": 1, "seed": 1,
+        "environment": [Bernoulli(0.1), Bernoulli(0.5), Bernoulli(0.9)],
+        "policies": [{"archtype": UCB, "params": {}}],
+    }, **configuration))
+
+
+def test_instrumentationPhases():
+    """ The instrumentation of the Evaluator times the four phases of each step, with one call of each by step."""
+    evaluator = makeEvaluator(instrumentation=True)
+    evaluator.evaluate()
+    counts = {}
+    for (phase, label), counter in evaluator.instrumentation.counters.items():
+        counts[phase] = counts.get(phase, 0) + counter.count
+    assert counts == {phase: 200 * 2 for phase in PHASES}
+
+
+def test_instrumentationSameResults():
+    """ Timing the phases does not change the choices and rewards."""
+    plain, timed = makeEvaluator(), makeEvaluator(instrumentation=True)
+    plain.evaluate()
+    timed.evaluate()
+    assert np.array_equal(plain.choices, timed.choices)
+    assert np.array_equal(plain.rewards, timed.rewards)
@@ -0,0 +1,68 @@
+# -*- coding: utf-8 -*-
+""" Tests of the KL-UCB indexes and of the pruned choice()."""
+
+import numpy as np
+import pytest
+
+from Policies import KLUCB
+from Policies.KLUCB import klBern, klucbBern, klucbBern_nparray
+
+
+def bisection(p, d, iterations=200):
+    """ Largest q in [p, 1] such that kl(p, q) <= d, by bisection."""
+    if d <= 0 or p >= 1:
+        return min(p, 1.)
+    low, high = p, 1.
+    for _ in range(iterations):
+        middle = (low + high) / 2
+        if klBern(p, middle) > d:
+            high = middle
+        else:
+            low = middle
+    return low
+
+
+@pytest.mark.parametrize("size", [5, 200])
+def test_klucbBern_nparray(size):
+    """ The Newton iterations give the same indexes as a bisection, also for p = 0, p = 1 and d = 0, on the scalar (few values) and vectorized paths."""
+    rng = np.random.default_rng(0)
+    p, d = rng.random(size), rng.exponential(0.5, size)
+    p[:3], d[3:5] = [0., 1., 0.], 0.
+    expected = np.array([bisection(a, b) for a, b in zip(p, d)])
+    assert np.allclose(klucbBern_nparray(p, d), expected, atol=1e-9)
+    # Warm-started from other values, above or below the solutions
+    assert np.allclose(klucbBern_nparray(p, d, start=rng.random(size)), expected, atol=1e-9)
+    assert abs(klucbBern(0.3, 0.1) - bisection(0.3, 0.1)) < 1e-9
+
+
+def test_prunedChoice():
+    """ Each choice of a full game has a maximal index, as computed by computeAllIndex() on a copy of the policy."""
+    rng = np.random.default_rng(1)
+    means = rng.random(30)
+    policy = KLUCB(30, rng=np.random.default_rng(2))
+    policy.startGame()
+    for _ in range(3000):
+        arm = policy.choice()
+        reference = KLUCB(30)
+        reference.stats[...], reference.t = policy.stats, policy.t
+        reference.computeAllIndex()
+        assert reference.index[arm] >= np.max(reference.index) - 1e-8
+        policy.getReward(arm, float(rng.random() < means[arm]))
+
+
+def test_pulledBounded():
+    """ The arms to solve are kept at most once each, and forgotten by computeAllIndex(), whatever the API used between the choices."""
+    rng = np.random.default_rng(3)
+    policy = KLUCB(10, rng=np.random.default_rng(4))
+    policy.startGame()
+    for _ in range(500):
+        arms = policy.choiceMultiple(5)
+        assert len(policy._pulled) == 0
+        policy.getRewardMultiple(arms, rng.random(5))
+        assert len(policy._pulled) <= 5
+    for _ in range(500):
+        arms = rng.integers(10, size=8)
+        policy.getReward_batch(arms, rng.random(8))
+        assert len(policy._pulled) <= policy.nbArms
+    policy.choice_batch(3)
+    assert len(policy._pulled) == 0
@@ -0,0 +1,82 @@
+# -*- coding: utf-8 -*-
+""" Tests of :func:`Environment.Kernel.playGame`: the policy is left in the state matching the choices and rewards it returns."""
+
+import numpy as np
+import pytest
+
+from Arms import Bernoulli, Gaussian, Uniform
+from Environment import MAB, playGame
+from Environment.Kernel import HAS_NUMBA, isSupported
+from Policies import UCB, UCBalpha, UCBplus, UCBV, EmpiricalMeans, EpsilonGreedy, ETC_KnownGap, Thompson
+
+
+HORIZON = 500
+
+POLICIES = [
+    lambda nbArms, rng: UCB(nbArms, rng=rng),
+    lambda nbArms, rng: UCBalpha(nbArms, rng=rng),
+    lambda nbArms, rng: UCBplus(nbArms, rng=rng),
+    lambda nbArms, rng: UCBV(nbArms, rng=rng),
+    lambda nbArms, rng: EmpiricalMeans(nbArms, rng=rng),
+    lambda nbArms, rng: EpsilonGreedy(nbArms, rng=rng),
+    lambda nbArms, rng: ETC_KnownGap(nbArms, horizon=HORIZON, rng=rng),
+    lambda nbArms, rng: Thompson(nbArms, rng=rng),
+]
+
+
+def makeEnv():
+    """ Stationary problem with arms of the three random types supported by the kernel."""
+    return MAB([Bernoulli(0.3), Gaussian(0.5, 0.1), Uniform(0.2, 0.8)], rng=np.random.default_rng(0))
+
+
+def checkConsistent(policy, result, t0):
+    """ The time, statistics (or posteriors) of the policy, and the pulls of the result, are the ones of the choices and rewards of the result."""
+    nbArms = policy.nbArms
+    pulls = np.bincount(result.choices, minlength=nbArms)
+    assert policy.t == t0 + len(result.choices)
+    assert np.array_equal(result.pulls, pulls)
+    if isinstance(policy, Thompson):
+        # Binarized rewards: each pull adds one success or one failure to the posterior of its arm
+        counts = policy.posterior.N.sum(axis=0) - (policy.posterior._a + policy.posterior._b)
+        assert np.array_equal(counts, pulls)
+        return
+    normalized = (result.rewards - policy.lower) / policy.amplitude
+    assert np.array_equal(policy.pulls, pulls)
+    assert np.allclose(policy.rewards, np.bincount(result.choices, weights=normalized, minlength=nbArms))
+    if 'invPulls' in policy.stats.dtype.names:
+        assert np.allclose(policy.invPulls, 1. / pulls)
+    if 'rewardsSquared' in policy.stats.dtype.names:
+        assert np.allclose(policy.rewardsSquared, np.bincount(result.choices, weights=normalized ** 2, minlength=nbArms))
+
+
+def playTwice(make):
+    """ Play two games in a row with playGame(), from startGame(), and check the policy after each."""
+    env = makeEnv()
+    policy = make(env.nbArms, np.random.default_rng(1))
+    policy.startGame()
+    first = playGame(env, policy, HORIZON)
+    checkConsistent(policy, first, 0)
+    # The second game starts from the state left by the first one
+    second = playGame(env, policy, HORIZON)
+    assert policy.t == 2 * HORIZON
+    first.choices = np.concatenate([first.choices, second.choices])
+    first.rewards = np.concatenate([first.rewards, second.rewards])
+    first.pulls += second.pulls
+    checkConsistent(policy, first, 0)
+    return env, policy
+
+
+@pytest.mark.parametrize("make", POLICIES)
+def test_pythonLoop(make, monkeypatch):
+    """ Without the kernel, the Python loop leaves the policy consistent."""
+    monkeypatch.setattr("Environment.Kernel._compiledKernel", None)
+    playTwice(make)
+
+
+@pytest.mark.skipif(not HAS_NUMBA, reason="numba is not installed")
+@pytest.mark.parametrize("make", POLICIES)
+def test_compiledKernel(make):
+    """ The compiled kernel plays the supported policies, and leaves the policy consistent with its choices and rewards."""
+    env = makeEnv()
+    assert isSupported(env, make(env.nbArms, np.random.default_rng(1)))
+    playTwice(make)
@@ -0,0 +1,118 @@
+# -*- coding: utf-8 -*-
+""" Tests of the linear contextual policies LinUCB and LinThompson."""
+
+import numpy as np
+import pytest
+
+from Environment import ContextualMAB
+from Environment.Results import BatchedResult, StreamingResult
+from Policies import LinUCB, LinThompson
+
+K, D = 4, 3
+
+#: The three layouts of the contexts: disjoint arms with one context for all, disjoint arms with one context by arm, shared parameter
+LAYOUTS = [(False, ()), (False, (K,)), (True, (K,))]
+
+
+def randomContexts(rng, n, shape):
+    """ n contexts of the given shape (without the batch axis)."""
+    return rng.standard_normal((n,) + shape + (D,))
+
+
+def train(policy, rng, shape, steps=300):
+    """ Give random rewards of random arms to the policy, one at a time, and return the contexts, arms and normalized rewards."""
+    contexts, arms, rewards = randomContexts(rng, steps, shape), rng.integers(K, size=steps), rng.random(steps)
+    for arm, reward, context in zip(arms, rewards, contexts):
+        policy.getReward(arm, reward, context)
+    return contexts, arms, (rewards - policy.lower) / policy.amplitude
+
+
+def loopScores(policy, contexts, alpha):
+    """ Means plus alpha times the widths of the scores, one context and one arm at a time."""
+    scores = np.zeros((len(contexts), K))
+    for i, context in enumerate(contexts):
+        for k in range(K):
+            x = context[k] if context.ndim == 2 else context
+            Ainv, theta = (policy.Ainv, policy.theta) if policy.shared else (policy.Ainv[k], policy.theta[k])
+            scores[i, k] = x @ theta + alpha * np.sqrt(x @ Ainv @ x)
+    return scores
+
+
+@pytest.mark.parametrize("cls", [LinUCB, LinThompson])
+@pytest.mark.parametrize("shared, shape", LAYOUTS)
+def test_shermanMorrison(cls, shared, shape):
+    """ After many rank-one updates, A^{-1} is the inverse of A = lambda I + sum x x^T, and theta = A^{-1} b."""
+    rng = np.random.default_rng(0)
+    policy = cls(K, D, regularization=0.5, shared=shared, lower=-1., amplitude=2., rng=rng)
+    contexts, arms, rewards = train(policy, rng, shape, steps=2000)
+    for k in ([None] if shared else range(K)):
+        A, b = 0.5 * np.eye(D), np.zeros(D)
+        for arm, reward, context in zip(arms, rewards, contexts):
+            if k is None or arm == k:
+                x = context[arm] if context.ndim == 2 else context
+                A += np.outer(x, x)
+                b += reward * x
+        Ainv, theta = (policy.Ainv, policy.theta) if shared else (policy.Ainv[k], policy.theta[k])
+        assert np.allclose(Ainv, np.linalg.inv(A))
+        assert np.allclose(theta, np.linalg.solve(A, b))
+
+
+@pytest.mark.parametrize("shared, shape", LAYOUTS)
+def test_computeScores(shared, shape):
+    """ The scores of a batch of contexts, computed at once, are the ones computed one context and one arm at a time."""
+    rng = np.random.default_rng(1)
+    policy = LinUCB(K, D, alpha=0.7, shared=shared, rng=rng)
+    train(policy, rng, shape)
+    contexts = randomContexts(rng, 50, shape)
+    assert np.allclose(policy.computeScores(contexts), loopScores(policy, contexts, 0.7))
+    # Without sampling noise, LinThompson scores the estimated means
+    thompson = LinThompson(K, D, v=0., shared=shared, rng=rng)
+    train(thompson, rng, shape)
+    assert np.allclose(thompson.computeScores(contexts), loopScores(thompson, contexts, 0.))
+
+
+@pytest.mark.parametrize("shared, shape", LAYOUTS)
+def test_thompsonSamples(shared, shape):
+    r""" The sampled scores of LinThompson have the means :math:`x^T \hat{\theta}_k` and the standard deviations :math:`v \sqrt{x^T A_k^{-1} x}`."""
+    rng = np.random.default_rng(2)
+    policy = LinThompson(K, D, v=0.5, shared=shared, rng=rng)
+    train(policy, rng, shape, steps=30)
+    context = randomContexts(rng, 1, shape)
+    scores = policy.computeScores(np.repeat(context, 20000, axis=0))
+    means = loopScores(policy, context, 0.)[0]
+    widths = loopScores(policy, context, 1.)[0] - means
+    assert np.allclose(np.mean(scores, axis=0), means, atol=0.02)
+    assert np.allclose(np.std(scores, axis=0), 0.5 * widths, rtol=0.05)
+
+
+@pytest.mark.parametrize("shared, shape", LAYOUTS)
+def test_batch(shared, shape):
+    """ choice_batch() makes the choices of choice() on each context, and getReward_batch() the updates of getReward() on each reward."""
+    rng = np.random.default_rng(3)
+    policy, sequential = LinUCB(K, D, shared=shared, rng=rng), LinUCB(K, D, shared=shared, rng=rng)
+    train(policy, np.random.default_rng(4), shape)
+    train(sequential, np.random.default_rng(4), shape)
+    contexts = randomContexts(rng, 100, shape)
+    choices = policy.choice_batch(contexts)
+    assert np.array_equal(choices, [policy.choice(context) for context in contexts])
+    rewards = rng.random(len(choices))
+    for arm, reward, context in zip(choices, rewards, contexts):
+        sequential.getReward(arm, reward, context)
+    policy.getReward_batch(choices, rewards, contexts)
+    assert policy.t == sequential.t
+    assert np.array_equal(policy.pulls, sequential.pulls)
+    for name in ('rewards', 'Ainv', 'b', 'theta'):
+        assert np.allclose(getattr(policy, name), getattr(sequential, name))
+
+
+def test_contextRegrets():
+    """ The regret of a contextual problem is computed from the contexts, and the results refuse to compute it without them."""
+    env = ContextualMAB(K, D, rng=np.random.default_rng(5))
+    contexts = env.draw_contexts(10)
+    means = env.means(contexts)
+    assert np.allclose(env.contextRegrets(np.argmax(means, axis=1), contexts), 0.)
+    assert np.allclose(env.contextRegrets(np.zeros(10, dtype=int), contexts), np.max(means, axis=1) - means[:, 0])
+    with pytest.raises(ValueError):
+        StreamingResult(K, 10, means=env)
+    with pytest.raises(ValueError):
+        BatchedResult(K, 10, 2).getCumulatedRegret(env)
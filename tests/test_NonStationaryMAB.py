@@ -0,0 +1,51 @@
+# -*- coding: utf-8 -*-
+""" Tests of the non-stationary MAB problems, and of their regret against the best arm at each time."""
+
+import numpy as np
+
+from Arms import Bernoulli
+from Environment import Evaluator
+from Environment.NonStationaryMAB import NonStationaryMAB
+from Environment.Results import StreamingResult
+from Policies import UCB
+
+
+def drift(times):
+    """ Means of 3 arms drifting with time, crossing each other."""
+    return 0.5 + 0.4 * np.sin(times[:, np.newaxis] / 5. + np.arange(3))
+
+
+def test_regretsByChunks():
+    """ The regrets of blocks of choices starting anywhere, computed with chunks of a few times, are the ones computed from all the means at once."""
+    env = NonStationaryMAB({'arm_type': Bernoulli, 'params': [0.5] * 3}, drift, chunkSize=7)
+    choices = np.random.default_rng(0).integers(3, size=(2, 50))
+    for start in [13, 0, 6, 7]:
+        means = env.meansAt(np.arange(start, start + 50))
+        dense = np.max(means, axis=1) - means[np.arange(50), choices]
+        assert np.allclose(env.regrets(choices, start), dense)
+
+
+def test_bufferedBreakpoint():
+    """ With pre-drawn rewards, an arm gives rewards of its new mean exactly from a breakpoint: its buffer of rewards of the old mean is dropped."""
+    schedule = {'breakpoints': [0, 10, 25], 'means': [[0., 1.], [1., 0.], [0., 1.]]}
+    env = NonStationaryMAB({'arm_type': Bernoulli, 'params': [0.5] * 2}, schedule, chunkSize=4, buffer_size=100, rng=np.random.default_rng(1))
+    expected = env.meansAt(np.arange(40))
+    assert [env.draw(0, t) for t in range(40)] == expected[:, 0].tolist()
+    assert [env.draw_multiple([1, 1], t).tolist() for t in range(40)] == [[mean, mean] for mean in expected[:, 1].tolist()]
+
+
+def test_streamingRegret():
+    """ A StreamingResult given the problem accumulates the regret of a game as the Evaluator computes it."""
+    schedule = {'breakpoints': [0, 60, 130], 'means': [[0.2, 0.5, 0.8], [0.9, 0.5, 0.1], [0.3, 0.7, 0.4]]}
+    env = NonStationaryMAB({'arm_type': Bernoulli, 'params': [0.5] * 3}, schedule, chunkSize=16)
+    evaluator = Evaluator({
+        "horizon": 200, "repetitions": 1, "n_jobs": 1, "seed": 2,
+        "environment": env,
+        "policies": [{"archtype": UCB, "params": {}}],
+    }).evaluate()
+    result = StreamingResult(3, 200, chunkSize=24, means=env)
+    for time, (choice, reward) in enumerate(zip(evaluator.choices[0, 0], evaluator.rewards[0, 0])):
+        result.store(time, choice, reward)
+    times, regrets = result.getCumulatedRegret()
+    assert times[-1] == 200
+    assert np.allclose(regrets, evaluator.getCumulatedRegret(0)[times - 1])
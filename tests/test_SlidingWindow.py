@@ -0,0 +1,64 @@
+# -*- coding: utf-8 -*-
+""" Tests of the sliding-window policies, on a change point."""
+
+import numpy as np
+import pytest
+
+from Policies import SWUCB, SWUCBV, SWThompson
+
+
+def playChangePoint(policy, seed, horizon=8000, change=2000):
+    """ Play 2 Bernoulli arms whose means switch from [0.1, 0.5] to [0.9, 0.5] at the time change, and return the rate of plays of the new best arm in the last quarter of the game."""
+    rng = np.random.default_rng(seed)
+    policy.startGame()
+    plays = 0
+    for t in range(horizon):
+        means = [0.1, 0.5] if t < change else [0.9, 0.5]
+        arm = policy.choice()
+        policy.getReward(arm, float(rng.random() < means[arm]))
+        if t >= horizon - horizon // 4:
+            plays += arm == 0
+    return plays / (horizon // 4)
+
+
+@pytest.mark.parametrize("make", [
+    lambda rng: SWUCB(2, window=100, rng=rng),
+    lambda rng: SWUCB(2, window=100, lazy=True, rng=rng),
+    lambda rng: SWUCBV(2, window=100, rng=rng),
+    lambda rng: SWThompson(2, window=100, rng=rng),
+])
+@pytest.mark.parametrize("seed", range(5))
+def test_changePoint(make, seed):
+    """ The rewards expire with time: an arm not pulled for a while is tried again, and the new best arm is found."""
+    assert playChangePoint(make(np.random.default_rng(seed)), seed) > 0.6
+
+
+def test_expiredArms():
+    """ The statistics are the ones of the rewards of the last 'window' steps, whatever the arms pulled."""
+    policy = SWUCB(3, window=5)
+    policy.startGame()
+    for arm, reward in [(0, 1.), (0, 0.), (1, 1.), (2, 1.), (1, 0.), (1, 1.), (1, 1.)]:
+        policy.getReward(arm, reward)
+    # Only the last 5 steps are kept, from the third one: arm 0 was last pulled at the second step
+    assert policy.pulls.tolist() == [0, 4, 1]
+    assert policy.rewards.tolist() == [0., 3., 1.]
+    assert policy.invPulls.tolist() == [0., 0.25, 1.]
+    policy.computeAllIndex()
+    assert policy.index[0] == float('+inf')
+
+
+def test_snapshot(tmp_path):
+    """ A snapshot keeps the window: the restored policy forgets the same rewards."""
+    policy, rng = SWUCB(3, window=10), np.random.default_rng(0)
+    policy.startGame()
+    for _ in range(25):
+        policy.getReward(int(rng.integers(3)), float(rng.random()))
+    policy.save_state(str(tmp_path / "swucb.snap"))
+    restored = SWUCB(3, window=1).load_state(str(tmp_path / "swucb.snap"))
+    assert restored.window == 10
+    for _ in range(25):
+        arm, reward = int(rng.integers(3)), float(rng.random())
+        policy.getReward(arm, reward)
+        restored.getReward(arm, reward)
+    assert np.array_equal(policy.pulls, restored.pulls)
+    assert np.allclose(policy.rewards, restored.rewards)
@@ -0,0 +1,35 @@
+# -*- coding: utf-8 -*-
+""" Tests of the indexes: computeIndex(arm), one arm at a time, gives the indexes of the vectorized computeAllIndex()."""
+
+import numpy as np
+import pytest
+
+from Policies import UCB, UCBalpha, UCBplus, UCBV, EmpiricalMeans, KLUCB, SWUCB, SWUCBV, DiscountedUCB, DiscountedUCBV
+
+
+POLICIES = [
+    lambda nbArms: UCB(nbArms),
+    lambda nbArms: UCBalpha(nbArms, alpha=1.),
+    lambda nbArms: UCBplus(nbArms),
+    lambda nbArms: UCBV(nbArms),
+    lambda nbArms: EmpiricalMeans(nbArms),
+    lambda nbArms: KLUCB(nbArms),
+    lambda nbArms: SWUCB(nbArms, window=10),
+    lambda nbArms: SWUCBV(nbArms, window=10),
+    lambda nbArms: DiscountedUCB(nbArms, gamma=0.95),
+    lambda nbArms: DiscountedUCBV(nbArms, gamma=0.95),
+]
+
+
+@pytest.mark.parametrize("make", POLICIES)
+def test_scalarAndVectorized(make):
+    """ After a game, the scalar and vectorized indexes agree, for the unpulled arms too."""
+    rng = np.random.default_rng(0)
+    policy = make(6)
+    policy.startGame()
+    for _ in range(1000):
+        arm = int(rng.integers(5))  # The last arm is never pulled
+        policy.getReward(arm, float(rng.random() < 0.2 + 0.1 * arm))
+    policy.computeAllIndex()
+    scalar = np.array([policy.computeIndex(arm) for arm in range(6)])
+    assert np.allclose(scalar, policy.index, rtol=1e-9, atol=1e-9)
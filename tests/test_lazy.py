@@ -0,0 +1,40 @@
+# -*- coding: utf-8 -*-
+""" Tests of the lazy mode of the index policies: it chooses as the eager mode, or it is refused."""
+
+import inspect
+
+import numpy as np
+import pytest
+
+import Policies
+from Policies import UCBplus
+from Policies.IndexPolicy import IndexPolicy
+
+
+def lazyPolicies():
+    """ The index policies exported by :mod:`Policies` which take a lazy parameter."""
+    return [policy for policy in vars(Policies).values()
+            if inspect.isclass(policy) and issubclass(policy, IndexPolicy) and 'lazy' in inspect.signature(policy).parameters]
+
+
+def test_refused():
+    """ UCB+ inherits the coefficients of UCB, which are not the ones of its indexes: the lazy mode is refused."""
+    with pytest.raises(ValueError):
+        UCBplus(5, lazy=True)
+
+
+@pytest.mark.parametrize("policy", lazyPolicies(), ids=lambda policy: policy.__name__)
+def test_lazyChoices(policy):
+    """ Each lazy choice has a maximal index, as computed by computeAllIndex(), for every policy allowing the lazy mode."""
+    try:
+        lazy = policy(5, lazy=True, rng=np.random.default_rng(0))
+    except ValueError:
+        pytest.skip("no lazy mode for {}".format(policy.__name__))
+    rng = np.random.default_rng(1)
+    means = np.linspace(0.3, 0.7, 5)
+    lazy.startGame()
+    for _ in range(3000):
+        arm = lazy.choice()
+        lazy.computeAllIndex()
+        assert lazy.index[arm] >= np.max(lazy.index) - 1e-9
+        lazy.getReward(arm, float(rng.random() < means[arm]))
@@ -0,0 +1,23 @@
+# -*- coding: utf-8 -*-
+""" Tests of the multiple plays: slates of distinct arms."""
+
+import numpy as np
+
+from Policies import EpsilonGreedy
+
+
+def test_epsilonGreedySlate():
+    """ The exploitation of EpsilonGreedy ranks the slate by empirical means: the best arms end up in it, not the first ones exploited."""
+    rng = np.random.default_rng(0)
+    means = np.linspace(0.1, 0.9, 6)
+    policy = EpsilonGreedy(6, rng=np.random.default_rng(0))
+    policy.startGame()
+    inSlate = np.zeros(6, dtype=int)
+    for _ in range(2000):
+        arms = policy.choiceMultiple(2)
+        assert len(set(arms.tolist())) == 2
+        policy.getRewardMultiple(arms, (rng.random(2) < means[arms]).astype(float))
+        inSlate[arms] += 1
+    # The two best arms are the two most played, and the worst one is rarely played
+    assert set(np.argsort(inSlate)[-2:].tolist()) == {4, 5}
+    assert inSlate[0] < 200
@@ -0,0 +1,42 @@
+# -*- coding: utf-8 -*-
+""" Tests of the random generators of the arms, posteriors and policies."""
+
+import numpy as np
+
+from Arms import Bernoulli, Gaussian
+from Arms.Arm import defaultRNG
+from Policies import UCB, Thompson
+from Policies.Posterior import Beta
+
+
+def test_sharedDefault():
+    """ The objects created without a Generator share the default one, instead of one each."""
+    objects = [Bernoulli(0.5), Gaussian(0.5), Beta(), UCB(2), Thompson(2)]
+    assert all(obj.rng is defaultRNG() for obj in objects)
+
+
+def test_givenGenerator():
+    """ A given Generator is used, and the same seed gives the same draws."""
+    draws = [Bernoulli(0.5, rng=np.random.default_rng(7)).draw_nparray((100,)) for _ in range(2)]
+    assert np.array_equal(draws[0], draws[1])
+    rng = np.random.default_rng(0)
+    assert UCB(2, rng=rng).rng is rng
+
+
+def test_noGlobalState():
+    """ Without a Generator, the binarizations and the ties use the default one, and the Evaluator does not seed the global generators: their states are not changed."""
+    import random
+    from Environment import Evaluator
+    from Policies.IndexPolicy import argmaxRows
+    from Policies.Posterior.Beta import bernoulliBinarization, bernoulliBinarization_nparray
+    defaultRNG()
+    npState, pyState = np.random.get_state()[1].copy(), random.getstate()
+    bernoulliBinarization(0.5)
+    bernoulliBinarization_nparray(np.full(10, 0.5))
+    argmaxRows(np.zeros((3, 4)))
+    Evaluator({
+        "horizon": 50, "repetitions": 2, "n_jobs": 1, "seed": 1,
+        "environment": [Bernoulli(0.1), Bernoulli(0.9)],
+        "policies": [{"archtype": Thompson, "params": {}}],
+    }).evaluate()
+    assert np.array_equal(np.random.get_state()[1], npState) and random.getstate() == pyState